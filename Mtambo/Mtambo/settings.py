@@ -1,4 +1,5 @@
 from datetime import timedelta
+from celery.schedules import crontab
 """
 Django settings for Mtambo project.
 
@@ -79,26 +80,9 @@ INSTALLED_APPS = [
     'django_celery_results',
     'django_filters',
 ]
-REST_FRAMEWORK = {
-    'DEFAULT_FILTER_BACKENDS': [
-        'django_filters.rest_framework.DjangoFilterBackend',
-        'rest_framework.filters.OrderingFilter',
-    ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 10,  # Set the default page size
-}
-REST_FRAMEWORK = {
-    'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    ),
-    'DEFAULT_PERMISSION_CLASSES': (
-        'rest_framework.permissions.IsAuthenticated',
-    ),
-}
+# Authentication, permission, filter and pagination classes are declared on each view.
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
-}                                                                               
-REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
     ],
@@ -140,6 +124,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'Mtambo.wsgi.application'
+ASGI_APPLICATION = 'Mtambo.asgi.application'
 
 
 # Database
@@ -189,6 +174,10 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Uploaded files (fleet import sources)
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -237,5 +226,85 @@ CELERY_BEAT_SCHEDULE = {
             'expires': 59.0,
         },
     },
+    'reconcile-overdue-schedules': {
+        'task': 'jobs.tasks.check_overdue_schedules',
+        'schedule': crontab(hour=1, minute=30),  # Daily full scan to catch back-dated schedules
+        'kwargs': {'full_scan': True},
+    },
+    'materialize-schedule-horizon': {
+        'task': 'jobs.tasks.materialize_schedule_horizon',
+        'schedule': crontab(hour=2, minute=0),  # Nightly, after the overdue reconciliation
+    },
+    'refresh-elevator-health': {
+        'task': 'jobs.tasks.refresh_elevator_health',
+        'schedule': crontab(hour=2, minute=30),
+    },
+    'archive-read-alerts': {
+        'task': 'alerts.tasks.archive_read_alerts',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    'run-monthly-billing': {
+        'task': 'payments.tasks.run_monthly_billing',
+        'schedule': crontab(hour=0, minute=30),
+    },
+    'settle-revenue': {
+        'task': 'payments.tasks.settle_revenue',
+        'schedule': crontab(minute=15),
+    },
+    'snapshot-broker-balances': {
+        'task': 'payments.tasks.snapshot_broker_balances',
+        'schedule': crontab(hour=1, minute=0),
+    },
+}
+
+# Number of future routine schedules kept materialized per elevator
+SCHEDULE_HORIZON_OCCURRENCES = 3
+
+# Elevator health scores look back over this many days of maintenance logs, condition
+# reports and reported issues
+HEALTH_SCORE_WINDOW_DAYS = 180
+
+# Shared cache, on the same Redis server as Celery and the alert pub/sub. It must be
+# shared by every web and worker process for cache invalidation to reach all of them
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://localhost:6379/2',
+    }
 }
 
+# Payment settings and broker commission settings are cached per process and in the
+# shared cache; a process re-checks the shared version after PAYMENT_SETTINGS_LOCAL_TTL
+# seconds, and shared copies expire after PAYMENT_SETTINGS_CACHE_TIMEOUT seconds
+PAYMENT_SETTINGS_LOCAL_TTL = 5
+PAYMENT_SETTINGS_CACHE_TIMEOUT = 60 * 60
+
+# Payment callbacks are parsed and authenticated by PAYMENT_PROVIDER_BACKEND. Set
+# PAYMENT_CALLBACK_SECRET to the gateway's signing secret; callbacks are refused while it
+# is empty. Use 'payments.providers.SimulatedPaymentProvider' only for local load tests.
+PAYMENT_PROVIDER_BACKEND = 'payments.providers.SignedPaymentProvider'
+PAYMENT_CALLBACK_SECRET = ''
+PAYMENT_INGEST_MAX_BATCH = 1000
+
+# Read alerts older than this many days are moved to the alert archive table
+ALERT_ARCHIVE_AFTER_DAYS = 90
+
+# Alerts with the same recipient, type and related object arriving within this many
+# seconds of an unread one are merged into it; a digest keeps at most this many items
+ALERT_COALESCE_WINDOW_SECONDS = 300
+ALERT_DIGEST_MAX_ITEMS = 50
+
+# Pub/sub used to push new alerts to connected alert streams
+ALERT_PUBSUB_BACKEND = 'alerts.pubsub.RedisAlertBroker'
+ALERT_PUBSUB_URL = 'redis://localhost:6379/1'
+ALERT_STREAM_HEARTBEAT_SECONDS = 15
+ALERT_STREAM_MAX_SECONDS = 300
+
+
+# Fleet imports are validated and inserted this many rows per transaction; at most
+# FLEET_IMPORT_MAX_ERRORS rejected rows are kept on the import for reporting
+FLEET_IMPORT_CHUNK_SIZE = 500
+FLEET_IMPORT_MAX_ERRORS = 1000
+
+# Streaming exports read rows from the database in chunks of this size
+EXPORT_CHUNK_SIZE = 2000
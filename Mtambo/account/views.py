@@ -26,7 +26,7 @@ from alerts.models import Alert
 from brokers.models import BrokerUser
 from brokers.models import BrokerReferral
 from brokers.models import BrokerUserManager
-from payments.models import PaymentSettings
+from payments.cache import get_payment_settings
 from maintenance_companies.serializers import MaintenanceCompanyProfileSerializer
 
 import logging
@@ -124,7 +124,7 @@ class SignUpView(APIView):
 
                 try:
                     # Get commission values from PaymentSettings if they exist, otherwise use broker defaults
-                    payment_settings = PaymentSettings.objects.first()
+                    payment_settings = get_payment_settings()
                     if payment_settings:
                         commission_percentage = payment_settings.default_commission
                         commission_duration_months = payment_settings.default_commission_duration
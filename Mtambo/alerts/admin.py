@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Alert
+from .models import Alert, AlertCounter, ArchivedAlert
 
 @admin.register(Alert)
 class AlertAdmin(admin.ModelAdmin):
@@ -9,3 +9,15 @@ class AlertAdmin(admin.ModelAdmin):
     ordering = ('-created_at',)
 
 
+@admin.register(AlertCounter)
+class AlertCounterAdmin(admin.ModelAdmin):
+    list_display = ('recipient_type', 'recipient_id', 'unread_count', 'updated_at')
+    search_fields = ('recipient_id',)
+
+
+@admin.register(ArchivedAlert)
+class ArchivedAlertAdmin(admin.ModelAdmin):
+    list_display = ('alert_type', 'message', 'recipient_type', 'recipient_id', 'created_at', 'archived_at')
+    list_filter = ('alert_type', 'created_at')
+    search_fields = ('message', 'recipient_id', 'object_id')
+    ordering = ('-created_at',)
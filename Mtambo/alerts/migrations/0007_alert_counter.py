@@ -0,0 +1,48 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:43
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_alert_counters(apps, schema_editor):
+    Alert = apps.get_model('alerts', 'Alert')
+    AlertCounter = apps.get_model('alerts', 'AlertCounter')
+    unread = (
+        Alert.objects.filter(is_read=False)
+        .order_by()
+        .values('recipient_type_id', 'recipient_id')
+        .annotate(unread_count=Count('id'))
+    )
+    AlertCounter.objects.bulk_create(
+        [AlertCounter(**row) for row in unread.iterator()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0006_alter_alert_alert_type'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertCounter',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('recipient_id', models.UUIDField(help_text='UUID of the recipient object')),
+                ('unread_count', models.PositiveIntegerField(default=0, help_text='Number of unread alerts for the recipient')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('recipient_type', models.ForeignKey(help_text='Content type of the recipient', on_delete=django.db.models.deletion.CASCADE, related_name='alert_counters', to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'Alert Counter',
+                'verbose_name_plural': 'Alert Counters',
+                'unique_together': {('recipient_type', 'recipient_id')},
+            },
+        ),
+        migrations.RunPython(backfill_alert_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0007_alert_counter'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedAlert',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('alert_type', models.CharField(choices=[('TECH_SIGNUP', 'Technician Signup'), ('ELEVATOR_ASSIGNED', 'Elevator Assigned'), ('SCHEDULE_ASSIGNED', 'Schedule Assigned'), ('LOG_ADDED', 'Maintenance Log Added'), ('TASK_OVERDUE', 'Task Overdue'), ('TECH_UNLINK', 'Technician Unlinked'), ('ELEVATOR_REG', 'Elevator Registered'), ('BUILDING_REG', 'Building Registered'), ('SCHEDULE_OVERDUE', 'Schedule Overdue'), ('ADHOC_SCHEDULED', 'Ad-Hoc Maintenance Scheduled'), ('TECH_UPDATED_BUILDING', 'Technician Updated for Building'), ('MAINTENANCE_APPROVAL', 'Maintenance Approval Needed')], max_length=50)),
+                ('message', models.TextField()),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('recipient_id', models.UUIDField()),
+                ('object_id', models.UUIDField()),
+            ],
+            options={
+                'verbose_name': 'Archived Alert',
+                'verbose_name_plural': 'Archived Alerts',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='alert',
+            name='alerts_aler_recipie_73c804_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='alert',
+            name='alerts_aler_is_read_ba5dfd_idx',
+        ),
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(fields=['recipient_type', 'recipient_id', 'is_read', '-created_at'], name='alert_recipient_unread_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedalert',
+            name='content_type',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_alert_content', to='contenttypes.contenttype'),
+        ),
+        migrations.AddField(
+            model_name='archivedalert',
+            name='recipient_type',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_alert_recipients', to='contenttypes.contenttype'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedalert',
+            index=models.Index(fields=['recipient_type', 'recipient_id', '-created_at'], name='alerts_arch_recipie_0a12c2_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0008_alert_recipient_index_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alert',
+            name='items',
+            field=models.JSONField(blank=True, default=list, help_text='Messages of the merged events, oldest first, when this is a digest'),
+        ),
+        migrations.AddField(
+            model_name='alert',
+            name='occurrence_count',
+            field=models.PositiveIntegerField(default=1, help_text='Number of events merged into this alert'),
+        ),
+        migrations.AddField(
+            model_name='archivedalert',
+            name='items',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='archivedalert',
+            name='occurrence_count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -48,6 +48,15 @@ class Alert(models.Model):
         default=False,
         help_text=_("Whether the alert has been read by the recipient")
     )
+    occurrence_count = models.PositiveIntegerField(
+        default=1,
+        help_text=_("Number of events merged into this alert")
+    )
+    items = models.JSONField(
+        default=list,
+        blank=True,
+        help_text=_("Messages of the merged events, oldest first, when this is a digest")
+    )
     
     # Generic relation to the recipient
     recipient_type = models.ForeignKey(
@@ -76,10 +85,13 @@ class Alert(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['recipient_type', 'recipient_id']),
+            # Serves "this recipient's (unread) alerts, newest first"
+            models.Index(
+                fields=['recipient_type', 'recipient_id', 'is_read', '-created_at'],
+                name='alert_recipient_unread_idx',
+            ),
             models.Index(fields=['content_type', 'object_id']),
             models.Index(fields=['created_at']),
-            models.Index(fields=['is_read']),
         ]
         verbose_name = _("Alert")
         verbose_name_plural = _("Alerts")
@@ -88,7 +100,90 @@ class Alert(models.Model):
         return f"{self.alert_type} - {self.created_at.strftime('%Y-%m-%d %H:%M:%S')}"
 
     def mark_as_read(self):
-        """Mark the alert as read"""
+        """Mark the alert as read and decrement the recipient's unread counter"""
+        from .services import AlertCounterService
+
+        updated = Alert.objects.filter(id=self.id, is_read=False).update(is_read=True)
         self.is_read = True
-        self.save(update_fields=['is_read'])
+        if updated:
+            AlertCounterService.decrement(self.recipient_type_id, self.recipient_id, updated)
+
 
+
+class ArchivedAlert(models.Model):
+    """
+    Read alerts moved out of Alert by AlertArchiveService once they pass the archive
+    age, so the live table only holds recent and unread alerts.
+    """
+    id = models.UUIDField(
+        primary_key=True,
+        editable=False
+    )
+    alert_type = models.CharField(
+        max_length=50,
+        choices=AlertType.choices
+    )
+    message = models.TextField()
+    occurrence_count = models.PositiveIntegerField(default=1)
+    items = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    recipient_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        related_name='archived_alert_recipients'
+    )
+    recipient_id = models.UUIDField()
+    recipient = GenericForeignKey('recipient_type', 'recipient_id')
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        related_name='archived_alert_content'
+    )
+    object_id = models.UUIDField()
+    content_object = GenericForeignKey('content_type', 'object_id')
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['recipient_type', 'recipient_id', '-created_at']),
+        ]
+        verbose_name = _("Archived Alert")
+        verbose_name_plural = _("Archived Alerts")
+
+    def __str__(self):
+        return f"{self.alert_type} - {self.created_at.strftime('%Y-%m-%d %H:%M:%S')} (archived)"
+
+
+class AlertCounter(models.Model):
+    """
+    Number of unread alerts per recipient, kept in step with Alert by AlertService so
+    badge polling reads one row instead of counting alerts.
+    """
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False
+    )
+    recipient_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        related_name='alert_counters',
+        help_text=_("Content type of the recipient")
+    )
+    recipient_id = models.UUIDField(
+        help_text=_("UUID of the recipient object")
+    )
+    unread_count = models.PositiveIntegerField(
+        default=0,
+        help_text=_("Number of unread alerts for the recipient")
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('recipient_type', 'recipient_id')
+        verbose_name = _("Alert Counter")
+        verbose_name_plural = _("Alert Counters")
+
+    def __str__(self):
+        return f"{self.recipient_type.model} {self.recipient_id}: {self.unread_count} unread"
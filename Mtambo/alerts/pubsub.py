@@ -0,0 +1,185 @@
+from django.conf import settings
+from django.utils.module_loading import import_string
+from functools import lru_cache
+import asyncio
+import json
+import logging
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def recipient_channel(recipient_type_id, recipient_id):
+    """Name of the pub/sub channel carrying new alerts for one recipient."""
+    return f"alerts:{recipient_type_id}:{recipient_id}"
+
+
+class InProcessAlertBroker:
+    """
+    Pub/sub within a single process. Used by tests and single-process deployments;
+    subscribers in other processes do not see messages published here.
+    """
+
+    class Subscription:
+        def __init__(self, broker, channels):
+            self.broker = broker
+            self.channels = channels
+            self.queue = queue.Queue()
+
+        def get(self, timeout=None):
+            """Return the next message, or None if none arrives within timeout seconds."""
+            try:
+                return self.queue.get(timeout=timeout)
+            except queue.Empty:
+                return None
+
+        def put(self, message):
+            self.queue.put(message)
+
+        def close(self):
+            self.broker.unsubscribe(self)
+
+    class AsyncSubscription:
+        """Subscription read from an event loop; messages published from any thread are handed to the loop."""
+
+        def __init__(self, broker, channels):
+            self.broker = broker
+            self.channels = channels
+            self.loop = asyncio.get_running_loop()
+            self.queue = asyncio.Queue()
+
+        async def get(self, timeout=None):
+            """Return the next message, or None if none arrives within timeout seconds."""
+            try:
+                return await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+        def put(self, message):
+            try:
+                self.loop.call_soon_threadsafe(self.queue.put_nowait, message)
+            except RuntimeError:
+                # The subscriber's loop has shut down without closing the subscription
+                self.broker.unsubscribe(self)
+
+        async def close(self):
+            self.broker.unsubscribe(self)
+
+    def __init__(self, url=None):
+        self.lock = threading.Lock()
+        self.subscriptions = set()
+
+    def publish(self, channel, message):
+        with self.lock:
+            subscriptions = [sub for sub in self.subscriptions if channel in sub.channels]
+        for subscription in subscriptions:
+            subscription.put(message)
+
+    def subscribe(self, channels):
+        subscription = self.Subscription(self, set(channels))
+        with self.lock:
+            self.subscriptions.add(subscription)
+        return subscription
+
+    async def asubscribe(self, channels):
+        subscription = self.AsyncSubscription(self, set(channels))
+        with self.lock:
+            self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscriptions.discard(subscription)
+
+
+class RedisAlertBroker:
+    """Pub/sub over Redis channels, shared by every web and worker process."""
+
+    class Subscription:
+        def __init__(self, pubsub):
+            self.pubsub = pubsub
+
+        def get(self, timeout=None):
+            """Return the next message, or None if none arrives within timeout seconds."""
+            message = self.pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+            if message is None:
+                return None
+            return json.loads(message['data'])
+
+        def close(self):
+            self.pubsub.close()
+
+    class AsyncSubscription:
+        """Subscription over redis.asyncio, holding its own connection until closed."""
+
+        def __init__(self, client, pubsub):
+            self.client = client
+            self.pubsub = pubsub
+
+        async def get(self, timeout=None):
+            """Return the next message, or None if none arrives within timeout seconds."""
+            message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+            if message is None:
+                return None
+            return json.loads(message['data'])
+
+        async def close(self):
+            await self.pubsub.aclose()
+            await self.client.aclose()
+
+    def __init__(self, url):
+        import redis
+
+        self.url = url
+        self.client = redis.Redis.from_url(url)
+
+    def publish(self, channel, message):
+        self.client.publish(channel, json.dumps(message))
+
+    def subscribe(self, channels):
+        pubsub = self.client.pubsub()
+        pubsub.subscribe(*channels)
+        return self.Subscription(pubsub)
+
+    async def asubscribe(self, channels):
+        # redis.asyncio connections belong to the event loop that opened them, so each
+        # async subscription gets its own client rather than sharing one across loops
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(*channels)
+        return self.AsyncSubscription(client, pubsub)
+
+
+@lru_cache(maxsize=None)
+def load_broker(backend, url):
+    return import_string(backend)(url)
+
+
+def get_alert_broker():
+    """The broker configured by ALERT_PUBSUB_BACKEND and ALERT_PUBSUB_URL."""
+    return load_broker(settings.ALERT_PUBSUB_BACKEND, settings.ALERT_PUBSUB_URL)
+
+
+def publish_alerts(alerts):
+    """
+    Publish newly created alerts to their recipients' channels. Delivery is best
+    effort: the alerts are already stored, so a broker failure is only logged.
+    """
+    try:
+        broker = get_alert_broker()
+        for alert in alerts:
+            broker.publish(
+                recipient_channel(alert.recipient_type_id, alert.recipient_id),
+                {
+                    'id': str(alert.id),
+                    'alert_type': alert.alert_type,
+                    'message': alert.message,
+                    'created_at': alert.created_at.isoformat(),
+                    'is_read': alert.is_read,
+                },
+            )
+    except Exception as e:
+        logger.warning(f"Failed to publish {len(alerts)} alert(s): {str(e)}")
@@ -16,10 +16,12 @@ class AlertSerializer(serializers.ModelSerializer):
             'message', 
             'created_at', 
             'is_read',
+            'occurrence_count',
+            'items',
             'content_object_info',
             'recipient_info'
         ]
-        read_only_fields = ['id', 'created_at']
+        read_only_fields = ['id', 'created_at', 'occurrence_count', 'items']
     
     def get_content_object_info(self, obj):
         """Get information about the related object"""
@@ -111,3 +113,19 @@ class AlertSerializer(serializers.ModelSerializer):
                 'id': str(obj.recipient_id),
                 'error': 'Unable to fetch complete recipient details'
             }
+
+
+class AlertAcknowledgeSerializer(serializers.Serializer):
+    """Selects the alerts to mark as read: a list of ids or a created_at watermark."""
+    ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        allow_empty=False,
+        max_length=500
+    )
+    up_to = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('up_to' in attrs):
+            raise serializers.ValidationError("Provide either 'ids' or 'up_to'.")
+        return attrs
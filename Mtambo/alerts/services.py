@@ -1,10 +1,17 @@
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.db import transaction
+from django.db.models import F, Q, Sum
+from django.db.models.functions import Greatest
+from collections import Counter
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from datetime import timedelta
 import logging
 
-from .models import Alert, AlertType
+from .models import Alert, AlertCounter, AlertType, ArchivedAlert
+from .pubsub import publish_alerts
 
 logger = logging.getLogger(__name__)
 
@@ -55,18 +62,9 @@ class AlertService:
                 object_id=related_object.id,
                 message=message
             )
-        
-            # Verify the alert was actually saved
-            try:
-                saved_alert = Alert.objects.get(id=alert.id)
-                logger.info(
-                    f"Alert verified in database: id={saved_alert.id}, "
-                    f"type={saved_alert.alert_type}, "
-                    f"recipient={saved_alert.recipient}"
-                )
-            except Alert.DoesNotExist:
-                logger.error(f"Alert {alert.id} was created but not found in database!")
-                raise Exception("Alert creation failed - could not verify in database")
+
+            AlertCounterService.increment({(alert.recipient_type_id, alert.recipient_id): 1})
+            transaction.on_commit(lambda: publish_alerts([alert]))
 
             logger.info(
                 f"Alert created successfully: id={alert.id}, type={alert_type}, "
@@ -79,6 +77,139 @@ class AlertService:
             logger.error(f"Failed to create alert: {str(e)}", exc_info=True)
             raise 
 
+    @classmethod
+    def build_alert(cls, alert_type, recipient, related_object, message=None):
+        """
+        Describe an alert to be written later by enqueue_alerts. The result only holds
+        ids and text so it can be passed to a Celery task. Content types come from
+        Django's in-process cache, so building an alert does not query the database.
+        """
+        if not isinstance(alert_type, str) or alert_type not in AlertType.values:
+            raise ValidationError(_("Invalid alert type"))
+        if not recipient:
+            raise ValidationError(_("Recipient is required"))
+        if not related_object:
+            raise ValidationError(_("Related object is required"))
+
+        if message is None:
+            message = cls.get_default_message(alert_type, related_object)
+
+        return {
+            'alert_type': alert_type,
+            'recipient_type_id': ContentType.objects.get_for_model(recipient).id,
+            'recipient_id': str(recipient.id),
+            'content_type_id': ContentType.objects.get_for_model(related_object).id,
+            'object_id': str(related_object.id),
+            'message': str(message),
+        }
+
+    @classmethod
+    def enqueue_alerts(cls, alerts):
+        """
+        Write the given alerts (from build_alert) in the background once the current
+        transaction commits. Nothing is written if the transaction rolls back.
+        """
+        alerts = [alert for alert in alerts if alert]
+        if alerts:
+            transaction.on_commit(lambda: cls.dispatch_alerts(alerts))
+
+    @classmethod
+    def enqueue_alert(cls, alert_type, recipient, related_object, message=None):
+        """Shortcut for enqueueing a single alert."""
+        cls.enqueue_alerts([cls.build_alert(alert_type, recipient, related_object, message)])
+
+    @classmethod
+    def dispatch_alerts(cls, alerts):
+        """
+        Hand a batch of alerts to the Celery worker. If the broker cannot be reached the
+        batch is written in-process instead of being lost.
+        """
+        from .tasks import create_alerts
+
+        try:
+            create_alerts.delay(alerts)
+        except Exception as e:
+            logger.warning(f"Could not queue {len(alerts)} alert(s), writing them directly: {str(e)}")
+            cls.bulk_create_alerts(alerts)
+
+    @classmethod
+    @transaction.atomic
+    def bulk_create_alerts(cls, alerts):
+        """
+        Write a batch of alerts from build_alert: bursts are first coalesced into digests
+        (see AlertCoalescingService), the remaining alerts are inserted with a single
+        query, each recipient's unread counter is bumped once and, after commit, the
+        alerts are pushed to any connected alert streams. Returns the created and the
+        merged alerts.
+        """
+        new_alerts, merged = AlertCoalescingService.coalesce(alerts)
+        created = Alert.objects.bulk_create([Alert(**alert) for alert in new_alerts])
+        AlertCounterService.increment(Counter(
+            (alert['recipient_type_id'], str(alert['recipient_id'])) for alert in new_alerts
+        ))
+        transaction.on_commit(lambda: publish_alerts(created + merged))
+        logger.info(f"Created {len(created)} alert(s), merged {len(merged)} into existing alerts")
+        return created + merged
+
+    @staticmethod
+    def get_recipients(user):
+        """
+        Return a (content type, id) pair for each of the user's profiles that can
+        receive alerts. Content types come from Django's in-process cache.
+        """
+        recipients = []
+        for profile_name in ('developer_profile', 'maintenance_profile', 'technician_profile'):
+            profile = getattr(user, profile_name, None)
+            if profile is not None:
+                recipients.append((ContentType.objects.get_for_model(profile), profile.id))
+        return recipients
+
+    @staticmethod
+    def recipient_filter(recipients):
+        """Q matching alerts, or counters, addressed to any of the given recipients."""
+        query = Q()
+        for recipient_type, recipient_id in recipients:
+            query |= Q(recipient_type=recipient_type, recipient_id=recipient_id)
+        return query
+
+    @classmethod
+    def get_alerts_for_user(cls, user):
+        """All alerts addressed to any of the user's profiles, newest first."""
+        recipients = cls.get_recipients(user)
+        if not recipients:
+            return Alert.objects.none()
+        return Alert.objects.filter(cls.recipient_filter(recipients)).order_by('-created_at')
+
+    @classmethod
+    @transaction.atomic
+    def mark_as_read(cls, user, ids=None, up_to=None):
+        """
+        Mark the user's unread alerts as read: those with the given ids, those created at
+        or before up_to, or all of them when neither is given. Ownership is enforced by the
+        UPDATE's own filter, so ids belonging to someone else are simply not matched. One
+        UPDATE per profile of the user, and the same amounts come off the unread counters.
+        Returns the number of alerts updated.
+        """
+        filters = {'is_read': False}
+        if ids is not None:
+            filters['id__in'] = ids
+        if up_to is not None:
+            filters['created_at__lte'] = up_to
+
+        total = 0
+        for recipient_type, recipient_id in cls.get_recipients(user):
+            updated = Alert.objects.filter(
+                recipient_type=recipient_type, recipient_id=recipient_id, **filters
+            ).update(is_read=True)
+            AlertCounterService.decrement(recipient_type.id, recipient_id, updated)
+            total += updated
+        return total
+
+    @classmethod
+    def mark_all_as_read(cls, user):
+        """Mark every unread alert of the user as read. Returns the number updated."""
+        return cls.mark_as_read(user)
+
     @classmethod
     def get_default_message(cls, alert_type, related_object):
         """
@@ -123,14 +254,13 @@ class AlertService:
             return "New alert"
 
     @classmethod
-    @transaction.atomic
-    def create_building_registration_alert(cls, building, company, developer):
+    def building_registration_alerts(cls, building, company, developer):
         """
-        Create alerts for building registration
+        Build the alerts sent when a building is registered: one for the developer and
+        one for the maintenance company.
         """
-        try:
-            # Create alert for developer
-            developer_alert = cls.create_alert(
+        return [
+            cls.build_alert(
                 alert_type=AlertType.BUILDING_REGISTERED,
                 recipient=developer,
                 related_object=building,
@@ -138,16 +268,25 @@ class AlertService:
                     f"Your building '{building.name}' has been registered by "
                     f"maintenance company '{company.company_name}'"
                 )
-            )
-
-            # Create alert for company
-            company_alert = cls.create_alert(
+            ),
+            cls.build_alert(
                 alert_type=AlertType.BUILDING_REGISTERED,
                 recipient=company,
                 related_object=building,
                 message=f"Building '{building.name}' has been successfully registered"
-            )
+            ),
+        ]
 
+    @classmethod
+    @transaction.atomic
+    def create_building_registration_alert(cls, building, company, developer):
+        """
+        Create alerts for building registration
+        """
+        try:
+            developer_alert, company_alert = cls.bulk_create_alerts(
+                cls.building_registration_alerts(building, company, developer)
+            )
             return developer_alert, company_alert
 
         except Exception as e:
@@ -161,13 +300,12 @@ class AlertService:
     @transaction.atomic
     def create_elevator_registration_alerts(cls, elevators, building, company, developer):
         """
-        Create alerts for elevator registration
+        Create alerts for elevator registration. Each technician gets a single digest
+        listing the elevators assigned to them rather than one alert per elevator.
         """
         try:
-            alerts = []
-            
             # Alert for developer
-            developer_alert = cls.create_alert(
+            alerts = [cls.build_alert(
                 alert_type=AlertType.ELEVATOR_REGISTERED,
                 recipient=developer,
                 related_object=building,
@@ -175,25 +313,23 @@ class AlertService:
                     f"{len(elevators)} elevator(s) have been registered to "
                     f"{company.company_name} in building {building.name}"
                 )
-            )
-            alerts.append(developer_alert)
+            )]
 
-            # Alerts for assigned technicians
+            # Alerts for assigned technicians, coalesced per technician and building
             for elevator in elevators:
                 if elevator.technician:
-                    tech_alert = cls.create_alert(
+                    alerts.append(cls.build_alert(
                         alert_type=AlertType.ELEVATOR_ASSIGNED,
                         recipient=elevator.technician,
-                        related_object=elevator,
+                        related_object=building,
                         message=(
                             f"New elevator {elevator.machine_number} has been "
                             f"assigned to you in building {building.name}"
                         )
-                    )
-                    alerts.append(tech_alert)
+                    ))
 
             # Alert for maintenance company
-            company_alert = cls.create_alert(
+            alerts.append(cls.build_alert(
                 alert_type=AlertType.ELEVATOR_REGISTERED,
                 recipient=company,
                 related_object=building,
@@ -201,10 +337,9 @@ class AlertService:
                     f"{len(elevators)} elevator(s) have been successfully registered "
                     f"in building {building.name}"
                 )
-            )
-            alerts.append(company_alert)
+            ))
 
-            return alerts
+            return cls.bulk_create_alerts(alerts)
 
         except Exception as e:
             logger.error(
@@ -212,3 +347,168 @@ class AlertService:
                 f"error={str(e)}"
             )
             raise
+
+
+class AlertCoalescingService:
+    """
+    Merges bursts of alerts that share a recipient, alert type and related object. Within
+    one batch they become a single alert; across batches a new alert is folded into the
+    newest unread alert with the same key created less than ALERT_COALESCE_WINDOW_SECONDS
+    ago. A merged alert counts its events in occurrence_count and lists their messages in
+    items (at most ALERT_DIGEST_MAX_ITEMS, newest kept), and shows the latest message.
+    """
+
+    @staticmethod
+    def get_key(alert):
+        """Coalescing key of an alert given as a build_alert dict or an Alert."""
+        if isinstance(alert, Alert):
+            alert = {field: getattr(alert, field) for field in (
+                'recipient_type_id', 'recipient_id', 'alert_type', 'content_type_id', 'object_id'
+            )}
+        return (
+            alert['recipient_type_id'], str(alert['recipient_id']), alert['alert_type'],
+            alert['content_type_id'], str(alert['object_id']),
+        )
+
+    @staticmethod
+    def combine(first_items, first_message, second_items, second_message):
+        """The digest item list for two merged alerts."""
+        items = (first_items or [first_message]) + (second_items or [second_message])
+        return items[-settings.ALERT_DIGEST_MAX_ITEMS:]
+
+    @classmethod
+    def merge_batch(cls, alerts):
+        """Collapse alerts of a batch that share a key into one alert per key."""
+        merged = {}
+        for alert in alerts:
+            key = cls.get_key(alert)
+            if key not in merged:
+                merged[key] = {'occurrence_count': 1, 'items': [], **alert}
+                continue
+            digest = merged[key]
+            digest['items'] = cls.combine(digest['items'], digest['message'], alert.get('items'), alert['message'])
+            digest['occurrence_count'] += alert.get('occurrence_count', 1)
+            digest['message'] = alert['message']
+        return list(merged.values())
+
+    @classmethod
+    def coalesce(cls, alerts, now=None):
+        """
+        Split a batch into alerts that still need inserting and existing alerts that
+        absorbed the rest (already saved). Existing candidates are fetched with one query.
+        """
+        batch = cls.merge_batch(alerts)
+        if not batch:
+            return [], []
+
+        now = now or timezone.now()
+        window_start = now - timedelta(seconds=settings.ALERT_COALESCE_WINDOW_SECONDS)
+        candidates = Alert.objects.filter(
+            is_read=False,
+            created_at__gte=window_start,
+            recipient_id__in={alert['recipient_id'] for alert in batch},
+            object_id__in={alert['object_id'] for alert in batch},
+        ).order_by('created_at').select_for_update()
+        existing = {cls.get_key(alert): alert for alert in candidates}  # newest wins
+
+        new_alerts, merged = [], []
+        for alert in batch:
+            target = existing.get(cls.get_key(alert))
+            if target is None:
+                new_alerts.append(alert)
+                continue
+            target.items = cls.combine(target.items, target.message, alert['items'], alert['message'])
+            target.occurrence_count += alert['occurrence_count']
+            target.message = alert['message']
+            merged.append(target)
+
+        if merged:
+            Alert.objects.bulk_update(merged, ['items', 'occurrence_count', 'message'])
+        return new_alerts, merged
+
+
+class AlertCounterService:
+    """
+    Maintains AlertCounter, the per-recipient unread count. Counters are adjusted with
+    relative UPDATEs (unread_count + n) so concurrent writers never overwrite each other.
+    """
+
+    @classmethod
+    def increment(cls, counts):
+        """Add to the unread counters. counts maps (recipient_type_id, recipient_id) to n."""
+        if not counts:
+            return
+        AlertCounter.objects.bulk_create(
+            [
+                AlertCounter(recipient_type_id=recipient_type_id, recipient_id=recipient_id)
+                for recipient_type_id, recipient_id in counts
+            ],
+            ignore_conflicts=True,
+        )
+        for (recipient_type_id, recipient_id), count in counts.items():
+            AlertCounter.objects.filter(
+                recipient_type_id=recipient_type_id, recipient_id=recipient_id
+            ).update(unread_count=F('unread_count') + count)
+
+    @classmethod
+    def decrement(cls, recipient_type_id, recipient_id, count):
+        """Take count off a recipient's unread counter, never going below zero."""
+        if count:
+            AlertCounter.objects.filter(
+                recipient_type_id=recipient_type_id, recipient_id=recipient_id
+            ).update(unread_count=Greatest(F('unread_count') - count, 0))
+
+    @classmethod
+    def get_unread_count(cls, user):
+        """Total unread alerts across the user's profiles, read from the counters."""
+        recipients = AlertService.get_recipients(user)
+        if not recipients:
+            return 0
+        total = AlertCounter.objects.filter(
+            AlertService.recipient_filter(recipients)
+        ).aggregate(total=Sum('unread_count'))['total']
+        return total or 0
+
+
+class AlertArchiveService:
+    """
+    Moves read alerts older than ALERT_ARCHIVE_AFTER_DAYS from Alert into ArchivedAlert,
+    in batches that each commit on their own, so the live table stays proportional to
+    recent activity rather than to all alerts ever sent.
+    """
+    ARCHIVED_FIELDS = [
+        'id', 'alert_type', 'message', 'occurrence_count', 'items', 'created_at',
+        'recipient_type_id', 'recipient_id', 'content_type_id', 'object_id',
+    ]
+
+    @staticmethod
+    def get_cutoff(now=None):
+        """Read alerts created before this moment are due for archiving."""
+        now = now or timezone.now()
+        return now - timedelta(days=settings.ALERT_ARCHIVE_AFTER_DAYS)
+
+    @classmethod
+    def archive(cls, now=None, batch_size=1000):
+        """
+        Archive every due alert. Each batch is copied and deleted in one transaction, so
+        an interrupted run leaves no alert in both tables. Returns the number archived.
+        """
+        cutoff = cls.get_cutoff(now)
+        total = 0
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    Alert.objects.filter(is_read=True, created_at__lt=cutoff)
+                    .order_by('created_at')
+                    .values(*cls.ARCHIVED_FIELDS)[:batch_size]
+                )
+                if not batch:
+                    break
+                ArchivedAlert.objects.bulk_create(
+                    [ArchivedAlert(**row) for row in batch], ignore_conflicts=True
+                )
+                Alert.objects.filter(id__in=[row['id'] for row in batch]).delete()
+            total += len(batch)
+
+        logger.info(f"Archived {total} read alert(s) created before {cutoff}")
+        return total
@@ -0,0 +1,26 @@
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def create_alerts(alerts):
+    """
+    Write a batch of alerts queued by AlertService.enqueue_alerts with one bulk insert.
+    Returns the number of alerts created.
+    """
+    from alerts.services import AlertService
+
+    return len(AlertService.bulk_create_alerts(alerts))
+
+
+@shared_task
+def archive_read_alerts():
+    """
+    Move read alerts older than ALERT_ARCHIVE_AFTER_DAYS into the archive table.
+    Returns the number of alerts archived.
+    """
+    from alerts.services import AlertArchiveService
+
+    return AlertArchiveService.archive()
@@ -1,3 +1,365 @@
+from asgiref.sync import sync_to_async
+from datetime import timedelta
+from unittest.mock import patch
+import asyncio
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
 from django.test import TestCase
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from alerts.models import Alert, AlertCounter, AlertType, ArchivedAlert
+from alerts.pubsub import InProcessAlertBroker, get_alert_broker, recipient_channel
+from alerts.services import AlertArchiveService, AlertCounterService, AlertService
+from alerts.tasks import archive_read_alerts, create_alerts
+from jobs.factories import BuildingFactory, ElevatorFactory, TechnicianProfileFactory
+
+
+class AlertPipelineTest(TestCase):
+    def setUp(self):
+        self.building = BuildingFactory()
+        self.developer = self.building.developer
+        self.technician = TechnicianProfileFactory()
+
+    def build_alerts(self):
+        return [
+            AlertService.build_alert(AlertType.BUILDING_REGISTERED, self.developer, self.building, "Registered"),
+            AlertService.build_alert(AlertType.TECHNICIAN_UPDATED_FOR_BUILDING, self.technician, self.building, "Assigned"),
+        ]
+
+    def test_build_alert_does_not_query_the_database(self):
+        AlertService.build_alert(AlertType.BUILDING_REGISTERED, self.developer, self.building, "Warm cache")
+
+        with self.assertNumQueries(0):
+            alert = AlertService.build_alert(AlertType.BUILDING_REGISTERED, self.developer, self.building, "Hi")
+
+        self.assertEqual(alert['recipient_id'], str(self.developer.id))
+        self.assertEqual(alert['object_id'], str(self.building.id))
+
+    def test_enqueued_alerts_are_sent_as_one_batch_on_commit(self):
+        with patch.object(create_alerts, 'delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                AlertService.enqueue_alerts(self.build_alerts())
+                delay.assert_not_called()
+
+        delay.assert_called_once()
+        self.assertEqual(len(delay.call_args.args[0]), 2)
+
+    def test_rolled_back_alerts_are_dropped(self):
+        with patch.object(create_alerts, 'delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                try:
+                    with transaction.atomic():
+                        AlertService.enqueue_alerts(self.build_alerts())
+                        raise RuntimeError("rollback")
+                except RuntimeError:
+                    pass
+
+        self.assertEqual(callbacks, [])
+        delay.assert_not_called()
+
+    def test_task_writes_the_batch_with_one_insert(self):
+        # Savepoint, coalescing lookup, alert insert, counter upsert, one counter update
+        # per recipient, release
+        with self.assertNumQueries(7):
+            self.assertEqual(create_alerts(self.build_alerts()), 2)
+
+        alert = Alert.objects.get(recipient_id=self.developer.id)
+        self.assertEqual(alert.recipient, self.developer)
+        self.assertEqual(alert.content_object, self.building)
+        self.assertEqual(alert.message, "Registered")
+
+    def test_alerts_are_written_directly_when_the_broker_is_down(self):
+        with patch.object(create_alerts, 'delay', side_effect=ConnectionError("broker down")):
+            with self.captureOnCommitCallbacks(execute=True):
+                AlertService.enqueue_alerts(self.build_alerts())
+
+        self.assertEqual(Alert.objects.count(), 2)
+
+
+class AlertCounterTest(APITestCase):
+    def setUp(self):
+        self.building = BuildingFactory()
+        self.developer = self.building.developer
+        self.user = self.developer.user
+        self.client.force_authenticate(self.user)
+
+    def add_alerts(self, count):
+        # A different building per alert, so they are not coalesced
+        AlertService.bulk_create_alerts([
+            AlertService.build_alert(AlertType.BUILDING_REGISTERED, self.developer, BuildingFactory(), f"Alert {n}")
+            for n in range(count)
+        ])
+
+    def test_counter_follows_created_alerts(self):
+        self.add_alerts(3)
+        AlertService.create_alert(AlertType.BUILDING_REGISTERED, self.developer, self.building, "One more")
+
+        self.assertEqual(AlertCounter.objects.get(recipient_id=self.developer.id).unread_count, 4)
+        self.assertEqual(AlertCounterService.get_unread_count(self.user), 4)
+
+    def test_marking_an_alert_read_twice_decrements_once(self):
+        self.add_alerts(2)
+        alert = Alert.objects.first()
+
+        alert.mark_as_read()
+        alert.mark_as_read()
+
+        self.assertEqual(AlertCounterService.get_unread_count(self.user), 1)
+        self.assertEqual(Alert.objects.filter(is_read=False).count(), 1)
+
+    def test_unread_count_endpoint_reads_the_counter(self):
+        self.add_alerts(5)
+        url = reverse('alerts:unread-alert-count')
+
+        # The user's missing technician and company profiles, then the counter sum
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'unread_count': 5})
+
+    def test_mark_all_read_resets_the_counter(self):
+        self.add_alerts(3)
+
+        response = self.client.post(reverse('alerts:mark-all-read'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Alert.objects.filter(is_read=False).count(), 0)
+        self.assertEqual(self.client.get(reverse('alerts:unread-alert-count')).data['unread_count'], 0)
+
+    def test_list_only_returns_the_users_alerts(self):
+        self.add_alerts(2)
+        other = BuildingFactory()
+        AlertService.create_alert(AlertType.BUILDING_REGISTERED, other.developer, other, "Not yours")
+
+        response = self.client.get(reverse('alerts:alert-list'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 2)
+
+
+@override_settings(ALERT_ARCHIVE_AFTER_DAYS=30)
+class AlertArchiveTest(TestCase):
+    def setUp(self):
+        self.building = BuildingFactory()
+        self.developer = self.building.developer
+
+    def add_alert(self, age_days, is_read):
+        alert = AlertService.create_alert(AlertType.BUILDING_REGISTERED, self.developer, self.building, "Hi")
+        Alert.objects.filter(id=alert.id).update(
+            created_at=timezone.now() - timedelta(days=age_days), is_read=is_read
+        )
+        return alert
+
+    def test_only_old_read_alerts_are_archived(self):
+        old_read = [self.add_alert(40, True) for _ in range(3)]
+        old_unread = self.add_alert(40, False)
+        recent_read = self.add_alert(5, True)
+
+        self.assertEqual(AlertArchiveService.archive(batch_size=2), 3)
+
+        self.assertEqual(
+            set(Alert.objects.values_list('id', flat=True)), {old_unread.id, recent_read.id}
+        )
+        archived = ArchivedAlert.objects.get(id=old_read[0].id)
+        self.assertEqual(archived.recipient, self.developer)
+        self.assertEqual(archived.content_object, self.building)
+        self.assertEqual(archived.message, "Hi")
+
+    def test_task_is_idempotent(self):
+        self.add_alert(40, True)
+
+        self.assertEqual(archive_read_alerts(), 1)
+        self.assertEqual(archive_read_alerts(), 0)
+        self.assertEqual(ArchivedAlert.objects.count(), 1)
+
+
+@override_settings(
+    ALERT_PUBSUB_BACKEND='alerts.pubsub.InProcessAlertBroker',
+    ALERT_STREAM_HEARTBEAT_SECONDS=0.05,
+    ALERT_STREAM_MAX_SECONDS=0.5,
+)
+class AlertStreamTest(APITestCase):
+    def setUp(self):
+        self.building = BuildingFactory()
+        self.developer = self.building.developer
+
+    def test_in_process_broker_only_delivers_subscribed_channels(self):
+        broker = InProcessAlertBroker()
+        subscription = broker.subscribe(['alerts:1:a'])
+
+        broker.publish('alerts:1:b', {'id': 'other'})
+        broker.publish('alerts:1:a', {'id': 'mine'})
+
+        self.assertEqual(subscription.get(timeout=0.1), {'id': 'mine'})
+        self.assertIsNone(subscription.get(timeout=0.01))
+        subscription.close()
+        self.assertEqual(broker.subscriptions, set())
+
+    def test_created_alerts_are_published_after_commit(self):
+        channel = recipient_channel(
+            ContentType.objects.get_for_model(self.developer).id, self.developer.id
+        )
+        subscription = get_alert_broker().subscribe([channel])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            alert = AlertService.create_alert(AlertType.BUILDING_REGISTERED, self.developer, self.building, "Hi")
+            self.assertIsNone(subscription.get(timeout=0.01))
+
+        message = subscription.get(timeout=0.1)
+        subscription.close()
+        self.assertEqual(message['id'], str(alert.id))
+        self.assertEqual(message['message'], "Hi")
+
+    def create_alert(self, developer, building, message):
+        with self.captureOnCommitCallbacks(execute=True):
+            return AlertService.create_alert(AlertType.BUILDING_REGISTERED, developer, building, message)
+
+    async def test_in_process_broker_hands_messages_to_async_subscribers(self):
+        broker = InProcessAlertBroker()
+        subscription = await broker.asubscribe(['alerts:1:a'])
+
+        await asyncio.to_thread(broker.publish, 'alerts:1:a', {'id': 'mine'})
+
+        self.assertEqual(await subscription.get(timeout=0.1), {'id': 'mine'})
+        self.assertIsNone(await subscription.get(timeout=0.01))
+        await subscription.close()
+        self.assertEqual(broker.subscriptions, set())
+
+    async def test_stream_delivers_alerts_before_it_closes(self):
+        await self.async_client.aforce_login(self.developer.user)
+        response = await self.async_client.get(reverse('alerts:alert-stream'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        events = response.streaming_content
+        self.assertEqual(await anext(events), b": connected\n\n")
+
+        alert = await sync_to_async(self.create_alert)(self.developer, self.building, "Hi")
+        other = await sync_to_async(BuildingFactory)()
+        await sync_to_async(self.create_alert)(other.developer, other, "Not yours")
+
+        event = await anext(events)
+        while event == b": keep-alive\n\n":
+            event = await anext(events)
+        self.assertTrue(event.decode().startswith(f"id: {alert.id}\nevent: alert\n"))
+        # Still streaming: the alert arrived while the connection was open
+        self.assertEqual(len(get_alert_broker().subscriptions), 1)
+
+        rest = b''.join([part async for part in events]).decode()
+        self.assertNotIn("Not yours", rest)
+        self.assertEqual(get_alert_broker().subscriptions, set())
+
+    async def test_stream_requires_authentication(self):
+        response = await self.async_client.get(reverse('alerts:alert-stream'))
+
+        self.assertEqual(response.status_code, 401)
+
+
+class AlertAcknowledgeTest(APITestCase):
+    def setUp(self):
+        self.url = reverse('alerts:acknowledge-alerts')
+        self.building = BuildingFactory()
+        self.developer = self.building.developer
+        self.user = self.developer.user
+        self.client.force_authenticate(self.user)
+        self.alerts = [
+            AlertService.create_alert(AlertType.BUILDING_REGISTERED, self.developer, self.building, f"Alert {n}")
+            for n in range(4)
+        ]
+        for days, alert in enumerate(self.alerts):
+            Alert.objects.filter(id=alert.id).update(created_at=timezone.now() - timedelta(days=10 - days))
+
+    def test_acknowledge_by_ids_ignores_other_recipients_alerts(self):
+        other = BuildingFactory()
+        foreign = AlertService.create_alert(AlertType.BUILDING_REGISTERED, other.developer, other, "Not yours")
+
+        response = self.client.post(
+            self.url, {'ids': [str(self.alerts[0].id), str(self.alerts[1].id), str(foreign.id)]}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['acknowledged'], 2)
+        self.assertFalse(Alert.objects.get(id=foreign.id).is_read)
+        self.assertEqual(AlertCounterService.get_unread_count(self.user), 2)
+
+    def test_acknowledge_up_to_watermark(self):
+        up_to = Alert.objects.get(id=self.alerts[2].id).created_at
+
+        response = self.client.post(self.url, {'up_to': up_to.isoformat()}, format='json')
+
+        self.assertEqual(response.data['acknowledged'], 3)
+        self.assertEqual(list(Alert.objects.filter(is_read=False).values_list('id', flat=True)), [self.alerts[3].id])
+
+    def test_acknowledge_uses_one_update(self):
+        ids = [str(alert.id) for alert in self.alerts]
+
+        # Missing technician and company profiles, savepoint, one UPDATE, counter decrement, release
+        with self.assertNumQueries(6):
+            response = self.client.post(self.url, {'ids': ids}, format='json')
+
+        self.assertEqual(response.data['acknowledged'], 4)
+
+    def test_ids_or_watermark_is_required(self):
+        self.assertEqual(self.client.post(self.url, {}, format='json').status_code, 400)
+        response = self.client.post(
+            self.url, {'ids': [str(self.alerts[0].id)], 'up_to': timezone.now().isoformat()}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(ALERT_COALESCE_WINDOW_SECONDS=300, ALERT_DIGEST_MAX_ITEMS=3)
+class AlertCoalescingTest(TestCase):
+    def setUp(self):
+        self.building = BuildingFactory()
+        self.developer = self.building.developer
+        self.user = self.developer.user
+
+    def build(self, message, alert_type=AlertType.TECHNICIAN_UPDATED_FOR_BUILDING):
+        return AlertService.build_alert(alert_type, self.developer, self.building, message)
+
+    def test_burst_in_one_batch_becomes_one_digest(self):
+        AlertService.bulk_create_alerts([self.build(f"Update {n}") for n in range(5)])
+
+        alert = Alert.objects.get()
+        self.assertEqual(alert.occurrence_count, 5)
+        self.assertEqual(alert.items, ["Update 2", "Update 3", "Update 4"])
+        self.assertEqual(alert.message, "Update 4")
+        self.assertEqual(AlertCounterService.get_unread_count(self.user), 1)
+
+    def test_later_alerts_merge_into_the_unread_alert_within_the_window(self):
+        AlertService.bulk_create_alerts([self.build("First")])
+        AlertService.bulk_create_alerts([self.build("Second")])
+
+        alert = Alert.objects.get()
+        self.assertEqual(alert.occurrence_count, 2)
+        self.assertEqual(alert.items, ["First", "Second"])
+        self.assertEqual(AlertCounterService.get_unread_count(self.user), 1)
+
+    def test_different_types_read_alerts_and_old_alerts_are_not_merged(self):
+        AlertService.bulk_create_alerts([self.build("First")])
+        AlertService.bulk_create_alerts([self.build("Other", AlertType.BUILDING_REGISTERED)])
+        self.assertEqual(Alert.objects.count(), 2)
+
+        Alert.objects.update(is_read=True)
+        AlertService.bulk_create_alerts([self.build("After read")])
+        self.assertEqual(Alert.objects.count(), 3)
+
+        Alert.objects.update(created_at=timezone.now() - timedelta(minutes=10))
+        AlertService.bulk_create_alerts([self.build("After window")])
+        self.assertEqual(Alert.objects.count(), 4)
+
+    def test_elevator_registration_sends_one_digest_per_technician(self):
+        technician = TechnicianProfileFactory()
+        elevators = [ElevatorFactory(building=self.building, technician=technician) for _ in range(3)]
+
+        AlertService.create_elevator_registration_alerts(
+            elevators, self.building, technician.maintenance_company, self.developer
+        )
+
+        digest = Alert.objects.get(recipient_id=technician.id)
+        self.assertEqual(digest.occurrence_count, 3)
+        self.assertEqual(len(digest.items), 3)
+        self.assertEqual(Alert.objects.count(), 3)
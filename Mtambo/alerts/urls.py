@@ -2,6 +2,9 @@ from django.urls import path
 from alerts.views import (
     AlertListView,
     UnreadAlertsView,
+    UnreadAlertCountView,
+    AlertStreamView,
+    AcknowledgeAlertsView,
     MarkAlertReadView,
     MarkAllAlertsReadView
 )
@@ -11,6 +14,9 @@ app_name = 'alerts'
 urlpatterns = [
     path('', AlertListView.as_view(), name='alert-list'),
     path('unread/', UnreadAlertsView.as_view(), name='unread-alerts'),
+    path('unread/count/', UnreadAlertCountView.as_view(), name='unread-alert-count'),
     path('<uuid:id>/mark-read/', MarkAlertReadView.as_view(), name='mark-alert-read'),
     path('mark-all-read/', MarkAllAlertsReadView.as_view(), name='mark-all-read'),
+    path('acknowledge/', AcknowledgeAlertsView.as_view(), name='acknowledge-alerts'),
+    path('stream/', AlertStreamView.as_view(), name='alert-stream'),
 ]
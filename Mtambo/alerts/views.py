@@ -1,13 +1,21 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
 from rest_framework import generics, status
+from rest_framework.exceptions import APIException, NotAuthenticated
+from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q
-from uuid import UUID
+from rest_framework.settings import api_settings
+import json
 import logging
+import time
 
 from .models import Alert
-from .serializers import AlertSerializer
+from .serializers import AlertAcknowledgeSerializer, AlertSerializer
+from .pubsub import get_alert_broker, recipient_channel
+from .services import AlertCounterService, AlertService
 
 logger = logging.getLogger(__name__)
 
@@ -20,31 +28,7 @@ class AlertListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        user = self.request.user
-        
-        # Get content types for different user profiles
-        developer_type = ContentType.objects.get(app_label='developers', model='developerprofile')
-        company_type = ContentType.objects.get(app_label='maintenance_companies', model='maintenancecompanyprofile')
-        technician_type = ContentType.objects.get(app_label='technicians', model='technicianprofile')
-        
-        query = Q()
-        
-        # Add queries based on user's profiles
-        if hasattr(user, 'developer_profile'):
-            query |= Q(recipient_type=developer_type, recipient_id=user.developer_profile.id)
-        
-        if hasattr(user, 'maintenance_company'):
-            query |= Q(recipient_type=company_type, recipient_id=user.maintenance_company.id)
-        
-        if hasattr(user, 'technician_profile'):
-            query |= Q(recipient_type=technician_type, recipient_id=user.technician_profile.id)
-        
-        alerts = Alert.objects.filter(query).order_by('-created_at')
-        
-        # Log query results for debugging
-        logger.debug(f"Found {alerts.count()} alerts for user {user.id}")
-        
-        return alerts
+        return AlertService.get_alerts_for_user(self.request.user)
 
 
 class UnreadAlertsView(AlertListView):
@@ -94,22 +78,10 @@ class MarkAlertReadView(generics.UpdateAPIView):
 
     def _user_has_permission(self, user, alert):
         """Check if user has permission to mark the alert as read"""
-        recipient = alert.recipient
-        
-        if not recipient:
-            return False
-            
-        # Check based on recipient type
-        recipient_type = alert.recipient_type.model
-        
-        if recipient_type == 'developerprofile':
-            return hasattr(user, 'developer_profile') and user.developer_profile.id == alert.recipient_id
-        elif recipient_type == 'maintenancecompanyprofile':
-            return hasattr(user, 'maintenance_company') and user.maintenance_company.id == alert.recipient_id
-        elif recipient_type == 'technicianprofile':
-            return hasattr(user, 'technician_profile') and user.technician_profile.id == alert.recipient_id
-            
-        return False
+        return any(
+            recipient_type.id == alert.recipient_type_id and recipient_id == alert.recipient_id
+            for recipient_type, recipient_id in AlertService.get_recipients(user)
+        )
 
 
 class MarkAllAlertsReadView(generics.GenericAPIView):
@@ -120,11 +92,8 @@ class MarkAllAlertsReadView(generics.GenericAPIView):
     
     def post(self, request):
         try:
-            # Get all unread alerts for the user
-            alerts = AlertListView().get_queryset().filter(is_read=False)
-            
-            # Update all alerts
-            count = alerts.update(is_read=True)
+            # Update all unread alerts for the user and their unread counters
+            count = AlertService.mark_all_as_read(request.user)
             
             return Response({
                 'status': 'success',
@@ -136,4 +105,103 @@ class MarkAllAlertsReadView(generics.GenericAPIView):
             return Response(
                 {'error': 'Failed to mark alerts as read'},
                 status=status.HTTP_400_BAD_REQUEST
-            ) 
+            )
+
+
+class AcknowledgeAlertsView(generics.GenericAPIView):
+    """
+    Mark several alerts of the authenticated user as read in one request, either by
+    id list or everything created up to a timestamp
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = AlertAcknowledgeSerializer
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        count = AlertService.mark_as_read(request.user, **serializer.validated_data)
+        return Response({
+            'status': 'success',
+            'acknowledged': count
+        })
+
+
+class UnreadAlertCountView(generics.GenericAPIView):
+    """
+    Number of unread alerts for the authenticated user, read from the per-recipient
+    counters so frequent badge polling stays cheap
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response({'unread_count': AlertCounterService.get_unread_count(request.user)})
+
+
+async def alert_event_stream(subscription, heartbeat, duration):
+    """
+    Yield server-sent events for the alerts arriving on an async subscription. A comment
+    line is sent every heartbeat seconds to keep proxies from closing the connection, and
+    the stream ends after duration seconds; EventSource clients reconnect on their own.
+    """
+    deadline = time.monotonic() + duration
+    try:
+        yield ": connected\n\n"
+        while (remaining := deadline - time.monotonic()) > 0:
+            message = await subscription.get(timeout=min(heartbeat, remaining))
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"id: {message['id']}\nevent: alert\ndata: {json.dumps(message)}\n\n"
+    finally:
+        await subscription.close()
+
+
+class AlertStreamView(View):
+    """
+    Server-sent event stream of new alerts for the authenticated user, replacing
+    polling of the alert list. The view and its stream are asynchronous: served from
+    the ASGI application (Mtambo.asgi), each event is flushed as it is published and
+    an idle connection holds no worker thread.
+    """
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+
+    def get_channels(self, request):
+        """
+        Channels of the user authenticated the same way as the other alert views, or an
+        error response. DRF authentication is synchronous, so this runs in a thread.
+        """
+        request = Request(request, authenticators=[auth() for auth in self.authentication_classes])
+        try:
+            user = request.user
+        except APIException as e:
+            return JsonResponse({'detail': str(e.detail)}, status=e.status_code)
+        if not user.is_authenticated:
+            return JsonResponse({'detail': str(NotAuthenticated.default_detail)}, status=status.HTTP_401_UNAUTHORIZED)
+
+        channels = [
+            recipient_channel(recipient_type.id, recipient_id)
+            for recipient_type, recipient_id in AlertService.get_recipients(user)
+        ]
+        if not channels:
+            return JsonResponse({'error': 'No alert recipient profile found'}, status=status.HTTP_404_NOT_FOUND)
+        return channels
+
+    async def get(self, request):
+        channels = await sync_to_async(self.get_channels)(request)
+        if isinstance(channels, JsonResponse):
+            return channels
+
+        subscription = await get_alert_broker().asubscribe(channels)
+        response = StreamingHttpResponse(
+            alert_event_stream(
+                subscription,
+                heartbeat=settings.ALERT_STREAM_HEARTBEAT_SECONDS,
+                duration=settings.ALERT_STREAM_MAX_SECONDS,
+            ),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
@@ -0,0 +1,78 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from drf_yasg import openapi
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+# Rows rendered per chunk of the response body
+EXPORT_BATCH_SIZE = 500
+
+EXPORT_PARAMETERS = [
+    openapi.Parameter('file_format', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=list(EXPORT_FORMATS),
+        description="Export format (default: csv)"),
+    openapi.Parameter('building_id', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID,
+        description="Only export rows for this building"),
+    openapi.Parameter('start_date', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE,
+        description="Only export rows on or after this date (YYYY-MM-DD)"),
+    openapi.Parameter('end_date', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE,
+        description="Only export rows on or before this date (YYYY-MM-DD)"),
+]
+
+
+class Echo:
+    """File-like object whose write() hands the written text back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def to_text(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def render_csv(rows, columns):
+    """Yield a header line, then the rows as CSV, EXPORT_BATCH_SIZE rows per chunk."""
+    writer = csv.writer(Echo())
+    batch = [writer.writerow(list(columns))]
+    for row in rows:
+        batch.append(writer.writerow([to_text(row[key]) for key in columns.values()]))
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+def render_ndjson(rows, columns):
+    """Yield the rows as one JSON object per line, EXPORT_BATCH_SIZE rows per chunk."""
+    batch = []
+    for row in rows:
+        batch.append(json.dumps({column: row[key] for column, key in columns.items()}, cls=DjangoJSONEncoder) + '\n')
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+def export_response(rows, columns, file_format, filename):
+    """
+    Stream rows (dicts, typically from queryset.values().iterator()) as a CSV or NDJSON
+    attachment. columns maps each output column to its key in the rows. Rows are
+    rendered as the response is sent, so memory use does not grow with the number
+    of rows.
+    """
+    render = render_ndjson if file_format == 'ndjson' else render_csv
+    response = StreamingHttpResponse(render(rows, columns), content_type=EXPORT_FORMATS[file_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{file_format}"'
+    return response
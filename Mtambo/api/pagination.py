@@ -0,0 +1,146 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import date, datetime
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class SchedulePagination(PageNumberPagination):
+    """Page-numbered schedule listings, with the same page size limits as KeysetPagination."""
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward cursor pagination keyed on a unique ordering, e.g. ('-scheduled_date', 'id').
+
+    Each page is fetched with a WHERE clause that starts right after the last row of the
+    previous page, so every page costs the same indexed range scan no matter how deep the
+    client has paged. The cursor is an opaque base64 token holding that last row's key.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    ordering = ('-scheduled_date', 'id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, ordering=None):
+        if ordering:
+            self.ordering = tuple(ordering)
+        self.next_cursor = None
+
+    @classmethod
+    def is_requested(cls, request):
+        """True when the client asked for a paginated response."""
+        return cls.cursor_query_param in request.query_params or cls.page_size_query_param in request.query_params
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        try:
+            if encoded:
+                values = self.coerce_cursor(self.decode_cursor(encoded), queryset.model)
+                queryset = queryset.filter(self.build_keyset_filter(values))
+            rows = list(queryset.order_by(*self.ordering)[:page_size + 1])
+        except (ValidationError, ValueError, TypeError):
+            # A tampered cursor holding values the key fields cannot accept
+            raise NotFound(self.invalid_cursor_message)
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            self.next_cursor = self.encode_cursor(rows[-1])
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_fields(self):
+        return [field.lstrip('-') for field in self.ordering]
+
+    def build_keyset_filter(self, values):
+        """
+        Translate the cursor key into "row comes after the cursor" for the ordering, e.g.
+        for ('-scheduled_date', 'id'): scheduled_date < d OR (scheduled_date = d AND id > i).
+        """
+        keyset = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            keyset |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return keyset
+
+    def encode_cursor(self, row):
+        values = []
+        for field in self.get_fields():
+            value = row[field] if isinstance(row, dict) else getattr(row, field)
+            if isinstance(value, (datetime, date)):
+                value = value.isoformat()
+            elif isinstance(value, uuid.UUID):
+                value = str(value)
+            values.append(value)
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def coerce_cursor(self, values, model):
+        """
+        The cursor values converted by their ordering fields' to_python(). Key values are
+        never null, so a null means the cursor was tampered with. Raises ValidationError.
+        """
+        coerced = []
+        for name, value in zip(self.get_fields(), values):
+            if value is None:
+                raise ValidationError(self.invalid_cursor_message)
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                # An annotation: left to the database to compare
+                coerced.append(value)
+                continue
+            coerced.append(field.to_python(value))
+        return coerced
+
+    def decode_cursor(self, encoded):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values
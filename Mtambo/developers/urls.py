@@ -5,6 +5,7 @@ from .views import DeveloperDetailView, DeveloperDetailByEmailView
 urlpatterns = [
     path('<uuid:developer_id>/', DeveloperDetailView.as_view(), name='developer-detail'),
     path('email/<str:developer_email>/', DeveloperDetailByEmailView.as_view(), name='developer-detail-by-email'),
-    path('<uuid:developer_uuid>/maintenance/logs/', DeveloperMaintenanceLogApprovalView.as_view(), name='developer-maintenance-log-approval') 
+    path('<uuid:developer_uuid>/maintenance/logs/', DeveloperMaintenanceLogApprovalView.as_view(), name='developer-maintenance-log-approval'),
+    path('<uuid:developer_id>/elevators/export/', DeveloperElevatorsExportView.as_view(), name='developer-elevators-export'),
 ]
 
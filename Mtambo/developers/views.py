@@ -14,6 +14,11 @@ from rest_framework.exceptions import NotFound, ValidationError
 from jobs.models import *
 from jobs.serializers import CompleteMaintenanceScheduleSerializer
 from django.db.models import Prefetch
+from rest_framework.permissions import IsAuthenticated
+from api.authentication import Custom401SessionAuthentication, Custom401JWTAuthentication
+from api.export import EXPORT_PARAMETERS
+from elevators.models import Elevator
+from elevators.services.export_service import FleetExportService
 from django.shortcuts import get_object_or_404
 
 
@@ -243,3 +248,24 @@ class DeveloperMaintenanceLogApprovalView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+
+class DeveloperElevatorsExportView(APIView):
+    """Stream every elevator in a developer's buildings as CSV or NDJSON."""
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [Custom401SessionAuthentication, Custom401JWTAuthentication]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Export the elevators in a developer's buildings as CSV or NDJSON. The date range "
+            "applies to the installation date."
+        ),
+        manual_parameters=EXPORT_PARAMETERS,
+        responses={200: "CSV or NDJSON file", 400: "Bad Request", 404: "Not Found"}
+    )
+    def get(self, request, developer_id):
+        developer = get_object_or_404(DeveloperProfile, id=developer_id)
+        return FleetExportService.export_elevators(
+            Elevator.objects.filter(building__developer=developer),
+            request.query_params,
+            filename=f"elevators-{developer.id}",
+        )
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Elevator
+from .models import Elevator, FleetImport
 
 admin.site.register(Elevator)
-
+admin.site.register(FleetImport)
@@ -0,0 +1,65 @@
+import os
+
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+
+from elevators.models import FleetImport
+from elevators.services.import_service import FleetImportService
+from maintenance_companies.models import MaintenanceCompanyProfile
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a maintenance company's buildings and elevators from a CSV or NDJSON file, "
+        "or resume an interrupted import with --resume."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('company_id', nargs='?', help="UUID of the maintenance company")
+        parser.add_argument('path', nargs='?', help="CSV or NDJSON file to import")
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help="File format (default: from the file extension)")
+        parser.add_argument('--resume', metavar='IMPORT_ID', help="Continue an existing import instead of starting one")
+        parser.add_argument('--chunk-size', type=int, help="Rows validated and inserted per transaction")
+
+    def handle(self, *args, **options):
+        if options['resume']:
+            try:
+                fleet_import = FleetImport.objects.get(id=options['resume'])
+            except (FleetImport.DoesNotExist, ValidationError):
+                raise CommandError(f"Fleet import {options['resume']} not found.")
+        else:
+            fleet_import = self.create_import(options)
+
+        fleet_import = FleetImportService.run(fleet_import, chunk_size=options['chunk_size'])
+
+        for error in fleet_import.errors:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        if fleet_import.status == 'failed':
+            raise CommandError(f"Import {fleet_import.id} failed: {fleet_import.failure_reason}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Import {fleet_import.id} {fleet_import.status}: {fleet_import.rows_processed} rows read, "
+            f"{fleet_import.buildings_created} buildings, {fleet_import.elevators_created} elevators and "
+            f"{fleet_import.schedules_created} maintenance schedules created, "
+            f"{fleet_import.error_count} rows rejected."
+        ))
+
+    def create_import(self, options):
+        if not options['company_id'] or not options['path']:
+            raise CommandError("company_id and path are required unless --resume is given.")
+        try:
+            company = MaintenanceCompanyProfile.objects.get(id=options['company_id'])
+        except (MaintenanceCompanyProfile.DoesNotExist, ValidationError):
+            raise CommandError(f"Maintenance company {options['company_id']} not found.")
+
+        path = options['path']
+        format = options['format'] or FleetImportService.detect_format(path)
+        try:
+            with open(path, 'rb') as source:
+                return FleetImport.objects.create(
+                    maintenance_company=company,
+                    source=File(source, name=os.path.basename(path)),
+                    format=format,
+                )
+        except OSError as e:
+            raise CommandError(f"Cannot read {path}: {str(e)}")
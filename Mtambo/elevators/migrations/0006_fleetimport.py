@@ -0,0 +1,41 @@
+# Generated by Django 5.1.4 on 2026-10-17 05:07
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elevators', '0005_elevatorissuelog'),
+        ('maintenance_companies', '0004_alter_maintenancecompanyprofile_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FleetImport',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('source', models.FileField(upload_to='fleet_imports/')),
+                ('format', models.CharField(choices=[('csv', 'CSV'), ('ndjson', 'NDJSON')], max_length=10)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('rows_processed', models.PositiveIntegerField(default=0)),
+                ('buildings_created', models.PositiveIntegerField(default=0)),
+                ('elevators_created', models.PositiveIntegerField(default=0)),
+                ('schedules_created', models.PositiveIntegerField(default=0)),
+                ('error_count', models.PositiveIntegerField(default=0)),
+                ('errors', models.JSONField(blank=True, default=list)),
+                ('failure_reason', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('maintenance_company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fleet_imports', to='maintenance_companies.maintenancecompanyprofile')),
+            ],
+            options={
+                'verbose_name': 'Fleet Import',
+                'verbose_name_plural': 'Fleet Imports',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
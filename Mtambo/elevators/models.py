@@ -93,3 +93,48 @@ class ElevatorIssueLog(models.Model):
         verbose_name = "Elevator Issue Log"
         verbose_name_plural = "Elevator Issue Logs"
         ordering = ['-reported_date']
+
+class FleetImport(models.Model):
+    """
+    A CSV or NDJSON file of buildings and elevators being onboarded for a maintenance
+    company. rows_processed is advanced in the same transaction as each imported chunk,
+    so an interrupted import resumes after the last committed row.
+    """
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('ndjson', 'NDJSON'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    maintenance_company = models.ForeignKey(
+        MaintenanceCompanyProfile,
+        on_delete=models.CASCADE,
+        related_name="fleet_imports"
+    )
+    source = models.FileField(upload_to='fleet_imports/')
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    rows_processed = models.PositiveIntegerField(default=0)
+    buildings_created = models.PositiveIntegerField(default=0)
+    elevators_created = models.PositiveIntegerField(default=0)
+    schedules_created = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    failure_reason = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Fleet Import"
+        verbose_name_plural = "Fleet Imports"
+
+    def __str__(self):
+        return f"{self.maintenance_company} - {self.format} import ({self.status})"
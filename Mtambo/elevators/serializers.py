@@ -3,7 +3,7 @@ from rest_framework import serializers
 from .models import Elevator
 from buildings.models import Building
 from django.shortcuts import get_object_or_404
-from .models import ElevatorIssueLog
+from .models import ElevatorIssueLog, FleetImport
 from technicians.models import TechnicianProfile 
 
 class ElevatorSerializer(serializers.ModelSerializer):
@@ -197,3 +197,27 @@ class ElevatorIssueLogSerializer(serializers.ModelSerializer):
             issue_description=validated_data['issue_description']
         )
         return issue_log
+
+
+class FleetImportSerializer(serializers.ModelSerializer):
+    """Progress and per-row errors of a fleet import."""
+
+    class Meta:
+        model = FleetImport
+        fields = [
+            'id',
+            'maintenance_company',
+            'format',
+            'status',
+            'rows_processed',
+            'buildings_created',
+            'elevators_created',
+            'schedules_created',
+            'error_count',
+            'errors',
+            'failure_reason',
+            'created_at',
+            'updated_at',
+            'completed_at',
+        ]
+        read_only_fields = fields
@@ -0,0 +1,130 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from api.export import EXPORT_FORMATS, export_response
+from elevators.services.registration_service import ElevatorRegistrationService
+
+
+class FleetExportService:
+    """
+    Streams elevators and maintenance schedules as CSV or NDJSON. Rows are read with a
+    values() projection through a server-side iterator, so an export of any size holds
+    only one chunk of EXPORT_CHUNK_SIZE rows in memory at a time.
+
+    Elevator exports use the fleet import columns, so an export can be imported again.
+    """
+    # Output column -> lookup on Elevator
+    ELEVATOR_COLUMNS = {
+        'id': 'id',
+        'developer_id': 'developer_id',
+        'building_id': 'building_id',
+        'building_name': 'building__name',
+        'building_address': 'building__address',
+        'building_contact': 'building__contact',
+        'user_name': 'user_name',
+        'machine_number': 'machine_number',
+        'capacity': 'capacity',
+        'manufacturer': 'manufacturer',
+        'installation_date': 'installation_date',
+        'controller_type': 'controller_type',
+        'machine_type': 'machine_type',
+        'technician_id': 'technician_id',
+    }
+
+    # Output column -> lookup on UnifiedSchedule
+    SCHEDULE_COLUMNS = {
+        'schedule_id': 'schedule_id',
+        'schedule_type': 'schedule_type',
+        'scheduled_date': 'scheduled_date',
+        'status': 'effective_status',
+        'elevator_id': 'elevator_id',
+        'machine_number': 'elevator__machine_number',
+        'building_id': 'building_id',
+        'building_name': 'building__name',
+        'developer_id': 'developer_id',
+        'maintenance_company_id': 'maintenance_company_id',
+        'technician_id': 'technician_id',
+    }
+
+    @staticmethod
+    def parse_filters(params):
+        """
+        Read file_format, building_id, start_date and end_date from query parameters.
+        Raises ValidationError listing every invalid parameter.
+        """
+        errors = {}
+        file_format = params.get('file_format') or 'csv'
+        if file_format not in EXPORT_FORMATS:
+            errors['file_format'] = [f"Format must be one of: {', '.join(EXPORT_FORMATS)}."]
+
+        building_id = params.get('building_id')
+        if building_id:
+            building_id = ElevatorRegistrationService.parse_id(building_id)
+            if building_id is None:
+                errors['building_id'] = ["Invalid UUID format."]
+
+        dates = {}
+        for name in ('start_date', 'end_date'):
+            value = params.get(name)
+            if value:
+                try:
+                    dates[name] = datetime.strptime(value, "%Y-%m-%d").date()
+                except ValueError:
+                    errors[name] = ["Invalid date format. Use YYYY-MM-DD."]
+        if not errors and dates.get('start_date') and dates.get('end_date') and dates['start_date'] > dates['end_date']:
+            errors['end_date'] = ["End date must not be before start date."]
+
+        if errors:
+            raise ValidationError(errors)
+        return file_format, building_id, dates.get('start_date'), dates.get('end_date')
+
+    @staticmethod
+    def project(queryset, columns):
+        """Iterate over a values() projection of queryset onto the lookups of columns."""
+        return queryset.values(*columns.values()).iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+
+    @classmethod
+    def export_elevators(cls, queryset, params, filename):
+        """
+        Stream the elevators of queryset, optionally limited to one building and to an
+        installation date range.
+        """
+        file_format, building_id, start_date, end_date = cls.parse_filters(params)
+        if building_id:
+            queryset = queryset.filter(building_id=building_id)
+        if start_date:
+            queryset = queryset.filter(installation_date__gte=start_date)
+        if end_date:
+            queryset = queryset.filter(installation_date__lte=end_date)
+
+        rows = cls.project(queryset.order_by('machine_number'), cls.ELEVATOR_COLUMNS)
+        return export_response(rows, cls.ELEVATOR_COLUMNS, file_format, filename)
+
+    @classmethod
+    def export_schedules(cls, queryset, params, filename):
+        """
+        Stream the UnifiedSchedule rows of queryset, newest first, optionally limited to
+        one building and to a scheduled date range. Status is reported as 'overdue' for
+        scheduled rows dated before today, the overdue sweep's day cutoff, as on the
+        schedule listings; a row scheduled earlier today still exports as 'scheduled'.
+        """
+        from jobs.services.overdue_service import OverdueSweepService
+
+        file_format, building_id, start_date, end_date = cls.parse_filters(params)
+        if building_id:
+            queryset = queryset.filter(building_id=building_id)
+        if start_date:
+            queryset = queryset.filter(
+                scheduled_date__gte=timezone.make_aware(datetime.combine(start_date, time.min))
+            )
+        if end_date:
+            queryset = queryset.filter(
+                scheduled_date__lt=timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min))
+            )
+
+        queryset = OverdueSweepService.annotate_effective_status(queryset.order_by('-scheduled_date', 'id'))
+        rows = cls.project(queryset, cls.SCHEDULE_COLUMNS)
+        return export_response(rows, cls.SCHEDULE_COLUMNS, file_format, filename)
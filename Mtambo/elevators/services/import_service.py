@@ -0,0 +1,345 @@
+from datetime import datetime, time
+import csv
+import io
+import itertools
+import json
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from buildings.models import Building
+from developers.models import DeveloperProfile
+from elevators.models import Elevator, FleetImport
+from elevators.services.registration_service import ElevatorRegistrationService
+
+logger = logging.getLogger(__name__)
+
+
+class FleetImportService:
+    """
+    Imports a maintenance company's fleet from a CSV or NDJSON file. The file is read one
+    row at a time and handled in chunks of FLEET_IMPORT_CHUNK_SIZE rows: each chunk is
+    validated with a fixed number of lookups, then its new buildings, elevators and first
+    maintenance schedules are written with one bulk insert each. Invalid rows are skipped
+    and reported by row number without stopping the import.
+
+    Every row describes one elevator and the building it belongs to. Buildings are
+    matched on developer and name and created on first use.
+    """
+    COLUMNS = [
+        'developer_id', 'building_name', 'building_address', 'building_contact',
+        'user_name', 'machine_number', 'capacity', 'manufacturer', 'installation_date',
+        'controller_type', 'machine_type', 'technician_id',
+        'first_maintenance_date', 'maintenance_interval',
+    ]
+    REQUIRED_COLUMNS = ['developer_id', 'building_name'] + ElevatorRegistrationService.REQUIRED_FIELDS
+    MACHINE_TYPES = [choice for choice, _ in Elevator._meta.get_field('machine_type').choices]
+    MAINTENANCE_INTERVALS = ['1_month', '3_months', '6_months', 'set_date']
+    DEFAULT_MAINTENANCE_INTERVAL = '1_month'
+
+    @classmethod
+    def create_import(cls, company, source, format=None):
+        """
+        Store an uploaded file and queue its import once the current transaction commits.
+        The format is taken from the file extension when not given.
+        """
+        format = format or cls.detect_format(source.name)
+        fleet_import = FleetImport.objects.create(
+            maintenance_company=company,
+            source=source,
+            format=format,
+        )
+        transaction.on_commit(lambda: cls.dispatch(fleet_import.id))
+        return fleet_import
+
+    @staticmethod
+    def detect_format(filename):
+        """'ndjson' for .ndjson and .jsonl files, 'csv' for anything else."""
+        if filename and filename.lower().endswith(('.ndjson', '.jsonl')):
+            return 'ndjson'
+        return 'csv'
+
+    @staticmethod
+    def dispatch(import_id):
+        """
+        Hand an import to the Celery worker. If the broker cannot be reached the import
+        stays pending and can be started with the import_fleet management command.
+        """
+        from elevators.tasks import import_fleet
+
+        try:
+            import_fleet.delay(str(import_id))
+        except Exception as e:
+            logger.warning(f"Could not queue fleet import {import_id}: {str(e)}")
+
+    @classmethod
+    def parse_rows(cls, stream, format):
+        """
+        Yield (row_number, data, error) for each record of a binary stream, reading it
+        incrementally. Row numbers start at 1 for the first record after any CSV header.
+        error is set, and data empty, when a record cannot be parsed.
+        """
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+        if format == 'ndjson':
+            row_number = 0
+            for line in text:
+                if not line.strip():
+                    continue
+                row_number += 1
+                try:
+                    data = json.loads(line)
+                except ValueError as e:
+                    yield row_number, {}, f"Invalid JSON: {str(e)}"
+                    continue
+                if not isinstance(data, dict):
+                    yield row_number, {}, "Each line must be a JSON object."
+                    continue
+                yield row_number, cls.clean(data), None
+        else:
+            reader = csv.DictReader(text)
+            missing = [column for column in cls.REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+            if missing:
+                raise ValueError(f"Missing required column(s): {', '.join(missing)}.")
+            for row_number, data in enumerate(reader, start=1):
+                if None in data:
+                    yield row_number, {}, "Row has more values than the header."
+                    continue
+                yield row_number, cls.clean(data), None
+
+    @classmethod
+    def clean(cls, data):
+        """Keep the known columns as text, with surrounding whitespace stripped."""
+        return {
+            column: value if value is None else str(value).strip()
+            for column, value in data.items()
+            if column in cls.COLUMNS
+        }
+
+    @staticmethod
+    def parse_date(value):
+        """The date in a YYYY-MM-DD string, or None when it is empty or malformed."""
+        try:
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        except (TypeError, ValueError):
+            return None
+
+    @classmethod
+    def validate_chunk(cls, rows, company):
+        """
+        Validate a chunk of parsed rows. Machine numbers must be unused, and elevator
+        user names unused within their building, both in the database and among the
+        chunk's rows. Returns (valid, errors, developers, buildings, technicians): valid
+        lists the (row_number, data) pairs to import, errors maps row numbers to field
+        errors, and the rest map the ids and (developer_id, building_name) keys referenced
+        by the valid rows to existing records.
+        """
+        errors, technicians = ElevatorRegistrationService.validate([data for _, data in rows], company)
+        errors = {rows[index][0]: row_errors for index, row_errors in errors.items()}
+
+        def add_error(row_number, field, message):
+            errors.setdefault(row_number, {}).setdefault(field, []).append(message)
+
+        developer_ids = {
+            ElevatorRegistrationService.parse_id(data.get('developer_id')) for _, data in rows
+        } - {None}
+        developers = DeveloperProfile.objects.in_bulk(developer_ids) if developer_ids else {}
+
+        building_names = {data.get('building_name') for _, data in rows if data.get('building_name')}
+        buildings = {}
+        if developers and building_names:
+            for building in Building.objects.filter(
+                developer_id__in=developers, name__in=building_names
+            ).order_by('name', 'id'):
+                buildings.setdefault((building.developer_id, building.name), building)
+
+        used_names = set(
+            Elevator.objects.filter(building__in=buildings.values()).values_list('building_id', 'user_name')
+        ) if buildings else set()
+        seen_names = set()
+
+        valid = []
+        for row_number, data in rows:
+            for field in ('developer_id', 'building_name'):
+                if not data.get(field):
+                    add_error(row_number, field, "This field is required.")
+
+            developer_id = ElevatorRegistrationService.parse_id(data.get('developer_id'))
+            if data.get('developer_id') and developer_id not in developers:
+                add_error(row_number, 'developer_id', "Developer not found or invalid UUID format.")
+
+            key = (developer_id, data.get('building_name'))
+            building = buildings.get(key)
+            if building is None:
+                for field in ('building_address', 'building_contact'):
+                    if not data.get(field):
+                        add_error(row_number, field, "This field is required for a new building.")
+
+            user_name = data.get('user_name')
+            if user_name:
+                if building is not None and (building.id, user_name) in used_names:
+                    add_error(row_number, 'user_name', f"A user name '{user_name}' already exists in this building.")
+                elif (key, user_name) in seen_names:
+                    add_error(row_number, 'user_name', f"User name '{user_name}' is repeated for this building in the import.")
+                seen_names.add((key, user_name))
+
+            capacity = data.get('capacity')
+            if capacity not in (None, ''):
+                try:
+                    if int(capacity) <= 0:
+                        raise ValueError
+                except (TypeError, ValueError):
+                    add_error(row_number, 'capacity', "Capacity must be a positive whole number.")
+
+            if (data.get('installation_date') and cls.parse_date(data['installation_date']) is None
+                    and 'installation_date' not in errors.get(row_number, {})):
+                add_error(row_number, 'installation_date', "Invalid date format. Use YYYY-MM-DD.")
+
+            if data.get('machine_type') and data['machine_type'] not in cls.MACHINE_TYPES:
+                add_error(row_number, 'machine_type', f"Machine type must be one of: {', '.join(cls.MACHINE_TYPES)}.")
+
+            if data.get('technician_id') and ElevatorRegistrationService.parse_id(data['technician_id']) not in technicians:
+                add_error(row_number, 'technician_id', "Technician not found for this company.")
+
+            if data.get('first_maintenance_date'):
+                first_date = cls.parse_date(data['first_maintenance_date'])
+                if first_date is None:
+                    add_error(row_number, 'first_maintenance_date', "Invalid date format. Use YYYY-MM-DD.")
+                elif first_date < timezone.localdate():
+                    add_error(row_number, 'first_maintenance_date', "The first maintenance date cannot be in the past.")
+            if data.get('maintenance_interval') and data['maintenance_interval'] not in cls.MAINTENANCE_INTERVALS:
+                add_error(
+                    row_number, 'maintenance_interval',
+                    f"Maintenance interval must be one of: {', '.join(cls.MAINTENANCE_INTERVALS)}."
+                )
+
+            if row_number not in errors:
+                valid.append((row_number, data))
+
+        return valid, errors, developers, buildings, technicians
+
+    @classmethod
+    def insert_chunk(cls, valid, company, developers, buildings, technicians):
+        """
+        Create the buildings, elevators and first maintenance schedules of a validated
+        chunk with one bulk insert each. Returns the number of each created.
+        """
+        from jobs.models import MaintenanceSchedule
+        from jobs.services.unified_schedule_service import UnifiedScheduleService
+
+        new_buildings = {}
+        for _, data in valid:
+            key = (ElevatorRegistrationService.parse_id(data['developer_id']), data['building_name'])
+            if key not in buildings and key not in new_buildings:
+                developer = developers[key[0]]
+                new_buildings[key] = Building(
+                    name=data['building_name'],
+                    address=data['building_address'],
+                    contact=data['building_contact'],
+                    developer=developer,
+                    developer_name=developer.developer_name,
+                )
+        Building.objects.bulk_create(new_buildings.values())
+        buildings = {**buildings, **new_buildings}
+
+        elevators = []
+        for _, data in valid:
+            developer_id = ElevatorRegistrationService.parse_id(data['developer_id'])
+            elevators.append(Elevator(
+                user_name=data['user_name'],
+                controller_type=data.get('controller_type') or '',
+                machine_type=data.get('machine_type') or 'gearless',
+                machine_number=data['machine_number'],
+                capacity=int(data['capacity']),
+                manufacturer=data['manufacturer'],
+                installation_date=cls.parse_date(data['installation_date']),
+                building=buildings[(developer_id, data['building_name'])],
+                maintenance_company=company,
+                developer=developers[developer_id],
+                technician=technicians.get(ElevatorRegistrationService.parse_id(data.get('technician_id'))),
+            ))
+        Elevator.objects.bulk_create(elevators)
+
+        schedules = [
+            MaintenanceSchedule(
+                elevator=elevator,
+                technician=elevator.technician,
+                maintenance_company=company,
+                scheduled_date=timezone.make_aware(
+                    datetime.combine(cls.parse_date(data['first_maintenance_date']), time.min)
+                ),
+                next_schedule=data.get('maintenance_interval') or cls.DEFAULT_MAINTENANCE_INTERVAL,
+                description=f"Routine maintenance for elevator {elevator.machine_number}",
+                status='scheduled',
+            )
+            for (_, data), elevator in zip(valid, elevators)
+            if data.get('first_maintenance_date')
+        ]
+        MaintenanceSchedule.objects.bulk_create(schedules)
+        UnifiedScheduleService.sync(schedules)
+
+        return len(new_buildings), len(elevators), len(schedules)
+
+    @classmethod
+    def run(cls, fleet_import, chunk_size=None):
+        """
+        Import the file of a FleetImport, skipping the rows already processed by an
+        earlier, interrupted run. Each chunk and the import's progress counters are
+        committed together. A file that cannot be read marks the import as failed.
+        """
+        if fleet_import.status in ('completed', 'failed'):
+            return fleet_import
+
+        chunk_size = chunk_size or settings.FLEET_IMPORT_CHUNK_SIZE
+        fleet_import.status = 'running'
+        fleet_import.save(update_fields=['status', 'updated_at'])
+
+        try:
+            with fleet_import.source.open('rb') as stream:
+                rows = cls.parse_rows(stream, fleet_import.format)
+                rows = itertools.dropwhile(lambda row: row[0] <= fleet_import.rows_processed, rows)
+                while True:
+                    chunk = list(itertools.islice(rows, chunk_size))
+                    if not chunk:
+                        break
+                    cls.process_chunk(fleet_import, chunk)
+        except (OSError, ValueError, csv.Error) as e:
+            logger.error(f"Fleet import {fleet_import.id} failed: {str(e)}")
+            fleet_import.status = 'failed'
+            fleet_import.failure_reason = str(e)
+            fleet_import.save(update_fields=['status', 'failure_reason', 'updated_at'])
+            return fleet_import
+
+        fleet_import.status = 'completed'
+        fleet_import.completed_at = timezone.now()
+        fleet_import.save(update_fields=['status', 'completed_at', 'updated_at'])
+        return fleet_import
+
+    @classmethod
+    @transaction.atomic
+    def process_chunk(cls, fleet_import, chunk):
+        """Validate and import one chunk of parsed rows and record the progress."""
+        errors = {row_number: {'non_field_errors': [error]} for row_number, _, error in chunk if error}
+        rows = [(row_number, data) for row_number, data, error in chunk if not error]
+
+        valid, row_errors, developers, buildings, technicians = cls.validate_chunk(rows, fleet_import.maintenance_company)
+        errors.update(row_errors)
+        if valid:
+            buildings_created, elevators_created, schedules_created = cls.insert_chunk(
+                valid, fleet_import.maintenance_company, developers, buildings, technicians
+            )
+            fleet_import.buildings_created += buildings_created
+            fleet_import.elevators_created += elevators_created
+            fleet_import.schedules_created += schedules_created
+
+        room = settings.FLEET_IMPORT_MAX_ERRORS - len(fleet_import.errors)
+        fleet_import.errors += [
+            {'row': row_number, 'errors': errors[row_number]} for row_number in sorted(errors)
+        ][:max(room, 0)]
+        fleet_import.error_count += len(errors)
+        fleet_import.rows_processed = chunk[-1][0]
+        fleet_import.save(update_fields=[
+            'buildings_created', 'elevators_created', 'schedules_created',
+            'errors', 'error_count', 'rows_processed', 'updated_at',
+        ])
@@ -0,0 +1,108 @@
+from datetime import date, datetime
+import uuid
+
+from elevators.models import Elevator
+from technicians.models import TechnicianProfile
+
+
+class ElevatorRegistrationService:
+    """
+    Validates and creates a batch of elevators with a fixed number of queries: one
+    duplicate machine number check, one technician lookup and one bulk insert,
+    whatever the size of the batch.
+    """
+    REQUIRED_FIELDS = ['user_name', 'capacity', 'machine_number', 'manufacturer', 'installation_date']
+
+    @classmethod
+    def validate(cls, elevators_data, company):
+        """
+        Check every elevator of the batch. Returns (errors, technicians): errors maps the
+        index of each invalid elevator to its field errors, technicians maps the technician
+        ids referenced by the batch to the company's TechnicianProfile (missing when the
+        technician does not exist or belongs to another company).
+        """
+        errors = {}
+
+        def add_error(index, field, message):
+            errors.setdefault(index, {}).setdefault(field, []).append(message)
+
+        machine_numbers = [data.get("machine_number") for data in elevators_data]
+        existing = set(
+            Elevator.objects.filter(machine_number__in=[number for number in machine_numbers if number])
+            .values_list('machine_number', flat=True)
+        )
+
+        seen = set()
+        technician_ids = set()
+        for index, data in enumerate(elevators_data):
+            for field in cls.REQUIRED_FIELDS:
+                if not data.get(field):
+                    add_error(index, field, "This field is required.")
+
+            machine_number = data.get("machine_number")
+            if machine_number in existing:
+                add_error(index, "machine_number", f"Elevator with machine number {machine_number} already exists.")
+            elif machine_number and machine_number in seen:
+                add_error(index, "machine_number", f"Machine number {machine_number} is repeated in this request.")
+            seen.add(machine_number)
+
+            installation_date = data.get("installation_date")
+            if isinstance(installation_date, str):
+                try:
+                    datetime.strptime(installation_date, "%Y-%m-%d")
+                except ValueError:
+                    add_error(index, "installation_date", "Invalid date format. Use YYYY-MM-DD.")
+
+            technician_id = cls.parse_id(data.get("technician_id"))
+            if technician_id:
+                technician_ids.add(technician_id)
+
+        technicians = {
+            technician.id: technician
+            for technician in TechnicianProfile.objects.filter(
+                id__in=technician_ids, maintenance_company=company
+            ).select_related('user')
+        } if technician_ids else {}
+        return errors, technicians
+
+    @staticmethod
+    def parse_id(value):
+        """The UUID in value, or None when it is empty or malformed."""
+        if not value:
+            return None
+        try:
+            return uuid.UUID(str(value))
+        except ValueError:
+            return None
+
+    @classmethod
+    def missing_technicians(cls, elevators_data, technicians):
+        """Indexes of elevators whose technician_id was not found for the company."""
+        return [
+            index for index, data in enumerate(elevators_data)
+            if data.get("technician_id") and cls.parse_id(data["technician_id"]) not in technicians
+        ]
+
+    @classmethod
+    def register(cls, elevators_data, building, company, developer, technicians):
+        """
+        Create the validated elevators of a building with a single INSERT and return
+        them in request order.
+        """
+        elevators = []
+        for data in elevators_data:
+            installation_date = data["installation_date"]
+            if not isinstance(installation_date, date):
+                installation_date = datetime.strptime(installation_date, "%Y-%m-%d").date()
+            elevators.append(Elevator(
+                user_name=data["user_name"],
+                capacity=data["capacity"],
+                machine_number=data["machine_number"],
+                manufacturer=data["manufacturer"],
+                installation_date=installation_date,
+                building=building,
+                maintenance_company=company,
+                technician=technicians.get(cls.parse_id(data.get("technician_id"))),
+                developer=developer,
+            ))
+        return Elevator.objects.bulk_create(elevators)
@@ -0,0 +1,28 @@
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def import_fleet(import_id):
+    """
+    Run a queued fleet import. Tasks are acknowledged late, so an import interrupted by
+    a lost worker is delivered again and resumes after its last committed chunk.
+    Returns the import's final status.
+    """
+    from elevators.models import FleetImport
+    from elevators.services.import_service import FleetImportService
+
+    try:
+        fleet_import = FleetImport.objects.get(id=import_id)
+    except FleetImport.DoesNotExist:
+        logger.warning(f"Fleet import {import_id} no longer exists.")
+        return None
+
+    fleet_import = FleetImportService.run(fleet_import)
+    logger.info(
+        f"Fleet import {import_id} {fleet_import.status}: {fleet_import.rows_processed} rows, "
+        f"{fleet_import.elevators_created} elevators created, {fleet_import.error_count} rows rejected."
+    )
+    return fleet_import.status
@@ -0,0 +1,145 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from jobs.factories import (
+    BuildingFactory,
+    DeveloperProfileFactory,
+    ElevatorFactory,
+    MaintenanceCompanyProfileFactory,
+    MaintenanceScheduleFactory,
+)
+
+
+def aware(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+class FleetExportTest(APITestCase):
+    def setUp(self):
+        self.company = MaintenanceCompanyProfileFactory()
+        self.developer = DeveloperProfileFactory()
+        self.tower = BuildingFactory(developer=self.developer, name="Tower")
+        self.annex = BuildingFactory(developer=self.developer, name="Annex")
+        self.client.force_authenticate(self.company.user)
+        ContentType.objects.get_for_models(type(self.company))
+
+    def elevator(self, building, number, **kwargs):
+        return ElevatorFactory(
+            building=building,
+            developer=self.developer,
+            maintenance_company=self.company,
+            machine_number=f"EXP-{number:03d}",
+            **kwargs,
+        )
+
+    def schedule(self, elevator, scheduled_date, status='scheduled'):
+        return MaintenanceScheduleFactory(
+            elevator=elevator,
+            maintenance_company=self.company,
+            technician=None,
+            scheduled_date=scheduled_date,
+            next_schedule='set_date',
+            status=status,
+        )
+
+    def read_csv(self, response):
+        content = b"".join(response.streaming_content).decode()
+        return list(csv.DictReader(io.StringIO(content)))
+
+    def test_company_elevators_csv_export(self):
+        self.elevator(self.tower, 2)
+        self.elevator(self.tower, 1)
+        self.elevator(self.annex, 3)
+        ElevatorFactory(machine_number="OTHER-1")
+
+        response = self.client.get(reverse(
+            "maintenance_companies:elevators-under-company-export", kwargs={"company_id": self.company.id}
+        ))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn("attachment;", response["Content-Disposition"])
+        rows = self.read_csv(response)
+        self.assertEqual([row["machine_number"] for row in rows], ["EXP-001", "EXP-002", "EXP-003"])
+        self.assertEqual(rows[0]["building_name"], "Tower")
+        self.assertEqual(rows[0]["developer_id"], str(self.developer.id))
+
+    def test_developer_elevators_ndjson_export_filtered_by_building(self):
+        self.elevator(self.tower, 1)
+        self.elevator(self.annex, 2)
+
+        response = self.client.get(
+            reverse("developer-elevators-export", kwargs={"developer_id": self.developer.id}),
+            {"file_format": "ndjson", "building_id": str(self.annex.id)},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)["machine_number"] for line in lines], ["EXP-002"])
+
+    @freeze_time("2024-03-15 12:00:00")
+    def test_schedule_export_filters_by_date_range_and_reports_overdue(self):
+        elevator = self.elevator(self.tower, 1)
+        with freeze_time("2024-01-01"):
+            passed = self.schedule(elevator, aware(2024, 3, 1, 9))
+        self.schedule(elevator, aware(2024, 3, 20, 9))
+        self.schedule(elevator, aware(2024, 4, 2, 9))
+
+        response = self.client.get(
+            reverse("maintenance-company-schedules-export", kwargs={"company_id": self.company.id}),
+            {"start_date": "2024-03-01", "end_date": "2024-03-31"},
+        )
+
+        rows = self.read_csv(response)
+        self.assertEqual([row["scheduled_date"][:10] for row in rows], ["2024-03-20", "2024-03-01"])
+        self.assertEqual(rows[1]["schedule_id"], str(passed.id))
+        self.assertEqual(rows[1]["status"], "overdue")
+        self.assertEqual(rows[1]["machine_number"], "EXP-001")
+
+    def test_developer_schedule_export(self):
+        self.schedule(self.elevator(self.tower, 1), timezone.now() + timezone.timedelta(days=3))
+
+        response = self.client.get(
+            reverse("developer-schedules-export", kwargs={"developer_id": self.developer.id}),
+            {"file_format": "ndjson"},
+        )
+
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["building_name"], "Tower")
+        self.assertEqual(rows[0]["schedule_type"], "regular")
+
+    def test_export_queries_do_not_grow_with_rows(self):
+        def export_queries(count, start):
+            elevator = self.elevator(self.tower, start)
+            for day in range(count):
+                self.schedule(elevator, aware(2030, 1, 1) + timezone.timedelta(days=day))
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(
+                    reverse("maintenance-company-schedules-export", kwargs={"company_id": self.company.id})
+                )
+                b"".join(response.streaming_content)
+            return len(queries)
+
+        self.assertEqual(export_queries(3, 1), export_queries(40, 2))
+
+    def test_invalid_parameters(self):
+        response = self.client.get(
+            reverse("maintenance-company-schedules-export", kwargs={"company_id": self.company.id}),
+            {"file_format": "xml", "start_date": "2024-13-01", "building_id": "nope"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data), {"file_format", "start_date", "building_id"})
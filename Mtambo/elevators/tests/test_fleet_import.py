@@ -0,0 +1,229 @@
+import csv
+import io
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from buildings.models import Building
+from elevators.models import Elevator, FleetImport
+from elevators.services.import_service import FleetImportService
+from jobs.factories import (
+    BuildingFactory,
+    DeveloperProfileFactory,
+    ElevatorFactory,
+    MaintenanceCompanyProfileFactory,
+    TechnicianProfileFactory,
+)
+from jobs.models import MaintenanceSchedule, UnifiedSchedule
+
+
+class FleetImportTestMixin:
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.company = MaintenanceCompanyProfileFactory()
+        self.developer = DeveloperProfileFactory()
+        self.technician = TechnicianProfileFactory(maintenance_company=self.company)
+        self.first_maintenance = (timezone.localdate() + timedelta(days=7)).isoformat()
+
+    def row(self, n, **overrides):
+        return {
+            "developer_id": str(self.developer.id),
+            "building_name": "Tower",
+            "building_address": "1 Main St",
+            "building_contact": "0700000000",
+            "user_name": f"Lift {n}",
+            "machine_number": f"FLEET-{n:04d}",
+            "capacity": "1000",
+            "manufacturer": "Otis",
+            "installation_date": "2024-01-01",
+            "technician_id": str(self.technician.id),
+            "first_maintenance_date": self.first_maintenance,
+            "maintenance_interval": "3_months",
+            **overrides,
+        }
+
+    def to_csv(self, rows):
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=list(self.row(0)))
+        writer.writeheader()
+        writer.writerows(rows)
+        return output.getvalue().encode()
+
+    def create_import(self, content, format='csv'):
+        return FleetImport.objects.create(
+            maintenance_company=self.company,
+            source=ContentFile(content, name=f"fleet.{format}"),
+            format=format,
+        )
+
+
+class FleetImportServiceTest(FleetImportTestMixin, TestCase):
+    def test_imports_buildings_elevators_and_first_schedules(self):
+        existing = BuildingFactory(developer=self.developer, name="Annex")
+        rows = [self.row(n) for n in range(3)] + [self.row(3, building_name="Annex", building_address="", building_contact="")]
+
+        fleet_import = FleetImportService.run(self.create_import(self.to_csv(rows)), chunk_size=2)
+
+        self.assertEqual(fleet_import.status, 'completed')
+        self.assertEqual(fleet_import.rows_processed, 4)
+        self.assertEqual(fleet_import.buildings_created, 1)
+        self.assertEqual(fleet_import.elevators_created, 4)
+        self.assertEqual(fleet_import.schedules_created, 4)
+        self.assertEqual(fleet_import.errors, [])
+
+        tower = Building.objects.get(name="Tower", developer=self.developer)
+        self.assertEqual(tower.elevators.count(), 3)
+        self.assertEqual(existing.elevators.get().machine_number, "FLEET-0003")
+        elevator = Elevator.objects.get(machine_number="FLEET-0000")
+        self.assertEqual(elevator.maintenance_company, self.company)
+        self.assertEqual(elevator.technician, self.technician)
+        schedule = MaintenanceSchedule.objects.get(elevator=elevator)
+        self.assertEqual(schedule.next_schedule, '3_months')
+        self.assertEqual(schedule.status, 'scheduled')
+        self.assertTrue(UnifiedSchedule.objects.filter(schedule_id=schedule.id, building=tower).exists())
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        building = BuildingFactory(developer=self.developer, name="Tower")
+        ElevatorFactory(building=building, user_name="Lift 9", machine_number="TAKEN-1")
+        rows = [
+            self.row(0),
+            self.row(1, machine_number="TAKEN-1"),
+            self.row(2, user_name="Lift 9"),
+            self.row(3, user_name="Lift 0"),
+            self.row(4, capacity="heavy"),
+            self.row(5, developer_id="not-a-uuid"),
+            self.row(6, first_maintenance_date="2000-01-01"),
+        ]
+
+        fleet_import = FleetImportService.run(self.create_import(self.to_csv(rows)))
+
+        self.assertEqual(fleet_import.elevators_created, 1)
+        self.assertEqual(fleet_import.error_count, 6)
+        errors = {error['row']: error['errors'] for error in fleet_import.errors}
+        self.assertEqual(sorted(errors), [2, 3, 4, 5, 6, 7])
+        self.assertIn('machine_number', errors[2])
+        self.assertIn('user_name', errors[3])
+        self.assertIn('user_name', errors[4])
+        self.assertIn('capacity', errors[5])
+        self.assertIn('developer_id', errors[6])
+        self.assertIn('first_maintenance_date', errors[7])
+
+    def test_ndjson_rows_with_parse_errors(self):
+        content = "\n".join([
+            json.dumps({**self.row(0), "capacity": 800}),
+            "{not json",
+            "",
+            json.dumps(["a list"]),
+        ]).encode()
+
+        fleet_import = FleetImportService.run(self.create_import(content, format='ndjson'))
+
+        self.assertEqual(fleet_import.status, 'completed')
+        self.assertEqual(Elevator.objects.get(machine_number="FLEET-0000").capacity, 800)
+        self.assertEqual([error['row'] for error in fleet_import.errors], [2, 3])
+
+    def test_missing_columns_fail_the_import(self):
+        fleet_import = FleetImportService.run(self.create_import(b"building_name,user_name\nTower,Lift 1\n"))
+
+        self.assertEqual(fleet_import.status, 'failed')
+        self.assertIn('machine_number', fleet_import.failure_reason)
+        self.assertFalse(Elevator.objects.exists())
+
+    def test_interrupted_import_resumes_after_last_committed_chunk(self):
+        fleet_import = self.create_import(self.to_csv([self.row(n) for n in range(5)]))
+        process_chunk = FleetImportService.process_chunk.__func__
+        calls = []
+
+        def fail_on_second_chunk(cls, fleet_import, chunk):
+            calls.append(chunk)
+            if len(calls) == 2:
+                raise RuntimeError("worker lost")
+            return process_chunk(cls, fleet_import, chunk)
+
+        with patch.object(FleetImportService, 'process_chunk', classmethod(fail_on_second_chunk)):
+            with self.assertRaises(RuntimeError):
+                FleetImportService.run(fleet_import, chunk_size=2)
+
+        fleet_import.refresh_from_db()
+        self.assertEqual(fleet_import.status, 'running')
+        self.assertEqual(fleet_import.rows_processed, 2)
+        self.assertEqual(Elevator.objects.count(), 2)
+
+        fleet_import = FleetImportService.run(fleet_import, chunk_size=2)
+
+        self.assertEqual(fleet_import.status, 'completed')
+        self.assertEqual(fleet_import.elevators_created, 5)
+        self.assertEqual(fleet_import.buildings_created, 1)
+        self.assertEqual(Elevator.objects.count(), 5)
+        self.assertEqual(Building.objects.filter(name="Tower").count(), 1)
+
+    def test_queries_per_chunk_do_not_grow_with_rows(self):
+        def chunk_queries(rows):
+            fleet_import = self.create_import(b"")
+            chunk = [(n, data, None) for n, data in enumerate(rows, start=1)]
+            with CaptureQueriesContext(connection) as queries:
+                FleetImportService.process_chunk(fleet_import, chunk)
+            return len(queries)
+
+        small = chunk_queries([self.row(n) for n in range(3)])
+        large = chunk_queries([self.row(n, building_name="Plaza") for n in range(100, 160)])
+        self.assertEqual(small, large)
+
+
+class FleetImportApiTest(FleetImportTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.company.user)
+        self.url = reverse("maintenance_companies:fleet-import", kwargs={"company_uuid": self.company.id})
+
+    @patch("elevators.tasks.import_fleet.delay")
+    def test_upload_queues_the_import_after_commit(self, delay):
+        upload = SimpleUploadedFile("fleet.ndjson", json.dumps(self.row(0)).encode())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, {"file": upload}, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], "pending")
+        self.assertEqual(response.data["format"], "ndjson")
+        delay.assert_called_once_with(response.data["id"])
+
+        detail = self.client.get(reverse(
+            "maintenance_companies:fleet-import-detail",
+            kwargs={"company_uuid": self.company.id, "import_uuid": response.data["id"]},
+        ))
+        self.assertEqual(detail.status_code, status.HTTP_200_OK)
+        self.assertEqual(detail.data["rows_processed"], 0)
+
+    def test_upload_requires_a_file(self):
+        response = self.client.post(self.url, {}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_management_command_runs_the_import(self):
+        path = f"{self.media_root}/fleet.csv"
+        with open(path, "wb") as source:
+            source.write(self.to_csv([self.row(0), self.row(1)]))
+
+        call_command("import_fleet", str(self.company.id), path, stdout=io.StringIO(), stderr=io.StringIO())
+
+        fleet_import = FleetImport.objects.get()
+        self.assertEqual(fleet_import.status, 'completed')
+        self.assertEqual(fleet_import.elevators_created, 2)
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:06
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('buildings', '0004_remove_building_maintenance_company'),
+        ('elevators', '0005_elevatorissuelog'),
+        ('jobs', '0005_remove_maintenanceschedule_next_schedule_created'),
+        ('maintenance_companies', '0004_alter_maintenancecompanyprofile_user'),
+        ('technicians', '0002_remove_technicianprofile_technician_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleSweepWatermark',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('processed_until', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Schedule Sweep Watermark',
+                'verbose_name_plural': 'Schedule Sweep Watermarks',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='adhocmaintenanceschedule',
+            index=models.Index(fields=['status', 'scheduled_date'], name='jobs_adhocm_status_355098_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='buildingleveladhocschedule',
+            index=models.Index(fields=['status', 'scheduled_date'], name='jobs_buildi_status_1d129f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenanceschedule',
+            index=models.Index(fields=['status', 'scheduled_date'], name='jobs_mainte_status_b17bcb_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elevators', '0005_elevatorissuelog'),
+        ('jobs', '0006_schedule_sweep_watermark'),
+        ('maintenance_companies', '0004_alter_maintenancecompanyprofile_user'),
+        ('technicians', '0002_remove_technicianprofile_technician_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='maintenanceschedule',
+            index=models.Index(fields=['technician', 'scheduled_date'], name='jobs_mainte_technic_1c781a_idx'),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:21
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+def backfill_unified_schedules(apps, schema_editor):
+    UnifiedSchedule = apps.get_model('jobs', 'UnifiedSchedule')
+    sources = [
+        ('regular', apps.get_model('jobs', 'MaintenanceSchedule'), 'elevator'),
+        ('adhoc', apps.get_model('jobs', 'AdHocMaintenanceSchedule'), 'elevator'),
+        ('building_adhoc', apps.get_model('jobs', 'BuildingLevelAdhocSchedule'), None),
+    ]
+
+    for schedule_type, model, elevator_field in sources:
+        if elevator_field:
+            fields = ['id', 'elevator_id', 'elevator__building_id', 'elevator__building__developer_id']
+        else:
+            fields = ['id', 'building_id', 'building__developer_id']
+        fields += ['maintenance_company_id', 'technician_id', 'scheduled_date', 'status']
+
+        rows = []
+        for values in model.objects.order_by().values(*fields).iterator(chunk_size=1000):
+            rows.append(UnifiedSchedule(
+                schedule_type=schedule_type,
+                schedule_id=values['id'],
+                elevator_id=values.get('elevator_id'),
+                building_id=values.get('elevator__building_id', values.get('building_id')),
+                developer_id=values.get(
+                    'elevator__building__developer_id', values.get('building__developer_id')
+                ),
+                maintenance_company_id=values['maintenance_company_id'],
+                technician_id=values['technician_id'],
+                scheduled_date=values['scheduled_date'],
+                status=values['status'],
+            ))
+        UnifiedSchedule.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('buildings', '0004_remove_building_maintenance_company'),
+        ('developers', '0002_remove_developerprofile_developer_and_more'),
+        ('elevators', '0005_elevatorissuelog'),
+        ('jobs', '0007_maintenanceschedule_technician_date_index'),
+        ('maintenance_companies', '0004_alter_maintenancecompanyprofile_user'),
+        ('technicians', '0002_remove_technicianprofile_technician_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnifiedSchedule',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('schedule_type', models.CharField(choices=[('regular', 'Regular'), ('adhoc', 'Ad-Hoc'), ('building_adhoc', 'Building-Level Ad-Hoc')], max_length=20)),
+                ('schedule_id', models.UUIDField()),
+                ('scheduled_date', models.DateTimeField()),
+                ('status', models.CharField(max_length=20)),
+                ('building', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='unified_schedules', to='buildings.building')),
+                ('developer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='unified_schedules', to='developers.developerprofile')),
+                ('elevator', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='unified_schedules', to='elevators.elevator')),
+                ('maintenance_company', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='unified_schedules', to='maintenance_companies.maintenancecompanyprofile')),
+                ('technician', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='unified_schedules', to='technicians.technicianprofile')),
+            ],
+            options={
+                'verbose_name': 'Unified Schedule',
+                'verbose_name_plural': 'Unified Schedules',
+                'ordering': ['-scheduled_date'],
+                'indexes': [models.Index(fields=['status', 'scheduled_date'], name='jobs_unifie_status_0d18a9_idx'), models.Index(fields=['technician', 'scheduled_date'], name='jobs_unifie_technic_2c2b32_idx'), models.Index(fields=['maintenance_company', 'scheduled_date'], name='jobs_unifie_mainten_8e3451_idx'), models.Index(fields=['developer', 'scheduled_date'], name='jobs_unifie_develop_afd43a_idx'), models.Index(fields=['building', 'scheduled_date'], name='jobs_unifie_buildin_321754_idx'), models.Index(fields=['elevator', 'scheduled_date'], name='jobs_unifie_elevato_5f5df1_idx')],
+                'unique_together': {('schedule_type', 'schedule_id')},
+            },
+        ),
+        migrations.RunPython(backfill_unified_schedules, migrations.RunPython.noop),
+    ]
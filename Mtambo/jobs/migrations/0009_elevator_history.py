@@ -0,0 +1,98 @@
+# Generated by Django 5.1.4 on 2026-10-17 05:17
+
+import django.db.models.deletion
+import itertools
+import uuid
+from django.db import migrations, models
+
+CHECKLIST_FIELDS = [
+    'check_machine_gear', 'check_machine_brake', 'check_controller_connections',
+    'blow_dust_from_controller', 'clean_machine_room', 'clean_guide_rails', 'observe_operation',
+]
+
+
+def snippet(text, length=200):
+    text = " ".join((text or "").split())
+    return text[:length - 1] + "…" if len(text) > length else text
+
+
+def backfill_elevator_history(apps, schema_editor):
+    ScheduledMaintenanceLog = apps.get_model('jobs', 'ScheduledMaintenanceLog')
+    AdHocMaintenanceLog = apps.get_model('jobs', 'AdHocMaintenanceLog')
+    ElevatorHistoryEntry = apps.get_model('jobs', 'ElevatorHistoryEntry')
+
+    def regular_entries():
+        for log in ScheduledMaintenanceLog.objects.select_related(
+            'maintenance_schedule', 'condition_report'
+        ).iterator(chunk_size=1000):
+            yield ElevatorHistoryEntry(
+                elevator_id=log.maintenance_schedule.elevator_id,
+                schedule_type='regular',
+                schedule_id=log.maintenance_schedule_id,
+                log_id=log.id,
+                technician_id=log.technician_id,
+                scheduled_date=log.maintenance_schedule.scheduled_date,
+                completed_at=log.date_completed,
+                checklist=sum(1 << bit for bit, field in enumerate(CHECKLIST_FIELDS) if getattr(log, field)),
+                checklist_size=len(CHECKLIST_FIELDS),
+                title=snippet(log.description) or "Routine maintenance",
+                issue_snippet=snippet(log.condition_report.additional_comments),
+            )
+
+    def adhoc_entries():
+        for log in AdHocMaintenanceLog.objects.select_related(
+            'ad_hoc_schedule', 'condition_report'
+        ).iterator(chunk_size=1000):
+            yield ElevatorHistoryEntry(
+                elevator_id=log.ad_hoc_schedule.elevator_id,
+                schedule_type='adhoc',
+                schedule_id=log.ad_hoc_schedule_id,
+                log_id=log.id,
+                technician_id=log.technician_id,
+                scheduled_date=log.ad_hoc_schedule.scheduled_date,
+                completed_at=log.date_completed,
+                title=snippet(log.summary_title),
+                issue_snippet=snippet(log.condition_report.condition),
+            )
+
+    for entries in (regular_entries(), adhoc_entries()):
+        while batch := list(itertools.islice(entries, 1000)):
+            ElevatorHistoryEntry.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elevators', '0006_fleetimport'),
+        ('jobs', '0008_unified_schedule'),
+        ('technicians', '0002_remove_technicianprofile_technician_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ElevatorHistoryEntry',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('schedule_type', models.CharField(choices=[('regular', 'Regular'), ('adhoc', 'Ad-Hoc')], max_length=20)),
+                ('schedule_id', models.UUIDField()),
+                ('log_id', models.UUIDField()),
+                ('scheduled_date', models.DateTimeField()),
+                ('completed_at', models.DateTimeField()),
+                ('checklist', models.PositiveSmallIntegerField(default=0, help_text='Bit i is set when checklist item i passed.')),
+                ('checklist_size', models.PositiveSmallIntegerField(default=0)),
+                ('title', models.CharField(blank=True, max_length=255)),
+                ('issue_snippet', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('elevator', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='history_entries', to='elevators.elevator')),
+                ('technician', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='history_entries', to='technicians.technicianprofile')),
+            ],
+            options={
+                'verbose_name': 'Elevator History Entry',
+                'verbose_name_plural': 'Elevator History Entries',
+                'ordering': ['-completed_at', 'id'],
+                'indexes': [models.Index(fields=['elevator', '-completed_at', 'id'], name='elevator_history_idx')],
+                'unique_together': {('schedule_type', 'log_id')},
+            },
+        ),
+        migrations.RunPython(backfill_elevator_history, migrations.RunPython.noop),
+    ]
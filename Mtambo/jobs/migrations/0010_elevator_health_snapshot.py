@@ -0,0 +1,43 @@
+# Generated by Django 5.1.4 on 2026-10-17 05:20
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('buildings', '0004_remove_building_maintenance_company'),
+        ('elevators', '0006_fleetimport'),
+        ('jobs', '0009_elevator_history'),
+        ('maintenance_companies', '0004_alter_maintenancecompanyprofile_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ElevatorHealthSnapshot',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('score', models.PositiveSmallIntegerField()),
+                ('previous_score', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('trend', models.CharField(choices=[('new', 'New'), ('improving', 'Improving'), ('stable', 'Stable'), ('declining', 'Declining')], default='new', max_length=20)),
+                ('checklist_pass_rate', models.FloatField(blank=True, null=True)),
+                ('condition_fault_rate', models.FloatField(blank=True, null=True)),
+                ('maintenance_logs', models.PositiveIntegerField(default=0)),
+                ('condition_reports', models.PositiveIntegerField(default=0)),
+                ('issues', models.PositiveIntegerField(default=0)),
+                ('recent_issues', models.PositiveIntegerField(default=0)),
+                ('computed_at', models.DateTimeField()),
+                ('building', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='elevator_health_snapshots', to='buildings.building')),
+                ('elevator', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='health_snapshot', to='elevators.elevator')),
+                ('maintenance_company', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='elevator_health_snapshots', to='maintenance_companies.maintenancecompanyprofile')),
+            ],
+            options={
+                'verbose_name': 'Elevator Health Snapshot',
+                'verbose_name_plural': 'Elevator Health Snapshots',
+                'ordering': ['score', 'id'],
+                'indexes': [models.Index(fields=['maintenance_company', 'score', 'id'], name='jobs_elevat_mainten_72eb1f_idx'), models.Index(fields=['building', 'score'], name='jobs_elevat_buildin_3dfbc2_idx')],
+            },
+        ),
+    ]
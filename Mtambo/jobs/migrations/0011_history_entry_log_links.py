@@ -0,0 +1,44 @@
+# Generated by Django 5.1.4 on 2026-10-17 06:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Exists, F, OuterRef
+
+
+def link_history_logs(apps, schema_editor):
+    ScheduledMaintenanceLog = apps.get_model('jobs', 'ScheduledMaintenanceLog')
+    AdHocMaintenanceLog = apps.get_model('jobs', 'AdHocMaintenanceLog')
+    ElevatorHistoryEntry = apps.get_model('jobs', 'ElevatorHistoryEntry')
+
+    ElevatorHistoryEntry.objects.filter(
+        Exists(ScheduledMaintenanceLog.objects.filter(id=OuterRef('log_id'))), schedule_type='regular'
+    ).update(regular_log_id=F('log_id'))
+    ElevatorHistoryEntry.objects.filter(
+        Exists(AdHocMaintenanceLog.objects.filter(id=OuterRef('log_id'))), schedule_type='adhoc'
+    ).update(adhoc_log_id=F('log_id'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_elevator_health_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='elevatorhistoryentry',
+            name='adhoc_log',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='history_entries', to='jobs.adhocmaintenancelog'),
+        ),
+        migrations.AddField(
+            model_name='elevatorhistoryentry',
+            name='regular_log',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='history_entries', to='jobs.scheduledmaintenancelog'),
+        ),
+        migrations.AlterField(
+            model_name='elevatorhistoryentry',
+            name='log_id',
+            field=models.UUIDField(help_text='Id of the log the entry was recorded from, kept after the log is deleted.'),
+        ),
+        migrations.RunPython(link_history_logs, migrations.RunPython.noop),
+    ]
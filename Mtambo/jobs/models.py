@@ -9,9 +9,10 @@ from maintenance_companies.models import MaintenanceCompanyProfile
 from technicians.models import TechnicianProfile
 from elevators.models import Elevator
 from buildings.models import Building
+from developers.models import DeveloperProfile
 from .utils import update_schedule_status_and_create_new_schedule
 
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 
 import logging
@@ -68,6 +69,10 @@ class MaintenanceSchedule(models.Model):
     class Meta:
         unique_together = ['elevator', 'scheduled_date']
         ordering = ['-scheduled_date']
+        indexes = [
+            models.Index(fields=['status', 'scheduled_date']),
+            models.Index(fields=['technician', 'scheduled_date']),
+        ]
         verbose_name = "Maintenance Schedule"
         verbose_name_plural = "Maintenance Schedules"
 
@@ -121,35 +126,8 @@ class MaintenanceSchedule(models.Model):
 
     def create_next_schedule(self):
         """Create the next schedule if it doesn't already exist."""
-        next_date = self.get_next_scheduled_date()
-        if not next_date:
-            return None
-
-        # Adjust if the date falls on a weekend
-        while next_date.weekday() >= 5:  # 5 = Saturday, 6 = Sunday
-            next_date += timezone.timedelta(days=1)
-
-        # Check if a schedule already exists for this elevator on next_date
-        existing_schedule = MaintenanceSchedule.objects.filter(
-            elevator=self.elevator,
-            scheduled_date=next_date
-        ).first()
-
-        if existing_schedule:
-            logger.info(f"Schedule already exists for elevator {self.elevator.id} on {next_date}")
-            return existing_schedule
-
-        new_schedule = MaintenanceSchedule.objects.create(
-            elevator=self.elevator,
-            technician=self.technician,
-            maintenance_company=self.maintenance_company,
-            scheduled_date=next_date,
-            next_schedule=self.next_schedule,
-            description=self.description,
-            status='scheduled'
-        )
-        logger.info(f"Created new schedule {new_schedule.id} for elevator {self.elevator.id}")
-        return new_schedule
+        from .services.recurrence_service import RecurrenceService
+        return RecurrenceService.create_next_schedule(self)
 
 # Pre-save signal (optional if you want to catch overdue status earlier)
 @receiver(pre_save, sender=MaintenanceSchedule)
@@ -196,6 +174,18 @@ class ElevatorConditionReport(models.Model):
 
 
 class ScheduledMaintenanceLog(models.Model):
+    # The checklist fields below, in order. Order matters: item i is bit i of
+    # ElevatorHistoryEntry.checklist, so only ever append to this list
+    CHECKLIST_FIELDS = [
+        'check_machine_gear',
+        'check_machine_brake',
+        'check_controller_connections',
+        'blow_dust_from_controller',
+        'clean_machine_room',
+        'clean_guide_rails',
+        'observe_operation',
+    ]
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     maintenance_schedule = models.ForeignKey(MaintenanceSchedule, on_delete=models.CASCADE, related_name="maintenance_logs")
     technician = models.ForeignKey(TechnicianProfile, on_delete=models.CASCADE, related_name="maintenance_logs")
@@ -245,6 +235,9 @@ class AdHocMaintenanceSchedule(models.Model):
         return f"Ad-Hoc Schedule | Elevator: {self.elevator.user_name} | Date: {self.scheduled_date} | Status: {self.status}"
 
     class Meta:
+        indexes = [
+            models.Index(fields=['status', 'scheduled_date']),
+        ]
         verbose_name = "Ad-Hoc Maintenance Schedule"
         verbose_name_plural = "Ad-Hoc Maintenance Schedules"
 
@@ -306,6 +299,9 @@ class BuildingLevelAdhocSchedule(models.Model):
 
     class Meta:
         ordering = ['-scheduled_date']
+        indexes = [
+            models.Index(fields=['status', 'scheduled_date']),
+        ]
         verbose_name = "Building Level Adhoc Schedule"
         verbose_name_plural = "Building Level Adhoc Schedules"
 
@@ -336,3 +332,214 @@ class AdHocMaintenanceTask(models.Model):
 
     def __str__(self):
         return f"Ad-Hoc Task | Created By: {self.created_by.company_name} | Assigned To: {self.assigned_to.user.first_name if self.assigned_to else 'Unassigned'}"
+
+
+class ScheduleSweepWatermark(models.Model):
+    """
+    Records the scheduled_date boundary up to which the overdue sweep has processed schedules,
+    so each run only has to look at schedules whose day ended since the previous run.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=50, unique=True)
+    processed_until = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Sweep Watermark | {self.name} | Processed until: {self.processed_until}"
+
+    class Meta:
+        verbose_name = "Schedule Sweep Watermark"
+        verbose_name_plural = "Schedule Sweep Watermarks"
+
+
+class UnifiedSchedule(models.Model):
+    """
+    Denormalized read model with one row per schedule across MaintenanceSchedule,
+    AdHocMaintenanceSchedule and BuildingLevelAdhocSchedule, so cross-type listings
+    are a single indexed query. Rows are written by UnifiedScheduleService whenever
+    a schedule is saved, deleted or bulk-updated.
+    """
+    SCHEDULE_TYPE_CHOICES = [
+        ('regular', 'Regular'),
+        ('adhoc', 'Ad-Hoc'),
+        ('building_adhoc', 'Building-Level Ad-Hoc'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    schedule_type = models.CharField(max_length=20, choices=SCHEDULE_TYPE_CHOICES)
+    schedule_id = models.UUIDField()
+    elevator = models.ForeignKey(
+        Elevator, on_delete=models.CASCADE, null=True, blank=True, related_name="unified_schedules"
+    )
+    building = models.ForeignKey(Building, on_delete=models.CASCADE, related_name="unified_schedules")
+    developer = models.ForeignKey(
+        DeveloperProfile, on_delete=models.SET_NULL, null=True, blank=True, related_name="unified_schedules"
+    )
+    maintenance_company = models.ForeignKey(
+        MaintenanceCompanyProfile, on_delete=models.SET_NULL, null=True, blank=True, related_name="unified_schedules"
+    )
+    technician = models.ForeignKey(
+        TechnicianProfile, on_delete=models.SET_NULL, null=True, blank=True, related_name="unified_schedules"
+    )
+    scheduled_date = models.DateTimeField()
+    status = models.CharField(max_length=20)
+
+    class Meta:
+        unique_together = ['schedule_type', 'schedule_id']
+        ordering = ['-scheduled_date']
+        indexes = [
+            models.Index(fields=['status', 'scheduled_date']),
+            models.Index(fields=['technician', 'scheduled_date']),
+            models.Index(fields=['maintenance_company', 'scheduled_date']),
+            models.Index(fields=['developer', 'scheduled_date']),
+            models.Index(fields=['building', 'scheduled_date']),
+            models.Index(fields=['elevator', 'scheduled_date']),
+        ]
+        verbose_name = "Unified Schedule"
+        verbose_name_plural = "Unified Schedules"
+
+    def __str__(self):
+        return f"Unified Schedule | {self.get_schedule_type_display()} | Date: {self.scheduled_date} | Status: {self.status}"
+
+
+@receiver(post_save, sender=MaintenanceSchedule)
+@receiver(post_save, sender=AdHocMaintenanceSchedule)
+@receiver(post_save, sender=BuildingLevelAdhocSchedule)
+def sync_unified_schedule(sender, instance, **kwargs):
+    """Keep the unified read model in step with every saved schedule."""
+    from .services.unified_schedule_service import UnifiedScheduleService
+    UnifiedScheduleService.sync([instance])
+
+
+@receiver(post_delete, sender=MaintenanceSchedule)
+@receiver(post_delete, sender=AdHocMaintenanceSchedule)
+@receiver(post_delete, sender=BuildingLevelAdhocSchedule)
+def remove_unified_schedule(sender, instance, **kwargs):
+    """Drop the unified row of a deleted schedule."""
+    from .services.unified_schedule_service import UnifiedScheduleService
+    UnifiedScheduleService.remove([instance])
+
+
+@receiver(post_save, sender=Elevator)
+def sync_unified_schedule_elevator(sender, instance, created, **kwargs):
+    """Carry an elevator's building (and that building's developer) onto its unified rows."""
+    if not created:
+        from .services.unified_schedule_service import UnifiedScheduleService
+        UnifiedScheduleService.sync_elevator(instance)
+
+
+@receiver(post_save, sender=Building)
+def sync_unified_schedule_building(sender, instance, created, **kwargs):
+    """Carry a building's developer onto the unified rows of its schedules."""
+    if not created:
+        UnifiedSchedule.objects.filter(building=instance).exclude(
+            developer_id=instance.developer_id
+        ).update(developer_id=instance.developer_id)
+
+
+class ElevatorHistoryEntry(models.Model):
+    """
+    Append-only maintenance timeline of an elevator, with one entry per filed maintenance
+    log. Each entry keeps a compact summary (checklist result bits, title and issue text
+    snippets) so the timeline is read from this table alone; the full log and condition
+    report are loaded per entry on demand. Deleting a schedule deletes its logs but not
+    their entries: the log link is cleared and the summary stays on the timeline.
+    """
+    SCHEDULE_TYPE_CHOICES = [
+        ('regular', 'Regular'),
+        ('adhoc', 'Ad-Hoc'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    elevator = models.ForeignKey(Elevator, on_delete=models.CASCADE, related_name="history_entries")
+    schedule_type = models.CharField(max_length=20, choices=SCHEDULE_TYPE_CHOICES)
+    schedule_id = models.UUIDField()
+    log_id = models.UUIDField(help_text="Id of the log the entry was recorded from, kept after the log is deleted.")
+    regular_log = models.ForeignKey(
+        ScheduledMaintenanceLog, on_delete=models.SET_NULL, null=True, blank=True, related_name="history_entries"
+    )
+    adhoc_log = models.ForeignKey(
+        AdHocMaintenanceLog, on_delete=models.SET_NULL, null=True, blank=True, related_name="history_entries"
+    )
+    technician = models.ForeignKey(
+        TechnicianProfile, on_delete=models.SET_NULL, null=True, blank=True, related_name="history_entries"
+    )
+    scheduled_date = models.DateTimeField()
+    completed_at = models.DateTimeField()
+    checklist = models.PositiveSmallIntegerField(
+        default=0, help_text="Bit i is set when checklist item i passed."
+    )
+    checklist_size = models.PositiveSmallIntegerField(default=0)
+    title = models.CharField(max_length=255, blank=True)
+    issue_snippet = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['schedule_type', 'log_id']
+        ordering = ['-completed_at', 'id']
+        indexes = [
+            models.Index(fields=['elevator', '-completed_at', 'id'], name='elevator_history_idx'),
+        ]
+        verbose_name = "Elevator History Entry"
+        verbose_name_plural = "Elevator History Entries"
+
+    def __str__(self):
+        return f"History | Elevator: {self.elevator_id} | {self.get_schedule_type_display()} | Completed: {self.completed_at}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise IntegrityError("Elevator history entries are append-only.")
+        super().save(*args, **kwargs)
+
+
+@receiver(post_save, sender=ScheduledMaintenanceLog)
+@receiver(post_save, sender=AdHocMaintenanceLog)
+def record_elevator_history(sender, instance, created, **kwargs):
+    """Append a timeline entry for every newly filed maintenance log."""
+    if created:
+        from .services.history_service import MaintenanceHistoryService
+        MaintenanceHistoryService.record(instance)
+
+
+class ElevatorHealthSnapshot(models.Model):
+    """
+    Latest health score of each elevator, from 0 (at risk) to 100 (healthy), with the
+    inputs it was computed from. The whole fleet is rescored by ElevatorHealthService;
+    previous_score keeps the score of the run before so dashboards can show the trend.
+    """
+    TREND_CHOICES = [
+        ('new', 'New'),
+        ('improving', 'Improving'),
+        ('stable', 'Stable'),
+        ('declining', 'Declining'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    elevator = models.OneToOneField(Elevator, on_delete=models.CASCADE, related_name="health_snapshot")
+    building = models.ForeignKey(Building, on_delete=models.CASCADE, related_name="elevator_health_snapshots")
+    maintenance_company = models.ForeignKey(
+        MaintenanceCompanyProfile, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name="elevator_health_snapshots"
+    )
+    score = models.PositiveSmallIntegerField()
+    previous_score = models.PositiveSmallIntegerField(null=True, blank=True)
+    trend = models.CharField(max_length=20, choices=TREND_CHOICES, default='new')
+    checklist_pass_rate = models.FloatField(null=True, blank=True)
+    condition_fault_rate = models.FloatField(null=True, blank=True)
+    maintenance_logs = models.PositiveIntegerField(default=0)
+    condition_reports = models.PositiveIntegerField(default=0)
+    issues = models.PositiveIntegerField(default=0)
+    recent_issues = models.PositiveIntegerField(default=0)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['score', 'id']
+        indexes = [
+            models.Index(fields=['maintenance_company', 'score', 'id']),
+            models.Index(fields=['building', 'score']),
+        ]
+        verbose_name = "Elevator Health Snapshot"
+        verbose_name_plural = "Elevator Health Snapshots"
+
+    def __str__(self):
+        return f"Health | Elevator: {self.elevator_id} | Score: {self.score} ({self.get_trend_display()})"
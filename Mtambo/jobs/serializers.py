@@ -1,3 +1,5 @@
+from collections import defaultdict
+from django.db.models import QuerySet, prefetch_related_objects
 from rest_framework import serializers
 from elevators.models import Elevator
 from technicians.models import TechnicianProfile
@@ -7,6 +9,61 @@ from rest_framework.exceptions import ValidationError
 from .utils import update_schedule_status_and_create_new_schedule
 from elevators.serializers import ElevatorSerializer
 
+class EagerLoadingMixin:
+    """
+    Lets a serializer declare the related objects its fields read. Whenever the serializer
+    is used with many=True the plan is applied to the instances, so listing views get a
+    constant number of queries without each one having to remember its select_related calls.
+    """
+    select_related_fields = []
+    prefetch_related_fields = []
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Apply the declared select/prefetch plan to a queryset."""
+        return queryset.select_related(*cls.select_related_fields).prefetch_related(*cls.prefetch_related_fields)
+
+    @classmethod
+    def apply_eager_loading(cls, instances):
+        """
+        Apply the plan to an unevaluated queryset, or prefetch it onto already loaded
+        instances. Lists mixing several schedule models are prefetched per model.
+        """
+        if instances is None:
+            return instances
+        if isinstance(instances, QuerySet) and instances._result_cache is None:
+            return cls.setup_eager_loading(instances)
+
+        instances_by_model = defaultdict(list)
+        for instance in instances:
+            instances_by_model[type(instance)].append(instance)
+        for model_instances in instances_by_model.values():
+            prefetch_related_objects(
+                model_instances, *cls.select_related_fields, *cls.prefetch_related_fields
+            )
+        return instances
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        if args:
+            args = (cls.apply_eager_loading(args[0]),) + args[1:]
+        elif 'instance' in kwargs:
+            kwargs['instance'] = cls.apply_eager_loading(kwargs['instance'])
+        return super().many_init(*args, **kwargs)
+
+class EffectiveStatusMixin:
+    """
+    Reports a schedule's annotated effective_status (see
+    OverdueSweepService.annotate_effective_status) as its status when one is present.
+    """
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        effective_status = getattr(instance, 'effective_status', None)
+        if effective_status:
+            data['status'] = effective_status
+        return data
+
 class BuildingScheduleCompletionSerializer(serializers.Serializer):
     elevators = serializers.ListField(
         child=ElevatorSerializer(),
@@ -209,10 +266,13 @@ class AdHocMaintenanceLogSerializer(serializers.ModelSerializer):
         ]
 
 
-class CompleteMaintenanceScheduleSerializer(BaseScheduleSerializer):
+class CompleteMaintenanceScheduleSerializer(EagerLoadingMixin, EffectiveStatusMixin, BaseScheduleSerializer):
     """
     Serializer for handling both normal and ad-hoc maintenance schedules with nested reports and logs.
     """
+    select_related_fields = ['elevator__building__developer', 'technician__user', 'maintenance_company']
+    prefetch_related_fields = ['condition_reports', 'maintenance_logs']
+
     elevator = serializers.SerializerMethodField()
     building = serializers.SerializerMethodField()
     developer = serializers.SerializerMethodField()
@@ -264,11 +324,10 @@ class CompleteMaintenanceScheduleSerializer(BaseScheduleSerializer):
         Returns the associated condition report for the schedule.
         Handles both normal and ad-hoc schedules.
         """
+        reports = obj.condition_reports.all()
         if isinstance(obj, MaintenanceSchedule):
-            reports = ElevatorConditionReport.objects.filter(maintenance_schedule=obj)
             serializer = ElevatorConditionReportSerializer(reports, many=True)
         else:
-            reports = AdHocElevatorConditionReport.objects.filter(ad_hoc_schedule=obj)
             serializer = AdHocElevatorConditionReportSerializer(reports, many=True)
         return serializer.data
 
@@ -277,11 +336,10 @@ class CompleteMaintenanceScheduleSerializer(BaseScheduleSerializer):
         Returns the associated maintenance log for the schedule.
         Handles both normal and ad-hoc schedules.
         """
+        logs = obj.maintenance_logs.all()
         if isinstance(obj, MaintenanceSchedule):
-            logs = ScheduledMaintenanceLog.objects.filter(maintenance_schedule=obj)
             serializer = ScheduledMaintenanceLogSerializer(logs, many=True)
         else:
-            logs = AdHocMaintenanceLog.objects.filter(ad_hoc_schedule=obj)
             serializer = AdHocMaintenanceLogSerializer(logs, many=True)
         return serializer.data
 
@@ -329,7 +387,10 @@ class CompleteMaintenanceScheduleSerializer(BaseScheduleSerializer):
 
         return result
 
-class BuildingLevelAdhocScheduleSerializer(serializers.ModelSerializer):
+class BuildingLevelAdhocScheduleSerializer(EagerLoadingMixin, EffectiveStatusMixin, serializers.ModelSerializer):
+    select_related_fields = ['building__developer', 'technician__user']
+    prefetch_related_fields = ['building__elevators']
+
     building_name = serializers.SerializerMethodField()
     technician_name = serializers.SerializerMethodField()
     elevators = serializers.SerializerMethodField()
@@ -369,7 +430,7 @@ class BuildingLevelAdhocScheduleSerializer(serializers.ModelSerializer):
         """Retrieve all elevators in the building with their usernames and IDs."""
         if not obj.building:
             return []
-        elevators = Elevator.objects.filter(building=obj.building)
+        elevators = obj.building.elevators.all()
         return [
             {
                 "id": str(elevator.id),  # Convert UUID to string
@@ -385,3 +446,100 @@ class BuildingLevelAdhocScheduleSerializer(serializers.ModelSerializer):
         return {'id': str(developer.id), 'name': developer.developer_name} if developer else None
 
 
+
+
+def serialize_schedules(schedules):
+    """
+    Serialize an ordered list mixing regular, ad-hoc and building-level ad-hoc schedules.
+    Each schedule model goes through its serializer in one batch, so eager loading applies,
+    and the serialized items are returned in the original order.
+    """
+    schedules_by_model = defaultdict(list)
+    for schedule in schedules:
+        schedules_by_model[type(schedule)].append(schedule)
+
+    serialized = {}
+    for model, instances in schedules_by_model.items():
+        if model is BuildingLevelAdhocSchedule:
+            serializer_class = BuildingLevelAdhocScheduleSerializer
+        else:
+            serializer_class = CompleteMaintenanceScheduleSerializer
+        data = serializer_class(instances, many=True).data
+        serialized.update({(model, instance.pk): item for instance, item in zip(instances, data)})
+
+    return [serialized[(type(schedule), schedule.pk)] for schedule in schedules]
+
+
+class UnifiedScheduleSerializer(EffectiveStatusMixin, serializers.ModelSerializer):
+    """
+    Flat listing of schedules of every type from the unified read model.
+    'id' is the id of the underlying schedule, to be used with schedule_type.
+    """
+    id = serializers.UUIDField(source='schedule_id', read_only=True)
+
+    class Meta:
+        model = UnifiedSchedule
+        fields = [
+            'id',
+            'schedule_type',
+            'elevator',
+            'building',
+            'developer',
+            'maintenance_company',
+            'technician',
+            'scheduled_date',
+            'status',
+        ]
+        read_only_fields = fields
+
+
+class ElevatorHistoryEntrySerializer(serializers.ModelSerializer):
+    """Compact timeline entry; checklist is decoded to {item: passed}."""
+    checklist = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ElevatorHistoryEntry
+        fields = [
+            'id',
+            'schedule_type',
+            'schedule_id',
+            'log_id',
+            'technician',
+            'scheduled_date',
+            'completed_at',
+            'title',
+            'issue_snippet',
+            'checklist',
+        ]
+        read_only_fields = fields
+
+    def get_checklist(self, obj):
+        from .services.history_service import MaintenanceHistoryService
+        return MaintenanceHistoryService.decode_checklist(obj.checklist, obj.checklist_size)
+
+
+class ElevatorHealthSnapshotSerializer(serializers.ModelSerializer):
+    machine_number = serializers.CharField(source='elevator.machine_number', read_only=True)
+    user_name = serializers.CharField(source='elevator.user_name', read_only=True)
+    building_name = serializers.CharField(source='building.name', read_only=True)
+
+    class Meta:
+        model = ElevatorHealthSnapshot
+        fields = [
+            'elevator',
+            'machine_number',
+            'user_name',
+            'building',
+            'building_name',
+            'score',
+            'previous_score',
+            'trend',
+            'checklist_pass_rate',
+            'condition_fault_rate',
+            'maintenance_logs',
+            'condition_reports',
+            'issues',
+            'recent_issues',
+            'computed_at',
+        ]
+        read_only_fields = fields
@@ -0,0 +1,170 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from elevators.models import Elevator, ElevatorIssueLog
+from jobs.models import ElevatorConditionReport, ElevatorHealthSnapshot, ScheduledMaintenanceLog
+
+
+class ElevatorHealthService:
+    """
+    Scores every elevator from its recent maintenance checklists, condition reports and
+    reported issues. Each source table is aggregated for the whole fleet in a single
+    GROUP BY query, so a run costs the same handful of queries for ten lifts or ten
+    thousand, and the scores are upserted into ElevatorHealthSnapshot.
+
+    A score starts at 100 and loses up to CHECKLIST_WEIGHT for failed checklist items,
+    CONDITION_WEIGHT for degraded condition report readings and ISSUE_WEIGHT for issues
+    reported in the window (issues from the last RECENT_ISSUE_DAYS count twice).
+    """
+    CHECKLIST_FIELDS = ScheduledMaintenanceLog.CHECKLIST_FIELDS
+    # Condition report readings that count as degraded (matched case-insensitively)
+    CONDITION_FAULTS = {
+        'alarm_bell': ['Intermittent', 'Non-Functional'],
+        'noise_during_motion': ['Loud', 'Excessive'],
+        'cabin_lights': ['Partial Failure', 'Complete Failure'],
+    }
+
+    CHECKLIST_WEIGHT = 40
+    CONDITION_WEIGHT = 30
+    ISSUE_WEIGHT = 30
+    ISSUE_CAP = 5
+    RECENT_ISSUE_DAYS = 30
+    # Penalty share applied when an elevator has no maintenance log in the window
+    UNMAINTAINED_PENALTY = 0.5
+    # Score change below which the trend is reported as stable
+    TREND_THRESHOLD = 5
+
+    @classmethod
+    def checklist_totals(cls, since):
+        """{elevator_id: (logs, passed checklist items)} for logs completed since."""
+        rows = (
+            ScheduledMaintenanceLog.objects.filter(date_completed__gte=since)
+            .values('maintenance_schedule__elevator_id')
+            .annotate(
+                logs=Count('id'),
+                **{field: Count('id', filter=Q(**{field: True})) for field in cls.CHECKLIST_FIELDS},
+            )
+            .order_by()
+        )
+        return {
+            row['maintenance_schedule__elevator_id']: (row['logs'], sum(row[field] for field in cls.CHECKLIST_FIELDS))
+            for row in rows
+        }
+
+    @classmethod
+    def condition_totals(cls, since):
+        """{elevator_id: (reports, degraded readings)} for reports inspected since."""
+        faults = {}
+        for field, values in cls.CONDITION_FAULTS.items():
+            match = Q()
+            for value in values:
+                match |= Q(**{f'{field}__iexact': value})
+            faults[field] = Count('id', filter=match)
+
+        rows = (
+            ElevatorConditionReport.objects.filter(date_inspected__gte=since)
+            .values('maintenance_schedule__elevator_id')
+            .annotate(reports=Count('id'), **faults)
+            .order_by()
+        )
+        return {
+            row['maintenance_schedule__elevator_id']: (row['reports'], sum(row[field] for field in cls.CONDITION_FAULTS))
+            for row in rows
+        }
+
+    @classmethod
+    def issue_totals(cls, since, recent_since):
+        """{elevator_id: (issues, recent issues)} for issues reported since."""
+        rows = (
+            ElevatorIssueLog.objects.filter(reported_date__gte=since)
+            .values('elevator_id')
+            .annotate(issues=Count('id'), recent=Count('id', filter=Q(reported_date__gte=recent_since)))
+            .order_by()
+        )
+        return {row['elevator_id']: (row['issues'], row['recent']) for row in rows}
+
+    @classmethod
+    def score(cls, checklist, condition, issues):
+        """
+        Health score for one elevator from its (logs, passed items), (reports, degraded
+        readings) and (issues, recent issues) totals. Returns (score, checklist pass
+        rate, condition fault rate); a rate is None when there was nothing to rate.
+        """
+        logs, passed = checklist
+        pass_rate = passed / (logs * len(cls.CHECKLIST_FIELDS)) if logs else None
+        penalty = cls.CHECKLIST_WEIGHT * (1 - pass_rate if pass_rate is not None else cls.UNMAINTAINED_PENALTY)
+
+        reports, degraded = condition
+        fault_rate = degraded / (reports * len(cls.CONDITION_FAULTS)) if reports else None
+        penalty += cls.CONDITION_WEIGHT * (fault_rate or 0)
+
+        issue_count, recent = issues
+        penalty += cls.ISSUE_WEIGHT * min(issue_count + recent, cls.ISSUE_CAP) / cls.ISSUE_CAP
+
+        return max(0, min(100, round(100 - penalty))), pass_rate, fault_rate
+
+    @classmethod
+    def get_trend(cls, score, previous_score):
+        if previous_score is None:
+            return 'new'
+        if score - previous_score >= cls.TREND_THRESHOLD:
+            return 'improving'
+        if previous_score - score >= cls.TREND_THRESHOLD:
+            return 'declining'
+        return 'stable'
+
+    @classmethod
+    def refresh(cls, now=None, batch_size=1000):
+        """
+        Rescore the whole fleet over the last HEALTH_SCORE_WINDOW_DAYS and write one
+        snapshot per elevator. Returns the number of elevators scored.
+        """
+        now = now or timezone.now()
+        since = now - timedelta(days=settings.HEALTH_SCORE_WINDOW_DAYS)
+        checklists = cls.checklist_totals(since)
+        conditions = cls.condition_totals(since)
+        issues = cls.issue_totals(since, now - timedelta(days=cls.RECENT_ISSUE_DAYS))
+        previous_scores = dict(ElevatorHealthSnapshot.objects.values_list('elevator_id', 'score'))
+
+        snapshots = []
+        for elevator_id, building_id, company_id in Elevator.objects.values_list(
+            'id', 'building_id', 'maintenance_company_id'
+        ).order_by().iterator(chunk_size=batch_size):
+            checklist = checklists.get(elevator_id, (0, 0))
+            condition = conditions.get(elevator_id, (0, 0))
+            issue = issues.get(elevator_id, (0, 0))
+            score, pass_rate, fault_rate = cls.score(checklist, condition, issue)
+            previous_score = previous_scores.get(elevator_id)
+            snapshots.append(ElevatorHealthSnapshot(
+                elevator_id=elevator_id,
+                building_id=building_id,
+                maintenance_company_id=company_id,
+                score=score,
+                previous_score=previous_score,
+                trend=cls.get_trend(score, previous_score),
+                checklist_pass_rate=pass_rate,
+                condition_fault_rate=fault_rate,
+                maintenance_logs=checklist[0],
+                condition_reports=condition[0],
+                issues=issue[0],
+                recent_issues=issue[1],
+                computed_at=now,
+            ))
+
+        with transaction.atomic():
+            ElevatorHealthSnapshot.objects.bulk_create(
+                snapshots,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=['elevator'],
+                update_fields=[
+                    'building', 'maintenance_company', 'score', 'previous_score', 'trend',
+                    'checklist_pass_rate', 'condition_fault_rate', 'maintenance_logs',
+                    'condition_reports', 'issues', 'recent_issues', 'computed_at',
+                ],
+            )
+        return len(snapshots)
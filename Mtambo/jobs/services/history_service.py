@@ -0,0 +1,84 @@
+from jobs.models import (
+    AdHocMaintenanceLog, ElevatorHistoryEntry, ScheduledMaintenanceLog
+)
+
+
+class MaintenanceHistoryService:
+    """
+    Writes and reads the ElevatorHistoryEntry timeline. An entry is appended when a
+    maintenance log is filed; the timeline is then paged from that table alone, and the
+    full log and condition report are fetched only when one entry is opened.
+    """
+    # Item i of the list is bit i of ElevatorHistoryEntry.checklist
+    CHECKLIST_FIELDS = ScheduledMaintenanceLog.CHECKLIST_FIELDS
+    SNIPPET_LENGTH = 200
+
+    @classmethod
+    def snippet(cls, text):
+        """text collapsed to one line and cut to SNIPPET_LENGTH characters."""
+        text = " ".join((text or "").split())
+        if len(text) > cls.SNIPPET_LENGTH:
+            return text[:cls.SNIPPET_LENGTH - 1] + "…"
+        return text
+
+    @classmethod
+    def encode_checklist(cls, log):
+        return sum(1 << bit for bit, field in enumerate(cls.CHECKLIST_FIELDS) if getattr(log, field))
+
+    @classmethod
+    def decode_checklist(cls, bits, size):
+        """{item: passed} for the first size checklist items stored in bits."""
+        return {field: bool(bits & (1 << bit)) for bit, field in enumerate(cls.CHECKLIST_FIELDS[:size])}
+
+    @classmethod
+    def build_entry(cls, log):
+        """Unsaved timeline entry summarizing a regular or ad-hoc maintenance log."""
+        if isinstance(log, ScheduledMaintenanceLog):
+            schedule = log.maintenance_schedule
+            return ElevatorHistoryEntry(
+                elevator_id=schedule.elevator_id,
+                schedule_type='regular',
+                schedule_id=schedule.id,
+                log_id=log.id,
+                regular_log=log,
+                technician_id=log.technician_id,
+                scheduled_date=schedule.scheduled_date,
+                completed_at=log.date_completed,
+                checklist=cls.encode_checklist(log),
+                checklist_size=len(cls.CHECKLIST_FIELDS),
+                title=cls.snippet(log.description) or "Routine maintenance",
+                issue_snippet=cls.snippet(log.condition_report.additional_comments),
+            )
+
+        schedule = log.ad_hoc_schedule
+        return ElevatorHistoryEntry(
+            elevator_id=schedule.elevator_id,
+            schedule_type='adhoc',
+            schedule_id=schedule.id,
+            log_id=log.id,
+            adhoc_log=log,
+            technician_id=log.technician_id,
+            scheduled_date=schedule.scheduled_date,
+            completed_at=log.date_completed,
+            title=cls.snippet(log.summary_title),
+            issue_snippet=cls.snippet(log.condition_report.condition),
+        )
+
+    @classmethod
+    def record(cls, log):
+        """Append the timeline entry of a newly filed log. Logs already recorded are skipped."""
+        ElevatorHistoryEntry.objects.bulk_create([cls.build_entry(log)], ignore_conflicts=True)
+
+    @staticmethod
+    def load_details(entry):
+        """
+        The maintenance log of an entry, with its condition report, or None once the log
+        has been deleted along with its schedule.
+        """
+        if entry.schedule_type == 'regular':
+            log_model, log_id = ScheduledMaintenanceLog, entry.regular_log_id
+        else:
+            log_model, log_id = AdHocMaintenanceLog, entry.adhoc_log_id
+        if log_id is None:
+            return None
+        return log_model.objects.select_related('condition_report').filter(id=log_id).first()
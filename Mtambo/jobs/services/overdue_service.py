@@ -0,0 +1,118 @@
+from django.db import transaction
+from django.db.models import Case, CharField, F, Value, When
+from django.utils import timezone
+import logging
+
+from jobs.models import (
+    MaintenanceSchedule, AdHocMaintenanceSchedule, BuildingLevelAdhocSchedule, ScheduleSweepWatermark
+)
+from jobs.services.recurrence_service import RecurrenceService
+from jobs.services.unified_schedule_service import UnifiedScheduleService
+
+logger = logging.getLogger(__name__)
+
+
+class OverdueSweepService:
+    """
+    Set-based sweep that moves 'scheduled' rows whose scheduled day has ended to 'overdue'.
+    Each schedule table is updated with a single UPDATE, and follow-up schedules for the
+    recurring rows that changed are inserted in bulk.
+
+    A persisted watermark records the last day boundary processed, so a run only scans
+    schedules whose day ended between the previous run and now.
+    """
+    WATERMARK_NAME = 'overdue_schedules'
+
+    RECURRING_SCHEDULES = ['1_month', '3_months', '6_months']
+
+    SCHEDULE_MODELS = [
+        ('regular', MaintenanceSchedule),
+        ('adhoc', AdHocMaintenanceSchedule),
+        ('building_adhoc', BuildingLevelAdhocSchedule),
+    ]
+
+    @staticmethod
+    def get_cutoff(now=None):
+        """
+        Return the start of the current day. A schedule whose scheduled_date is before
+        this boundary has reached the end of its day and is overdue.
+        """
+        now = now or timezone.now()
+        return timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    @classmethod
+    def sweep(cls, now=None, full_scan=False):
+        """
+        Mark every due schedule as overdue and create follow-ups for recurring ones.
+        Only schedules dated between the stored watermark and the current day boundary
+        are considered, unless full_scan is set or the sweep has never run before.
+
+        Returns the number of rows changed per schedule type and the number of
+        follow-up schedules created.
+        """
+        cutoff = cls.get_cutoff(now)
+        counts = {label: 0 for label, _ in cls.SCHEDULE_MODELS}
+        counts['next_schedules'] = 0
+
+        with transaction.atomic():
+            watermark, _ = ScheduleSweepWatermark.objects.select_for_update().get_or_create(
+                name=cls.WATERMARK_NAME
+            )
+            processed_until = None if full_scan else watermark.processed_until
+
+            if processed_until and processed_until >= cutoff:
+                logger.debug(f"Overdue sweep already processed up to {processed_until}")
+                return counts
+
+            for label, model in cls.SCHEDULE_MODELS:
+                due = model.objects.filter(status='scheduled', scheduled_date__lt=cutoff)
+                if processed_until:
+                    due = due.filter(scheduled_date__gte=processed_until)
+
+                if model is MaintenanceSchedule:
+                    recurring = list(
+                        due.filter(next_schedule__in=cls.RECURRING_SCHEDULES)
+                        .select_for_update()
+                        .only(
+                            'id', 'elevator_id', 'technician_id', 'maintenance_company_id',
+                            'scheduled_date', 'next_schedule', 'description'
+                        )
+                    )
+                    UnifiedScheduleService.for_queryset(due).update(status='overdue')
+                    counts[label] = due.update(status='overdue')
+                    counts['next_schedules'] = cls.create_follow_up_schedules(recurring)
+                else:
+                    UnifiedScheduleService.for_queryset(due).update(status='overdue')
+                    counts[label] = due.update(status='overdue')
+
+            if not watermark.processed_until or watermark.processed_until < cutoff:
+                watermark.processed_until = cutoff
+                watermark.save(update_fields=['processed_until', 'updated_at'])
+
+        logger.info(f"Overdue sweep from {processed_until or 'the beginning'} up to {cutoff}: {counts}")
+        return counts
+
+    @classmethod
+    def annotate_effective_status(cls, queryset, now=None):
+        """
+        Annotate each schedule with effective_status: 'overdue' for a 'scheduled' row whose
+        day has ended (the sweep's cutoff, see get_cutoff), its stored status otherwise.
+        Lets read endpoints report what the next sweep will persist without writing.
+        """
+        return queryset.annotate(
+            effective_status=Case(
+                When(status='scheduled', scheduled_date__lt=cls.get_cutoff(now), then=Value('overdue')),
+                default=F('status'),
+                output_field=CharField(),
+            )
+        )
+
+    @classmethod
+    def create_follow_up_schedules(cls, schedules):
+        """
+        Bulk-create the next routine schedule for each of the given schedules.
+        Schedules that already exist for the same elevator and date are skipped.
+        Returns the number of schedules created.
+        """
+        _, created = RecurrenceService.create_next_schedules(schedules)
+        return len(created)
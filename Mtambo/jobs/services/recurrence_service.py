@@ -0,0 +1,203 @@
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RecurrenceService:
+    """
+    Generates the follow-up routine schedule for a batch of completed or overdue
+    maintenance schedules. Next dates are computed in memory and all new schedules
+    are written with a single bulk insert, so a batch costs the same handful of
+    queries whether it holds one schedule or thousands.
+    """
+    RECURRENCE_MONTHS = {
+        '1_month': 1,
+        '3_months': 3,
+        '6_months': 6,
+    }
+
+    @staticmethod
+    def shift_to_business_day(date):
+        """
+        Move a Saturday or Sunday forward to the following Monday.
+        Weekdays are returned unchanged.
+        """
+        weekday = date.weekday()
+        if weekday >= 5:  # 5 = Saturday, 6 = Sunday
+            return date + timezone.timedelta(days=7 - weekday)
+        return date
+
+    @classmethod
+    def get_next_date(cls, scheduled_date, next_schedule):
+        """
+        Return the next business-day occurrence after scheduled_date for the given
+        recurrence, or None for one-time ('set_date') schedules.
+        """
+        months = cls.RECURRENCE_MONTHS.get(next_schedule)
+        if not months or not scheduled_date:
+            return None
+        return cls.shift_to_business_day(scheduled_date + relativedelta(months=months))
+
+    @classmethod
+    def create_next_schedules(cls, schedules):
+        """
+        Create the next routine schedule for each of the given schedules.
+
+        Schedules that already have a follow-up for the same elevator and date reuse it,
+        and duplicates within the batch collapse to a single row. Returns a tuple of
+        (next_schedules, created) where next_schedules maps each source schedule id to
+        its follow-up and created lists the schedules inserted by this call.
+        """
+        from jobs.models import MaintenanceSchedule
+        from jobs.services.unified_schedule_service import UnifiedScheduleService
+
+        sources = {}
+        for schedule in schedules:
+            next_date = cls.get_next_date(schedule.scheduled_date, schedule.next_schedule)
+            if next_date:
+                sources[schedule.id] = (schedule, (schedule.elevator_id, next_date))
+
+        if not sources:
+            return {}, []
+
+        keys = {key for _, key in sources.values()}
+        by_key = {
+            (existing.elevator_id, existing.scheduled_date): existing
+            for existing in MaintenanceSchedule.objects.filter(
+                elevator_id__in={elevator_id for elevator_id, _ in keys},
+                scheduled_date__in={next_date for _, next_date in keys},
+            )
+        }
+
+        now = timezone.now()
+        created = []
+        for schedule, key in sources.values():
+            if key in by_key:
+                continue
+            new_schedule = MaintenanceSchedule(
+                elevator_id=schedule.elevator_id,
+                technician_id=schedule.technician_id,
+                maintenance_company_id=schedule.maintenance_company_id,
+                scheduled_date=key[1],
+                next_schedule=schedule.next_schedule,
+                description=schedule.description,
+                # Mirror the pre_save rule, since bulk_create bypasses save() and its signals
+                status='overdue' if key[1] < now else 'scheduled'
+            )
+            by_key[key] = new_schedule
+            created.append(new_schedule)
+
+        stored = cls.insert_schedules(created)
+        # A row another worker inserted first wins the conflict: hand that one back instead
+        by_key.update(stored)
+        created = [schedule for schedule in created if stored.get(cls.schedule_key(schedule), schedule).id == schedule.id]
+        UnifiedScheduleService.sync(created)
+        logger.info(f"Created {len(created)} follow-up schedules for {len(sources)} source schedules")
+
+        next_schedules = {source_id: by_key[key] for source_id, (_, key) in sources.items()}
+        return next_schedules, created
+
+    @staticmethod
+    def schedule_key(schedule):
+        return schedule.elevator_id, schedule.scheduled_date
+
+    @classmethod
+    def insert_schedules(cls, schedules):
+        """
+        Bulk-insert schedules, skipping any whose (elevator, scheduled_date) another worker
+        inserted concurrently. Returns {(elevator_id, scheduled_date): stored schedule}
+        re-read from the database, so a schedule was inserted by this call only if the
+        stored row has its id.
+        """
+        from jobs.models import MaintenanceSchedule
+
+        if not schedules:
+            return {}
+        MaintenanceSchedule.objects.bulk_create(schedules, ignore_conflicts=True)
+        keys = {cls.schedule_key(schedule) for schedule in schedules}
+        return {
+            cls.schedule_key(stored): stored
+            for stored in MaintenanceSchedule.objects.filter(
+                elevator_id__in={elevator_id for elevator_id, _ in keys},
+                scheduled_date__in={scheduled_date for _, scheduled_date in keys},
+            )
+            if cls.schedule_key(stored) in keys
+        }
+
+    @classmethod
+    def create_next_schedule(cls, schedule):
+        """
+        Single-schedule convenience wrapper around create_next_schedules.
+        Returns the follow-up schedule, or None for one-time schedules.
+        """
+        next_schedules, _ = cls.create_next_schedules([schedule])
+        return next_schedules.get(schedule.id)
+
+    @classmethod
+    def extend_horizon(cls, occurrences=None, now=None):
+        """
+        Keep the next `occurrences` routine schedules materialized for every elevator
+        with a recurring schedule. Each elevator's series is extended from its latest
+        recurring schedule, so running this again without the clock moving creates
+        nothing. Returns the number of schedules created.
+        """
+        from jobs.models import MaintenanceSchedule
+        from jobs.services.unified_schedule_service import UnifiedScheduleService
+
+        occurrences = occurrences or getattr(settings, 'SCHEDULE_HORIZON_OCCURRENCES', 3)
+        now = now or timezone.now()
+        recurring = MaintenanceSchedule.objects.filter(next_schedule__in=cls.RECURRENCE_MONTHS)
+
+        series = {
+            row['elevator_id']: row
+            for row in recurring.values('elevator_id').annotate(
+                latest=Max('scheduled_date'),
+                upcoming=Count('id', filter=Q(scheduled_date__gte=now)),
+            ).filter(upcoming__lt=occurrences)
+        }
+        if not series:
+            return 0
+
+        latest_schedules = recurring.filter(
+            elevator_id__in=series,
+            scheduled_date__in={row['latest'] for row in series.values()},
+        ).only(
+            'id', 'elevator_id', 'technician_id', 'maintenance_company_id',
+            'scheduled_date', 'next_schedule', 'description'
+        )
+
+        new_schedules = []
+        for latest in latest_schedules:
+            row = series.get(latest.elevator_id)
+            if not row or latest.scheduled_date != row['latest']:
+                continue
+
+            scheduled_date = latest.scheduled_date
+            for _ in range(occurrences - row['upcoming']):
+                scheduled_date = cls.get_next_date(scheduled_date, latest.next_schedule)
+                while scheduled_date < now:
+                    # A stale series is caught up to the present rather than back-filled
+                    scheduled_date = cls.get_next_date(scheduled_date, latest.next_schedule)
+                new_schedules.append(MaintenanceSchedule(
+                    elevator_id=latest.elevator_id,
+                    technician_id=latest.technician_id,
+                    maintenance_company_id=latest.maintenance_company_id,
+                    scheduled_date=scheduled_date,
+                    next_schedule=latest.next_schedule,
+                    description=latest.description,
+                    status='scheduled'
+                ))
+
+        stored = cls.insert_schedules(new_schedules)
+        # Skip rows another worker inserted first, so the read model only mirrors real rows
+        new_schedules = [
+            schedule for schedule in new_schedules
+            if stored.get(cls.schedule_key(schedule), schedule).id == schedule.id
+        ]
+        UnifiedScheduleService.sync(new_schedules)
+        logger.info(f"Extended schedule horizon with {len(new_schedules)} schedules for {len(series)} elevators")
+        return len(new_schedules)
@@ -0,0 +1,182 @@
+from datetime import datetime
+from django.db.models import CharField, Q, Value
+from rest_framework.exceptions import NotFound
+import uuid
+
+from buildings.models import Building
+from developers.models import DeveloperProfile
+from elevators.models import Elevator
+from maintenance_companies.models import MaintenanceCompanyProfile
+from technicians.models import TechnicianProfile
+from jobs.exceptions import InvalidFilterError
+from jobs.models import MaintenanceSchedule, AdHocMaintenanceSchedule, BuildingLevelAdhocSchedule
+
+
+class ScheduleFilterService:
+    """
+    Translates schedule filter requests into one Q expression per schedule model, so
+    filtering, ordering and pagination all happen in the database. When no schedule type
+    is given the three filtered tables are combined with an ordered UNION ALL of
+    (id, schedule_type, scheduled_date) rows, and only the requested page is loaded.
+    """
+    ALLOWED_FIELDS = [
+        'technician_id', 'status', 'developer_id', 'elevator_id',
+        'building_id', 'scheduled_date', 'next_schedule', 'maintenance_company_id', 'schedule_type'
+    ]
+
+    SCHEDULE_MODELS = {
+        'regular': MaintenanceSchedule,
+        'adhoc': AdHocMaintenanceSchedule,
+        'building': BuildingLevelAdhocSchedule,
+    }
+
+    VALID_STATUSES = ['scheduled', 'overdue', 'completed']
+    VALID_NEXT_SCHEDULES = ['1_month', '3_months', '6_months', 'set_date']
+
+    # Filter key -> (model the id refers to, label for format errors, name for not-found errors)
+    ID_FILTERS = {
+        'technician_id': (TechnicianProfile, 'technician', 'Technician'),
+        'developer_id': (DeveloperProfile, 'developer', 'Developer'),
+        'elevator_id': (Elevator, 'elevator', 'Elevator'),
+        'building_id': (Building, 'building', 'Building'),
+        'maintenance_company_id': (MaintenanceCompanyProfile, 'maintenance company', 'Maintenance company'),
+    }
+
+    @classmethod
+    def clean_filters(cls, data):
+        """
+        Validate the raw request data and return the non-empty filters with ids parsed
+        to UUIDs and the date parsed. Raises InvalidFilterError for malformed input and
+        NotFound when a referenced object does not exist.
+        """
+        invalid_fields = [key for key in data if key not in cls.ALLOWED_FIELDS]
+        if invalid_fields:
+            raise InvalidFilterError(f"Invalid fields: {', '.join(invalid_fields)}")
+
+        schedule_type = data.get('schedule_type')
+        if schedule_type not in [None, *cls.SCHEDULE_MODELS]:
+            raise InvalidFilterError("Invalid schedule_type. Valid options are: 'regular', 'adhoc', 'building'.")
+
+        filters = {}
+        for key in cls.ALLOWED_FIELDS:
+            value = data.get(key)
+            if not value or key == 'schedule_type':
+                continue
+
+            if key in cls.ID_FILTERS:
+                model, label, name = cls.ID_FILTERS[key]
+                try:
+                    object_id = uuid.UUID(str(value))
+                except ValueError:
+                    raise InvalidFilterError(f"Invalid {label} ID format.")
+                if not model.objects.filter(id=object_id).exists():
+                    raise NotFound(f"{name} with ID {value} not found.")
+                filters[key] = object_id
+
+            elif key == 'status':
+                if value not in cls.VALID_STATUSES:
+                    raise InvalidFilterError(
+                        f"Invalid status '{value}'. Valid options are: {', '.join(cls.VALID_STATUSES)}."
+                    )
+                filters[key] = value
+
+            elif key == 'scheduled_date':
+                try:
+                    filters[key] = datetime.strptime(value, '%Y-%m-%d').date()
+                except (TypeError, ValueError):
+                    raise InvalidFilterError("Invalid date format. Please use YYYY-MM-DD.")
+
+            elif key == 'next_schedule':
+                if value not in cls.VALID_NEXT_SCHEDULES:
+                    raise InvalidFilterError(
+                        f"Invalid next_schedule '{value}'. Valid options are: {', '.join(cls.VALID_NEXT_SCHEDULES)}."
+                    )
+                filters[key] = value
+
+        return schedule_type, filters
+
+    @classmethod
+    def build_q(cls, schedule_type, filters):
+        """
+        Return the Q expression selecting the schedules of one type that match the filters,
+        or None when that type can never match (e.g. next_schedule on ad-hoc schedules).
+        """
+        has_elevator = schedule_type != 'building'
+        q = Q()
+
+        if 'technician_id' in filters:
+            q &= Q(technician_id=filters['technician_id'])
+        if 'status' in filters:
+            q &= Q(status=filters['status'])
+        if 'maintenance_company_id' in filters:
+            q &= Q(maintenance_company_id=filters['maintenance_company_id'])
+        if 'scheduled_date' in filters:
+            q &= Q(scheduled_date__date=filters['scheduled_date'])
+
+        # Developer, elevator and next_schedule filters only apply to elevator-level schedules
+        if 'developer_id' in filters:
+            if not has_elevator:
+                return None
+            q &= Q(elevator__building__developer_id=filters['developer_id'])
+        if 'elevator_id' in filters:
+            if not has_elevator:
+                return None
+            q &= Q(elevator_id=filters['elevator_id'])
+        if 'next_schedule' in filters:
+            if schedule_type != 'regular':
+                return None
+            q &= Q(next_schedule=filters['next_schedule'])
+
+        if 'building_id' in filters:
+            building_field = 'elevator__building_id' if has_elevator else 'building_id'
+            q &= Q(**{building_field: filters['building_id']})
+
+        return q
+
+    @classmethod
+    def filter_schedules(cls, schedule_type, filters):
+        """
+        Return a values queryset of {'id', 'schedule_type', 'scheduled_date'} rows for every
+        matching schedule, newest first. Suitable for counting and slicing by a paginator.
+        """
+        schedule_types = [schedule_type] if schedule_type else list(cls.SCHEDULE_MODELS)
+
+        querysets = []
+        for label in schedule_types:
+            q = cls.build_q(label, filters)
+            if q is None:
+                continue
+            querysets.append(
+                cls.SCHEDULE_MODELS[label].objects.filter(q)
+                .annotate(schedule_type=Value(label, output_field=CharField()))
+                .values('id', 'scheduled_date', 'schedule_type')
+                .order_by()
+            )
+
+        if not querysets:
+            return MaintenanceSchedule.objects.none().values('id', 'scheduled_date')
+
+        combined = querysets[0]
+        if len(querysets) > 1:
+            combined = combined.union(*querysets[1:], all=True)
+        return combined.order_by('-scheduled_date', 'id')
+
+    @classmethod
+    def load_schedules(cls, rows):
+        """
+        Load the schedule instances for a page of rows from filter_schedules, one query
+        per schedule type, and return them in row order.
+        """
+        ids_by_type = {}
+        for row in rows:
+            ids_by_type.setdefault(row['schedule_type'], []).append(row['id'])
+
+        instances = {
+            label: cls.SCHEDULE_MODELS[label].objects.in_bulk(ids)
+            for label, ids in ids_by_type.items()
+        }
+        return [
+            instances[row['schedule_type']][row['id']]
+            for row in rows
+            if row['id'] in instances[row['schedule_type']]
+        ]
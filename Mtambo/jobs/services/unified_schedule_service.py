@@ -0,0 +1,165 @@
+from django.db import transaction
+from django.db.models import Subquery
+from django.utils import timezone
+import logging
+
+from buildings.models import Building
+from elevators.models import Elevator
+from jobs.models import (
+    MaintenanceSchedule, AdHocMaintenanceSchedule, BuildingLevelAdhocSchedule, UnifiedSchedule
+)
+
+logger = logging.getLogger(__name__)
+
+
+class UnifiedScheduleService:
+    """
+    Writes the UnifiedSchedule read model. Single saves and deletes reach it through
+    signals; code paths that bypass save() (queryset updates, bulk_create) call the
+    matching method here so the read model never drifts from the schedule tables.
+    """
+    SCHEDULE_TYPES = {
+        MaintenanceSchedule: 'regular',
+        AdHocMaintenanceSchedule: 'adhoc',
+        BuildingLevelAdhocSchedule: 'building_adhoc',
+    }
+
+    SYNCED_FIELDS = [
+        'elevator', 'building', 'developer', 'maintenance_company',
+        'technician', 'scheduled_date', 'status'
+    ]
+
+    @classmethod
+    def sync(cls, schedules):
+        """
+        Insert or refresh the unified rows for the given schedule instances.
+        Elevator and building details are resolved with one query each.
+        Returns the number of rows written.
+        """
+        schedules = [schedule for schedule in schedules if type(schedule) in cls.SCHEDULE_TYPES]
+        if not schedules:
+            return 0
+
+        elevator_ids = {schedule.elevator_id for schedule in schedules if hasattr(schedule, 'elevator_id')}
+        building_ids = {schedule.building_id for schedule in schedules if hasattr(schedule, 'building_id')}
+
+        elevators = {
+            elevator_id: (building_id, developer_id)
+            for elevator_id, building_id, developer_id in Elevator.objects.filter(
+                id__in=elevator_ids
+            ).values_list('id', 'building_id', 'building__developer_id')
+        } if elevator_ids else {}
+        buildings = dict(
+            Building.objects.filter(id__in=building_ids).values_list('id', 'developer_id')
+        ) if building_ids else {}
+
+        rows = []
+        for schedule in schedules:
+            if hasattr(schedule, 'elevator_id'):
+                if schedule.elevator_id not in elevators:
+                    continue
+                elevator_id = schedule.elevator_id
+                building_id, developer_id = elevators[elevator_id]
+            else:
+                if schedule.building_id not in buildings:
+                    continue
+                elevator_id = None
+                building_id, developer_id = schedule.building_id, buildings[schedule.building_id]
+
+            rows.append(UnifiedSchedule(
+                schedule_type=cls.SCHEDULE_TYPES[type(schedule)],
+                schedule_id=schedule.id,
+                elevator_id=elevator_id,
+                building_id=building_id,
+                developer_id=developer_id,
+                maintenance_company_id=schedule.maintenance_company_id,
+                technician_id=schedule.technician_id,
+                scheduled_date=schedule.scheduled_date,
+                status=schedule.status,
+            ))
+
+        UnifiedSchedule.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['schedule_type', 'schedule_id'],
+            update_fields=cls.SYNCED_FIELDS,
+        )
+        return len(rows)
+
+    @classmethod
+    def remove(cls, schedules):
+        """Delete the unified rows of the given schedule instances."""
+        for model, schedule_type in cls.SCHEDULE_TYPES.items():
+            ids = [schedule.id for schedule in schedules if type(schedule) is model]
+            if ids:
+                UnifiedSchedule.objects.filter(schedule_type=schedule_type, schedule_id__in=ids).delete()
+
+    @classmethod
+    def for_queryset(cls, queryset):
+        """
+        Return the unified rows matching a schedule queryset, for mirroring a
+        queryset.update() onto the read model with a single UPDATE.
+        """
+        return UnifiedSchedule.objects.filter(
+            schedule_type=cls.SCHEDULE_TYPES[queryset.model],
+            schedule_id__in=queryset.values('id'),
+        )
+
+    @classmethod
+    def load_schedules(cls, rows):
+        """
+        Load the schedules behind a page of unified rows, one query per schedule type,
+        and return them in row order, annotated with their effective_status.
+        """
+        from jobs.services.overdue_service import OverdueSweepService
+
+        models = {schedule_type: model for model, schedule_type in cls.SCHEDULE_TYPES.items()}
+        ids_by_type = {}
+        for row in rows:
+            ids_by_type.setdefault(row.schedule_type, []).append(row.schedule_id)
+
+        now = timezone.now()
+        instances = {
+            schedule_type: OverdueSweepService.annotate_effective_status(
+                models[schedule_type].objects.all(), now
+            ).in_bulk(ids)
+            for schedule_type, ids in ids_by_type.items()
+        }
+        return [
+            instances[row.schedule_type][row.schedule_id]
+            for row in rows
+            if row.schedule_id in instances[row.schedule_type]
+        ]
+
+    @classmethod
+    def sync_elevator(cls, elevator):
+        """Move an elevator's unified rows along when the elevator changes building."""
+        UnifiedSchedule.objects.filter(elevator=elevator).exclude(
+            building_id=elevator.building_id
+        ).update(
+            building_id=elevator.building_id,
+            developer_id=Subquery(
+                Building.objects.filter(id=elevator.building_id).values('developer_id')[:1]
+            ),
+        )
+
+    @classmethod
+    def rebuild(cls, batch_size=1000):
+        """
+        Recreate the whole read model from the schedule tables.
+        Returns the number of rows written.
+        """
+        total = 0
+        with transaction.atomic():
+            UnifiedSchedule.objects.all().delete()
+            for model in cls.SCHEDULE_TYPES:
+                batch = []
+                for schedule in model.objects.all().order_by().iterator(chunk_size=batch_size):
+                    batch.append(schedule)
+                    if len(batch) >= batch_size:
+                        total += cls.sync(batch)
+                        batch = []
+                total += cls.sync(batch)
+
+        logger.info(f"Rebuilt unified schedule read model with {total} rows")
+        return total
@@ -0,0 +1,140 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from elevators.models import ElevatorIssueLog
+from jobs.factories import (
+    ElevatorConditionReportFactory,
+    ElevatorFactory,
+    MaintenanceCompanyProfileFactory,
+    MaintenanceScheduleFactory,
+    ScheduledMaintenanceLogFactory,
+)
+from jobs.models import ElevatorHealthSnapshot
+from jobs.services.health_service import ElevatorHealthService
+from jobs.tasks import refresh_elevator_health
+
+CHECKLIST_FIELDS = ElevatorHealthService.CHECKLIST_FIELDS
+
+
+class ElevatorHealthServiceTest(TestCase):
+    def setUp(self):
+        self.company = MaintenanceCompanyProfileFactory()
+
+    def elevator(self):
+        return ElevatorFactory(maintenance_company=self.company)
+
+    def maintain(self, elevator, passed=7, alarm_bell="Functional", cabin_lights="All Working", days_ago=10):
+        schedule = MaintenanceScheduleFactory(
+            elevator=elevator,
+            maintenance_company=self.company,
+            scheduled_date=timezone.now() + timezone.timedelta(days=1),
+            next_schedule='set_date',
+            status='scheduled',
+        )
+        when = timezone.now() - timezone.timedelta(days=days_ago)
+        report = ElevatorConditionReportFactory(
+            maintenance_schedule=schedule,
+            date_inspected=when,
+            alarm_bell=alarm_bell,
+            noise_during_motion="Silent",
+            cabin_lights=cabin_lights,
+        )
+        ScheduledMaintenanceLogFactory(
+            maintenance_schedule=schedule,
+            condition_report=report,
+            date_completed=when,
+            **{field: index < passed for index, field in enumerate(CHECKLIST_FIELDS)},
+        )
+
+    def report_issue(self, elevator, days_ago):
+        issue = ElevatorIssueLog.objects.create(
+            elevator=elevator, building=elevator.building, issue_description="Stuck between floors"
+        )
+        ElevatorIssueLog.objects.filter(id=issue.id).update(
+            reported_date=timezone.now() - timezone.timedelta(days=days_ago)
+        )
+
+    def test_scores_reflect_checklists_conditions_and_issues(self):
+        healthy = self.elevator()
+        self.maintain(healthy)
+
+        worn = self.elevator()
+        self.maintain(worn, passed=5, alarm_bell="intermittent", cabin_lights="Complete Failure")
+        self.report_issue(worn, days_ago=3)
+        self.report_issue(worn, days_ago=90)
+        self.report_issue(worn, days_ago=400)  # outside the window
+
+        unmaintained = self.elevator()
+
+        self.assertEqual(refresh_elevator_health(), 3)
+
+        snapshots = {snapshot.elevator_id: snapshot for snapshot in ElevatorHealthSnapshot.objects.all()}
+        self.assertEqual(snapshots[healthy.id].score, 100)
+        self.assertEqual(snapshots[healthy.id].checklist_pass_rate, 1.0)
+        self.assertEqual(snapshots[healthy.id].condition_fault_rate, 0.0)
+
+        worn_snapshot = snapshots[worn.id]
+        self.assertEqual((worn_snapshot.issues, worn_snapshot.recent_issues), (2, 1))
+        self.assertAlmostEqual(worn_snapshot.condition_fault_rate, 2 / 3)
+        # 100 - 40 * 2/7 - 30 * 2/3 - 30 * 3/5
+        self.assertEqual(worn_snapshot.score, 51)
+
+        self.assertIsNone(snapshots[unmaintained.id].checklist_pass_rate)
+        self.assertEqual(snapshots[unmaintained.id].score, 80)
+        self.assertEqual(worn_snapshot.maintenance_company, self.company)
+        self.assertEqual(worn_snapshot.trend, 'new')
+
+    def test_trend_compares_with_previous_run(self):
+        elevator = self.elevator()
+        self.maintain(elevator)
+        ElevatorHealthService.refresh()
+
+        for days_ago in (1, 2, 3):
+            self.report_issue(elevator, days_ago)
+        ElevatorHealthService.refresh()
+
+        snapshot = ElevatorHealthSnapshot.objects.get(elevator=elevator)
+        self.assertEqual(ElevatorHealthSnapshot.objects.count(), 1)
+        self.assertEqual(snapshot.previous_score, 100)
+        self.assertEqual(snapshot.score, 70)
+        self.assertEqual(snapshot.trend, 'declining')
+
+    def test_refresh_queries_do_not_grow_with_fleet(self):
+        def refresh_queries():
+            with CaptureQueriesContext(connection) as queries:
+                ElevatorHealthService.refresh()
+            return len(queries)
+
+        self.maintain(self.elevator())
+        few = refresh_queries()
+        for _ in range(15):
+            elevator = self.elevator()
+            self.maintain(elevator, passed=3)
+            self.report_issue(elevator, days_ago=5)
+        self.assertEqual(refresh_queries(), few)
+
+
+class MaintenanceCompanyElevatorHealthViewTest(TestCase):
+    def test_lists_company_elevators_most_at_risk_first(self):
+        company = MaintenanceCompanyProfileFactory()
+        elevators = [ElevatorFactory(maintenance_company=company) for _ in range(3)]
+        ElevatorFactory()  # another company's elevator
+        for elevator, score in zip(elevators, (90, 20, 55)):
+            ElevatorHealthSnapshot.objects.create(
+                elevator=elevator, building=elevator.building, maintenance_company=company,
+                score=score, computed_at=timezone.now(),
+            )
+
+        url = reverse("maintenance-company-elevator-health", kwargs={"company_id": company.id})
+        first = APIClient().get(url, {"page_size": 2})
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["score"] for row in first.data["results"]], [20, 55])
+        self.assertEqual(first.data["results"][0]["machine_number"], elevators[1].machine_number)
+        second = APIClient().get(first.data["next"])
+        self.assertEqual([row["score"] for row in second.data["results"]], [90])
@@ -0,0 +1,180 @@
+from django.db import IntegrityError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from jobs.factories import (
+    AdHocElevatorConditionReportFactory,
+    AdHocMaintenanceLogFactory,
+    AdHocMaintenanceScheduleFactory,
+    ElevatorConditionReportFactory,
+    ElevatorFactory,
+    MaintenanceCompanyProfileFactory,
+    MaintenanceScheduleFactory,
+    ScheduledMaintenanceLogFactory,
+    TechnicianProfileFactory,
+)
+from jobs.models import ElevatorHistoryEntry
+
+
+class ElevatorHistoryTimelineTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.elevator = ElevatorFactory()
+        self.technician = TechnicianProfileFactory()
+        self.company = MaintenanceCompanyProfileFactory()
+
+    def file_regular_log(self, days_ago, **log_fields):
+        schedule = MaintenanceScheduleFactory(
+            elevator=self.elevator,
+            technician=self.technician,
+            maintenance_company=self.company,
+            scheduled_date=timezone.now() + timezone.timedelta(days=1),
+            next_schedule='set_date',
+            status='scheduled',
+        )
+        report = ElevatorConditionReportFactory(maintenance_schedule=schedule, technician=self.technician)
+        return ScheduledMaintenanceLogFactory(
+            maintenance_schedule=schedule,
+            technician=self.technician,
+            condition_report=report,
+            date_completed=timezone.now() - timezone.timedelta(days=days_ago),
+            **log_fields,
+        )
+
+    def file_adhoc_log(self, days_ago):
+        schedule = AdHocMaintenanceScheduleFactory(
+            elevator=self.elevator, technician=self.technician, maintenance_company=self.company
+        )
+        report = AdHocElevatorConditionReportFactory(
+            ad_hoc_schedule=schedule, technician=self.technician, condition="Door sensor   intermittent"
+        )
+        return AdHocMaintenanceLogFactory(
+            ad_hoc_schedule=schedule,
+            technician=self.technician,
+            condition_report=report,
+            summary_title="Door sensor replaced",
+            date_completed=timezone.now() - timezone.timedelta(days=days_ago),
+        )
+
+    def timeline_url(self):
+        return reverse("elevator-history-timeline", kwargs={"elevator_id": self.elevator.id})
+
+    def test_filing_a_log_appends_a_summary_entry(self):
+        log = self.file_regular_log(
+            1,
+            check_machine_gear=True, check_machine_brake=False, check_controller_connections=True,
+            blow_dust_from_controller=True, clean_machine_room=True, clean_guide_rails=True,
+            observe_operation=False, description="Quarterly service",
+        )
+        adhoc_log = self.file_adhoc_log(0)
+
+        regular = ElevatorHistoryEntry.objects.get(log_id=log.id)
+        self.assertEqual(regular.elevator, self.elevator)
+        self.assertEqual(regular.schedule_type, 'regular')
+        self.assertEqual(regular.title, "Quarterly service")
+        self.assertEqual(regular.issue_snippet, log.condition_report.additional_comments)
+        self.assertEqual(regular.checklist, 0b0111101)
+
+        adhoc = ElevatorHistoryEntry.objects.get(log_id=adhoc_log.id)
+        self.assertEqual(adhoc.schedule_type, 'adhoc')
+        self.assertEqual(adhoc.title, "Door sensor replaced")
+        self.assertEqual(adhoc.issue_snippet, "Door sensor intermittent")
+        self.assertEqual(adhoc.checklist_size, 0)
+
+    def test_entries_are_append_only(self):
+        entry = ElevatorHistoryEntry.objects.get(log_id=self.file_adhoc_log(0).id)
+        entry.title = "Edited"
+        with self.assertRaises(IntegrityError):
+            entry.save()
+
+    def test_filing_through_the_endpoint_records_history(self):
+        schedule = MaintenanceScheduleFactory(
+            elevator=self.elevator,
+            technician=self.technician,
+            maintenance_company=self.company,
+            scheduled_date=timezone.now() + timezone.timedelta(days=1),
+            status='scheduled',
+        )
+        checklist = {field: True for field in [
+            'check_machine_gear', 'check_machine_brake', 'check_controller_connections',
+            'blow_dust_from_controller', 'clean_machine_room', 'clean_guide_rails', 'observe_operation',
+        ]}
+        response = self.client.post(
+            reverse("file-maintenance-log", kwargs={"schedule_id": schedule.id}),
+            {
+                "schedule_type": "regular",
+                "condition_report": {"alarm_bell": "Functional", "additional_comments": "Worn rope"},
+                "maintenance_log": checklist,
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        entry = ElevatorHistoryEntry.objects.get(schedule_id=schedule.id)
+        self.assertEqual(entry.checklist, 0b1111111)
+        self.assertEqual(entry.issue_snippet, "Worn rope")
+
+    def test_timeline_is_paged_most_recent_first(self):
+        logs = [self.file_regular_log(days_ago) for days_ago in (3, 1, 2)]
+        logs.append(self.file_adhoc_log(0))
+
+        first = self.client.get(self.timeline_url(), {"page_size": 3})
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row["log_id"] for row in first.data["results"]],
+            [str(logs[3].id), str(logs[1].id), str(logs[2].id)],
+        )
+        self.assertEqual(len(first.data["results"][1]["checklist"]), 7)
+
+        second = self.client.get(first.data["next"])
+        self.assertEqual([row["log_id"] for row in second.data["results"]], [str(logs[0].id)])
+        self.assertIsNone(second.data["next"])
+
+    def test_timeline_queries_do_not_grow_with_entries(self):
+        def timeline_queries():
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(self.timeline_url(), {"page_size": 50})
+            return len(queries)
+
+        self.file_regular_log(1)
+        few = timeline_queries()
+        for days_ago in range(2, 12):
+            self.file_regular_log(days_ago)
+        self.assertEqual(timeline_queries(), few)
+
+    def test_entry_detail_loads_the_full_log(self):
+        log = self.file_adhoc_log(0)
+        entry = ElevatorHistoryEntry.objects.get(log_id=log.id)
+
+        response = self.client.get(reverse(
+            "elevator-history-entry", kwargs={"elevator_id": self.elevator.id, "entry_id": entry.id}
+        ))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["maintenance_log"]["id"], str(log.id))
+        self.assertEqual(response.data["condition_report"]["condition"], "Door sensor   intermittent")
+
+    def test_entry_outlives_its_deleted_schedule(self):
+        log = self.file_regular_log(0, description="Brake pads replaced")
+        entry = ElevatorHistoryEntry.objects.get(log_id=log.id)
+
+        response = self.client.delete(reverse(
+            "maintenance-schedule-delete", kwargs={"schedule_id": log.maintenance_schedule_id}
+        ))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        entry.refresh_from_db()
+        self.assertIsNone(entry.regular_log_id)
+        timeline = self.client.get(self.timeline_url())
+        self.assertEqual([row["id"] for row in timeline.data["results"]], [str(entry.id)])
+
+        response = self.client.get(reverse(
+            "elevator-history-entry", kwargs={"elevator_id": self.elevator.id, "entry_id": entry.id}
+        ))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data["title"], "Brake pads replaced")
+        self.assertEqual(response.data["log_id"], str(log.id))
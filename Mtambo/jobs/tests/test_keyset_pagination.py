@@ -0,0 +1,129 @@
+import base64
+import json
+from datetime import timedelta
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from jobs.models import UnifiedSchedule
+from jobs.factories import (
+    ElevatorFactory,
+    MaintenanceScheduleFactory,
+    AdHocMaintenanceScheduleFactory,
+    BuildingLevelAdhocScheduleFactory,
+)
+
+
+def schedule_id(row):
+    # Building-level schedules serialize flat, the others nest under 'maintenance_schedule'
+    return row['maintenance_schedule']['id'] if 'maintenance_schedule' in row else row['id']
+
+
+class ScheduleKeysetPaginationTest(APITestCase):
+    def setUp(self):
+        self.elevator = ElevatorFactory()
+        self.technician = self.elevator.technician
+        now = timezone.now()
+        self.schedules = [
+            MaintenanceScheduleFactory(
+                elevator=self.elevator, technician=self.technician, status='scheduled',
+                next_schedule='set_date', scheduled_date=now + timedelta(days=10 + offset)
+            )
+            for offset in range(3)
+        ]
+        # Two schedules on the same date, so the id tie-breaker decides their order
+        same_date = now + timedelta(days=20)
+        self.schedules += [
+            AdHocMaintenanceScheduleFactory(
+                elevator=self.elevator, technician=self.technician, status='scheduled', scheduled_date=same_date
+            ),
+            BuildingLevelAdhocScheduleFactory(
+                building=self.elevator.building, technician=self.technician, status='scheduled',
+                scheduled_date=same_date
+            ),
+        ]
+        MaintenanceScheduleFactory(status='scheduled', scheduled_date=now + timedelta(days=5))
+
+    def collect_pages(self, url, params):
+        ids, pages = [], 0
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages += 1
+            ids += [schedule_id(row) for row in response.data['results']]
+            if not response.data['next']:
+                return ids, pages
+            response = self.client.get(response.data['next'])
+
+    def expected_ids(self):
+        # Newest first, ties broken by the unified row id
+        rows = UnifiedSchedule.objects.filter(
+            schedule_id__in=[schedule.id for schedule in self.schedules]
+        ).order_by('-scheduled_date', 'id')
+        return [str(row.schedule_id) for row in rows]
+
+    def test_technician_schedules_are_paged_in_a_stable_order(self):
+        url = reverse('technician-maintenance-schedules', args=[self.technician.id])
+
+        ids, pages = self.collect_pages(url, {'page_size': 2})
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(ids, self.expected_ids())
+
+    def test_new_schedules_do_not_shift_later_pages(self):
+        url = reverse('technician-maintenance-schedules', args=[self.technician.id])
+        first = self.client.get(url, {'page_size': 2})
+
+        # A schedule newer than everything already served lands before the cursor
+        MaintenanceScheduleFactory(
+            elevator=self.elevator, technician=self.technician, status='scheduled',
+            scheduled_date=timezone.now() + timedelta(days=60)
+        )
+        second = self.client.get(first.data['next'])
+
+        served = [schedule_id(row) for row in first.data['results'] + second.data['results']]
+        self.assertEqual(served, self.expected_ids()[:4])
+
+    def test_list_view_filters_every_schedule_type(self):
+        url = reverse('maintenance-schedule-list')
+
+        ids, _ = self.collect_pages(url, {'building_id': str(self.elevator.building_id), 'page_size': 10})
+
+        self.assertEqual(ids, self.expected_ids())
+
+    def test_company_and_developer_views_page_from_the_read_model(self):
+        company_url = reverse('maintenance-company-schedules', args=[self.schedules[0].maintenance_company_id])
+        response = self.client.get(company_url, {'page_size': 10})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [schedule_id(row) for row in response.data['results']], [str(self.schedules[0].id)]
+        )
+
+        developer_url = reverse('developer-maintenance-schedules', args=[self.elevator.building.developer_id])
+        ids, _ = self.collect_pages(developer_url, {'page_size': 10})
+        self.assertEqual(ids, self.expected_ids())
+
+    def test_invalid_cursor_returns_404(self):
+        url = reverse('technician-maintenance-schedules', args=[self.technician.id])
+
+        response = self.client.get(url, {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_wrong_typed_values_returns_404(self):
+        url = reverse('technician-maintenance-schedules', args=[self.technician.id])
+
+        for values in (["abc", "def"], [1, 2], [None, None]):
+            with self.subTest(values=values):
+                cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+                response = self.client.get(url, {'cursor': cursor})
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_legacy_response_without_pagination_params(self):
+        url = reverse('technician-maintenance-schedules', args=[self.technician.id])
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('next', response.data)
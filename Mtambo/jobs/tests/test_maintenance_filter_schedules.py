@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -231,3 +233,60 @@ class MaintenanceScheduleFilterViewTests(TestCase):
         url = reverse('maintenance-schedule-filter')
         self.assertEqual(url, '/api/jobs/maintenance-schedules/filter/')
 
+
+    def test_combined_filter_returns_all_types_ordered_and_paginated(self):
+        """Test filtering across every schedule type without a schedule_type"""
+        response = self.client.put(
+            self.url,
+            {'technician_id': str(self.technician.id)},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(len(response.data['results']), 3)
+
+        response = self.client.put(
+            self.url + '?page_size=2',
+            {'technician_id': str(self.technician.id)},
+            format='json'
+        )
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_combined_filter_excludes_types_a_filter_cannot_apply_to(self):
+        """Test next_schedule and elevator filters only match elevator-level schedules"""
+        response = self.client.put(self.url, {'next_schedule': '1_month'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(
+            response.data['results'][0]['maintenance_schedule']['id'], str(self.regular_schedule.id)
+        )
+
+        response = self.client.put(self.url, {'building_id': str(self.building.id)}, format='json')
+        self.assertEqual(response.data['count'], 3)
+
+    def test_combined_filter_query_count_does_not_grow(self):
+        """Test filtering costs a bounded number of queries regardless of matches"""
+        def count_queries():
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.put(
+                    self.url, {'maintenance_company_id': str(self.maintenance_company.id)}, format='json'
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(context.captured_queries)
+
+        baseline = count_queries()
+        for _ in range(3):
+            MaintenanceScheduleFactory(
+                elevator=ElevatorFactory(building=self.building),
+                maintenance_company=self.maintenance_company,
+                status='scheduled',
+                scheduled_date=datetime.now() + timedelta(days=7)
+            )
+        self.assertEqual(count_queries(), baseline)
+
+    def test_unknown_technician_returns_not_found(self):
+        """Test response for a technician that does not exist"""
+        response = self.client.put(self.url, {'technician_id': str(uuid4())}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -1,10 +1,13 @@
 import json
+from unittest.mock import patch
 from uuid import uuid4
 from django.test import TestCase
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.urls import reverse
 from django.utils import timezone
+from alerts.models import AlertType
+from alerts.services import AlertService
 from jobs.factories import (
     MaintenanceScheduleFactory,
     AdHocMaintenanceScheduleFactory,
@@ -131,3 +134,19 @@ class FileMaintenanceLogViewTestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(response.data['detail'], "No maintenance company assigned.")
 
+
+    def test_failed_alert_does_not_drop_the_other(self):
+        build_alert = AlertService.build_alert
+
+        def failing_build_alert(alert_type, recipient, related_object, message=None):
+            if alert_type == AlertType.LOG_ADDED:
+                raise ValueError("Recipient is required")
+            return build_alert(alert_type, recipient, related_object, message)
+
+        with patch.object(AlertService, 'build_alert', side_effect=failing_build_alert), \
+                patch.object(AlertService, 'enqueue_alerts') as enqueue_alerts:
+            response = self.client.post(self.get_url(self.regular_schedule.id), data=self.valid_regular_data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        alerts = enqueue_alerts.call_args.args[0]
+        self.assertEqual([alert['alert_type'] for alert in alerts], [AlertType.MAINTENANCE_APPROVAL_NEEDED])
@@ -0,0 +1,139 @@
+from datetime import datetime
+from django.test import TestCase
+from django.utils import timezone
+from freezegun import freeze_time
+
+from jobs.models import (
+    MaintenanceSchedule, AdHocMaintenanceSchedule, BuildingLevelAdhocSchedule, ScheduleSweepWatermark
+)
+from jobs.services.overdue_service import OverdueSweepService
+from jobs.tasks import check_overdue_schedules
+from jobs.factories import (
+    ElevatorFactory,
+    MaintenanceScheduleFactory,
+    AdHocMaintenanceScheduleFactory,
+    BuildingLevelAdhocScheduleFactory,
+)
+
+
+def aware(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+@freeze_time("2025-03-12 10:00:00")
+class CheckOverdueSchedulesTaskTest(TestCase):
+    def setUp(self):
+        self.elevator = ElevatorFactory()
+        future = aware(2025, 3, 20, 9, 0)
+
+        self.recurring = MaintenanceScheduleFactory(
+            elevator=self.elevator, status='scheduled', next_schedule='1_month', scheduled_date=future
+        )
+        self.one_off = MaintenanceScheduleFactory(
+            status='scheduled', next_schedule='set_date', scheduled_date=future
+        )
+        self.due_today = MaintenanceScheduleFactory(
+            status='scheduled', next_schedule='1_month', scheduled_date=future
+        )
+        self.adhoc = AdHocMaintenanceScheduleFactory(status='scheduled', scheduled_date=future)
+        self.building_adhoc = BuildingLevelAdhocScheduleFactory(status='scheduled', scheduled_date=future)
+
+        # Move the rows into the past without going through save() and its signals
+        past = aware(2025, 3, 10, 9, 0)
+        MaintenanceSchedule.objects.filter(id__in=[self.recurring.id, self.one_off.id]).update(scheduled_date=past)
+        MaintenanceSchedule.objects.filter(id=self.due_today.id).update(scheduled_date=aware(2025, 3, 12, 8, 0))
+        AdHocMaintenanceSchedule.objects.filter(id=self.adhoc.id).update(scheduled_date=past)
+        BuildingLevelAdhocSchedule.objects.filter(id=self.building_adhoc.id).update(scheduled_date=past)
+
+    def test_marks_schedules_whose_day_has_ended_as_overdue(self):
+        counts = check_overdue_schedules()
+
+        self.assertEqual(counts['regular'], 2)
+        self.assertEqual(counts['adhoc'], 1)
+        self.assertEqual(counts['building_adhoc'], 1)
+
+        self.recurring.refresh_from_db()
+        self.one_off.refresh_from_db()
+        self.due_today.refresh_from_db()
+        self.adhoc.refresh_from_db()
+        self.building_adhoc.refresh_from_db()
+
+        self.assertEqual(self.recurring.status, 'overdue')
+        self.assertEqual(self.one_off.status, 'overdue')
+        self.assertEqual(self.due_today.status, 'scheduled')
+        self.assertEqual(self.adhoc.status, 'overdue')
+        self.assertEqual(self.building_adhoc.status, 'overdue')
+
+    def test_creates_follow_up_only_for_recurring_schedules(self):
+        counts = check_overdue_schedules()
+
+        self.assertEqual(counts['next_schedules'], 1)
+        follow_up = MaintenanceSchedule.objects.get(elevator=self.elevator, status='scheduled')
+        self.assertEqual(follow_up.scheduled_date, aware(2025, 4, 10, 9, 0))
+        self.assertEqual(follow_up.next_schedule, '1_month')
+        self.assertEqual(follow_up.technician_id, self.recurring.technician_id)
+        self.assertFalse(
+            MaintenanceSchedule.objects.filter(elevator=self.one_off.elevator, status='scheduled').exists()
+        )
+
+    def test_second_run_is_a_no_op(self):
+        check_overdue_schedules()
+        counts = check_overdue_schedules()
+
+        self.assertEqual(counts, {'regular': 0, 'next_schedules': 0, 'adhoc': 0, 'building_adhoc': 0})
+        self.assertEqual(MaintenanceSchedule.objects.filter(elevator=self.elevator).count(), 2)
+
+    def test_follow_up_is_not_duplicated_when_it_already_exists(self):
+        MaintenanceScheduleFactory(
+            elevator=self.elevator, status='scheduled', next_schedule='1_month',
+            scheduled_date=aware(2025, 4, 10, 9, 0)
+        )
+
+        counts = check_overdue_schedules()
+
+        self.assertEqual(counts['next_schedules'], 0)
+        self.assertEqual(MaintenanceSchedule.objects.filter(elevator=self.elevator).count(), 2)
+
+    def test_watermark_records_processed_day_boundary(self):
+        check_overdue_schedules()
+
+        watermark = ScheduleSweepWatermark.objects.get(name=OverdueSweepService.WATERMARK_NAME)
+        self.assertEqual(watermark.processed_until, aware(2025, 3, 12))
+
+    def test_same_day_rerun_skips_schedule_tables(self):
+        check_overdue_schedules()
+
+        with self.assertNumQueries(3):
+            check_overdue_schedules()
+
+    def test_next_day_run_only_processes_schedules_since_watermark(self):
+        check_overdue_schedules()
+
+        # A back-dated schedule behind the watermark is left for the reconciliation run
+        late = MaintenanceScheduleFactory(
+            status='scheduled', next_schedule='set_date', scheduled_date=aware(2025, 3, 20, 9, 0)
+        )
+        MaintenanceSchedule.objects.filter(id=late.id).update(scheduled_date=aware(2025, 3, 5, 9, 0))
+
+        with freeze_time("2025-03-13 10:00:00"):
+            counts = check_overdue_schedules()
+
+        self.assertEqual(counts['regular'], 1)
+        self.due_today.refresh_from_db()
+        late.refresh_from_db()
+        self.assertEqual(self.due_today.status, 'overdue')
+        self.assertEqual(late.status, 'scheduled')
+
+    def test_full_scan_ignores_watermark(self):
+        check_overdue_schedules()
+
+        late = MaintenanceScheduleFactory(
+            status='scheduled', next_schedule='set_date', scheduled_date=aware(2025, 3, 20, 9, 0)
+        )
+        MaintenanceSchedule.objects.filter(id=late.id).update(scheduled_date=aware(2025, 3, 5, 9, 0))
+
+        counts = check_overdue_schedules(full_scan=True)
+
+        self.assertEqual(counts['regular'], 1)
+        late.refresh_from_db()
+        self.assertEqual(late.status, 'overdue')
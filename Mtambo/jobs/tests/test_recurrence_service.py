@@ -0,0 +1,167 @@
+from datetime import datetime
+from unittest import mock
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.utils import timezone
+from freezegun import freeze_time
+
+from jobs.models import MaintenanceSchedule, UnifiedSchedule
+from jobs.services.recurrence_service import RecurrenceService
+from jobs.tasks import materialize_schedule_horizon
+from jobs.factories import ElevatorFactory, MaintenanceScheduleFactory
+
+
+def aware(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+@freeze_time("2025-03-01 10:00:00")
+class RecurrenceServiceTest(TestCase):
+    def test_next_date_moves_weekends_to_monday(self):
+        # 2025-04-05 is a Saturday, 2025-04-06 a Sunday
+        self.assertEqual(
+            RecurrenceService.get_next_date(aware(2025, 3, 5, 9, 0), '1_month'), aware(2025, 4, 7, 9, 0)
+        )
+        self.assertEqual(
+            RecurrenceService.get_next_date(aware(2025, 3, 6, 9, 0), '1_month'), aware(2025, 4, 7, 9, 0)
+        )
+        self.assertEqual(
+            RecurrenceService.get_next_date(aware(2025, 3, 10, 9, 0), '3_months'), aware(2025, 6, 10, 9, 0)
+        )
+        self.assertIsNone(RecurrenceService.get_next_date(aware(2025, 3, 10, 9, 0), 'set_date'))
+
+    def test_batch_is_created_with_a_fixed_number_of_queries(self):
+        schedules = [
+            MaintenanceScheduleFactory(
+                elevator=ElevatorFactory(), next_schedule='1_month', scheduled_date=aware(2025, 3, 10, 9, 0)
+            )
+            for _ in range(5)
+        ]
+
+        # Existing follow-ups, the bulk insert and its re-read, then the unified read model lookup and upsert
+        with self.assertNumQueries(5):
+            next_schedules, created = RecurrenceService.create_next_schedules(schedules)
+
+        self.assertEqual(len(created), 5)
+        self.assertEqual(set(next_schedules), {schedule.id for schedule in schedules})
+        self.assertEqual(
+            MaintenanceSchedule.objects.filter(scheduled_date=aware(2025, 4, 10, 9, 0)).count(), 5
+        )
+
+    def test_follow_up_inserted_concurrently_is_not_reported_as_created(self):
+        elevator = ElevatorFactory()
+        source = MaintenanceScheduleFactory(
+            elevator=elevator, next_schedule='1_month', scheduled_date=aware(2025, 3, 10, 9, 0)
+        )
+        bulk_create = QuerySet.bulk_create
+        competitor = {}
+
+        def race(queryset, objs, *args, **kwargs):
+            # Another worker inserts the same follow-up between our lookup and our insert
+            if not competitor and queryset.model is MaintenanceSchedule:
+                competitor['schedule'] = None
+                competitor['schedule'] = MaintenanceScheduleFactory(
+                    elevator=elevator, next_schedule='1_month', scheduled_date=aware(2025, 4, 10, 9, 0)
+                )
+            return bulk_create(queryset, objs, *args, **kwargs)
+
+        with mock.patch.object(QuerySet, 'bulk_create', race):
+            next_schedules, created = RecurrenceService.create_next_schedules([source])
+
+        self.assertEqual(created, [])
+        self.assertEqual(next_schedules[source.id].id, competitor['schedule'].id)
+        self.assertEqual(MaintenanceSchedule.objects.filter(elevator=elevator).count(), 2)
+        self.assertEqual(
+            set(UnifiedSchedule.objects.filter(elevator=elevator).values_list('schedule_id', flat=True)),
+            {source.id, competitor['schedule'].id},
+        )
+
+    def test_existing_follow_up_is_reused(self):
+        elevator = ElevatorFactory()
+        source = MaintenanceScheduleFactory(
+            elevator=elevator, next_schedule='3_months', scheduled_date=aware(2025, 3, 10, 9, 0)
+        )
+        existing = MaintenanceScheduleFactory(
+            elevator=elevator, next_schedule='3_months', scheduled_date=aware(2025, 6, 10, 9, 0)
+        )
+
+        next_schedules, created = RecurrenceService.create_next_schedules([source, source])
+
+        self.assertEqual(created, [])
+        self.assertEqual(next_schedules[source.id].id, existing.id)
+        self.assertEqual(MaintenanceSchedule.objects.filter(elevator=elevator).count(), 2)
+
+    def test_one_time_schedules_are_skipped(self):
+        source = MaintenanceScheduleFactory(next_schedule='set_date', scheduled_date=aware(2025, 3, 10, 9, 0))
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(RecurrenceService.create_next_schedule(source))
+
+    def test_follow_up_in_the_past_is_created_overdue(self):
+        source = MaintenanceScheduleFactory(next_schedule='1_month', scheduled_date=aware(2025, 3, 10, 9, 0))
+        MaintenanceSchedule.objects.filter(id=source.id).update(scheduled_date=aware(2025, 1, 10, 9, 0))
+        source.refresh_from_db()
+
+        follow_up = RecurrenceService.create_next_schedule(source)
+
+        self.assertEqual(follow_up.scheduled_date, aware(2025, 2, 10, 9, 0))
+        self.assertEqual(follow_up.status, 'overdue')
+
+
+@freeze_time("2025-03-01 10:00:00")
+class ScheduleHorizonTest(TestCase):
+    def setUp(self):
+        self.elevator = ElevatorFactory()
+        self.schedule = MaintenanceScheduleFactory(
+            elevator=self.elevator, next_schedule='1_month', scheduled_date=aware(2025, 3, 10, 9, 0)
+        )
+
+    def test_horizon_is_filled_up_to_the_requested_occurrences(self):
+        created = materialize_schedule_horizon(occurrences=3)
+
+        self.assertEqual(created, 2)
+        self.assertEqual(
+            list(
+                MaintenanceSchedule.objects.filter(elevator=self.elevator)
+                .order_by('scheduled_date').values_list('scheduled_date', flat=True)
+            ),
+            [aware(2025, 3, 10, 9, 0), aware(2025, 4, 10, 9, 0), aware(2025, 5, 12, 9, 0)]
+        )
+
+    def test_rerun_is_idempotent(self):
+        RecurrenceService.extend_horizon(occurrences=3)
+
+        self.assertEqual(RecurrenceService.extend_horizon(occurrences=3), 0)
+        self.assertEqual(MaintenanceSchedule.objects.filter(elevator=self.elevator).count(), 3)
+
+    def test_horizon_extends_incrementally_as_time_passes(self):
+        RecurrenceService.extend_horizon(occurrences=3)
+
+        with freeze_time("2025-03-11 10:00:00"):
+            created = RecurrenceService.extend_horizon(occurrences=3)
+
+        self.assertEqual(created, 1)
+        latest = MaintenanceSchedule.objects.filter(elevator=self.elevator).latest('scheduled_date')
+        self.assertEqual(latest.scheduled_date, aware(2025, 6, 12, 9, 0))
+
+    def test_completion_reuses_materialized_follow_up(self):
+        RecurrenceService.extend_horizon(occurrences=3)
+
+        follow_up = RecurrenceService.create_next_schedule(self.schedule)
+
+        self.assertEqual(follow_up.scheduled_date, aware(2025, 4, 10, 9, 0))
+        self.assertEqual(MaintenanceSchedule.objects.filter(elevator=self.elevator).count(), 3)
+
+    def test_stale_series_resumes_from_the_present(self):
+        MaintenanceSchedule.objects.filter(id=self.schedule.id).update(scheduled_date=aware(2024, 11, 4, 9, 0))
+
+        RecurrenceService.extend_horizon(occurrences=1)
+
+        upcoming = MaintenanceSchedule.objects.get(elevator=self.elevator, scheduled_date__gte=timezone.now())
+        # Chain: 2024-12-04, 2025-01-06 (moved off a Saturday), 2025-02-06, 2025-03-06
+        self.assertEqual(upcoming.scheduled_date, aware(2025, 3, 6, 9, 0))
+
+    def test_one_time_schedules_are_not_extended(self):
+        MaintenanceSchedule.objects.filter(id=self.schedule.id).update(next_schedule='set_date')
+
+        self.assertEqual(RecurrenceService.extend_horizon(occurrences=3), 0)
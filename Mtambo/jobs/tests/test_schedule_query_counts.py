@@ -0,0 +1,101 @@
+from datetime import timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from jobs.models import MaintenanceSchedule, AdHocMaintenanceSchedule, BuildingLevelAdhocSchedule
+from jobs.serializers import CompleteMaintenanceScheduleSerializer, BuildingLevelAdhocScheduleSerializer
+from jobs.factories import (
+    ElevatorFactory,
+    MaintenanceScheduleFactory,
+    ScheduledMaintenanceLogFactory,
+    AdHocMaintenanceScheduleFactory,
+    AdHocMaintenanceLogFactory,
+    BuildingLevelAdhocScheduleFactory,
+)
+
+
+class ScheduleSerializerQueryCountTest(APITestCase):
+    """
+    Listing schedules should cost the same number of queries whatever the list size.
+    """
+
+    def setUp(self):
+        self.elevator = ElevatorFactory()
+
+    def add_completed_schedules(self, count):
+        for offset in range(count):
+            schedule = MaintenanceScheduleFactory(
+                elevator=self.elevator, status='completed', next_schedule='set_date',
+                scheduled_date=timezone.now() + timedelta(days=30 + offset)
+            )
+            ScheduledMaintenanceLogFactory(
+                maintenance_schedule=schedule,
+                condition_report__maintenance_schedule=schedule,
+            )
+            adhoc = AdHocMaintenanceScheduleFactory(elevator=self.elevator, status='completed')
+            AdHocMaintenanceLogFactory(ad_hoc_schedule=adhoc, condition_report__ad_hoc_schedule=adhoc)
+
+    def test_queryset_serialization_uses_a_constant_number_of_queries(self):
+        self.add_completed_schedules(5)
+
+        # Schedules, then one query each for condition reports and maintenance logs
+        with self.assertNumQueries(3):
+            data = CompleteMaintenanceScheduleSerializer(
+                MaintenanceSchedule.objects.filter(elevator=self.elevator), many=True
+            ).data
+
+        self.assertEqual(len(data), 5)
+        schedule = data[0]['maintenance_schedule']
+        self.assertEqual(len(schedule['condition_report']), 1)
+        self.assertEqual(len(schedule['maintenance_log']), 1)
+        self.assertEqual(schedule['building']['id'], str(self.elevator.building.id))
+        self.assertIsNotNone(schedule['technician_full_name'])
+
+    def test_mixed_list_is_prefetched_per_model(self):
+        self.add_completed_schedules(2)
+        small = self.count_list_queries()
+
+        self.add_completed_schedules(6)
+        self.assertEqual(self.count_list_queries(), small)
+
+    def count_list_queries(self):
+        schedules = list(MaintenanceSchedule.objects.filter(elevator=self.elevator)) + list(
+            AdHocMaintenanceSchedule.objects.filter(elevator=self.elevator)
+        )
+        with CaptureQueriesContext(connection) as context:
+            CompleteMaintenanceScheduleSerializer(schedules, many=True).data
+        return len(context.captured_queries)
+
+    def test_building_adhoc_elevators_are_prefetched(self):
+        building = self.elevator.building
+        ElevatorFactory(building=building)
+        for _ in range(4):
+            BuildingLevelAdhocScheduleFactory(building=building)
+
+        # Schedules with building, developer, technician and user joined, then the elevators
+        with self.assertNumQueries(2):
+            data = BuildingLevelAdhocScheduleSerializer(
+                BuildingLevelAdhocSchedule.objects.filter(building=building), many=True
+            ).data
+
+        self.assertEqual(len(data), 4)
+        self.assertEqual(len(data[0]['elevators']), 2)
+
+    def test_history_view_query_count_does_not_grow_with_history(self):
+        url = reverse('elevator-maintenance-history', args=[self.elevator.id])
+
+        # Each schedule table with its joins, then its condition reports and maintenance logs
+        self.add_completed_schedules(2)
+        with self.assertNumQueries(6):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 4)
+
+        self.add_completed_schedules(6)
+        with self.assertNumQueries(6):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data), 16)
@@ -276,3 +276,25 @@ class TechnicianMaintenanceSchedulesViewTests(TestCase):
     
         self.assertIsNotNone(overdue_schedule, "Could not find any overdue schedule")
         self.assertEqual(overdue_schedule["status"], "overdue") 
+
+    @freeze_time("2023-12-01T10:00:01Z")
+    def test_get_does_not_write_overdue_schedules(self):
+        """Test that past-due schedules are reported as overdue without being updated."""
+        past_date = timezone.now() - timedelta(days=2)
+        MaintenanceSchedule.objects.filter(id=self.regular_schedule.id).update(scheduled_date=past_date)
+        AdHocMaintenanceSchedule.objects.filter(id=self.adhoc_schedule.id).update(scheduled_date=past_date)
+
+        url = reverse("technician-maintenance-schedules", args=[str(self.technician.id)])
+        with patch.object(MaintenanceSchedule, "save") as schedule_save:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        schedule_save.assert_not_called()
+        self.assertEqual(response.data["regular_schedules"][0]["maintenance_schedule"]["status"], "overdue")
+        self.assertEqual(response.data["adhoc_schedules"][0]["maintenance_schedule"]["status"], "overdue")
+        self.assertEqual(response.data["building_adhoc_schedules"][0]["status"], "scheduled")
+
+        # Stored rows are left for the overdue sweep, and no follow-up schedule was created
+        self.regular_schedule.refresh_from_db()
+        self.assertEqual(self.regular_schedule.status, "scheduled")
+        self.assertEqual(MaintenanceSchedule.objects.filter(elevator=self.elevator).count(), 1)
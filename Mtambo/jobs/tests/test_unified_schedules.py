@@ -0,0 +1,190 @@
+from datetime import datetime, timedelta
+from django.urls import reverse
+from django.utils import timezone
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from jobs.models import MaintenanceSchedule, AdHocMaintenanceSchedule, UnifiedSchedule
+from jobs.services.overdue_service import OverdueSweepService
+from jobs.services.unified_schedule_service import UnifiedScheduleService
+from jobs.factories import (
+    BuildingFactory,
+    ElevatorFactory,
+    MaintenanceScheduleFactory,
+    AdHocMaintenanceScheduleFactory,
+    BuildingLevelAdhocScheduleFactory,
+)
+
+
+def aware(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+@freeze_time("2025-03-12 10:00:00")
+class UnifiedScheduleSyncTest(APITestCase):
+    def setUp(self):
+        self.elevator = ElevatorFactory()
+        self.schedule = MaintenanceScheduleFactory(
+            elevator=self.elevator, status='scheduled', next_schedule='1_month',
+            scheduled_date=aware(2025, 3, 20, 9, 0)
+        )
+
+    def test_saved_schedules_of_every_type_are_mirrored(self):
+        AdHocMaintenanceScheduleFactory(elevator=self.elevator, status='scheduled')
+        BuildingLevelAdhocScheduleFactory(building=self.elevator.building, status='scheduled')
+
+        row = UnifiedSchedule.objects.get(schedule_type='regular', schedule_id=self.schedule.id)
+        self.assertEqual(row.elevator_id, self.elevator.id)
+        self.assertEqual(row.building_id, self.elevator.building_id)
+        self.assertEqual(row.developer_id, self.elevator.building.developer_id)
+        self.assertEqual(row.technician_id, self.schedule.technician_id)
+        self.assertEqual(row.status, 'scheduled')
+
+        building_row = UnifiedSchedule.objects.get(schedule_type='building_adhoc')
+        self.assertIsNone(building_row.elevator_id)
+        self.assertEqual(building_row.building_id, self.elevator.building_id)
+        self.assertEqual(UnifiedSchedule.objects.filter(schedule_type='adhoc').count(), 1)
+
+    def test_updates_and_deletes_are_mirrored(self):
+        self.schedule.status = 'completed'
+        self.schedule.save()
+        row = UnifiedSchedule.objects.get(schedule_type='regular', schedule_id=self.schedule.id)
+        self.assertEqual(row.status, 'completed')
+
+        # Completing a routine schedule creates its follow-up in bulk, which is mirrored too
+        follow_up = MaintenanceSchedule.objects.get(elevator=self.elevator, status='scheduled')
+        self.assertTrue(UnifiedSchedule.objects.filter(schedule_id=follow_up.id).exists())
+
+        self.schedule.delete()
+        self.assertFalse(UnifiedSchedule.objects.filter(schedule_id=self.schedule.id).exists())
+
+    def test_overdue_sweep_is_mirrored(self):
+        MaintenanceSchedule.objects.filter(id=self.schedule.id).update(scheduled_date=aware(2025, 3, 10, 9, 0))
+        UnifiedSchedule.objects.filter(schedule_id=self.schedule.id).update(scheduled_date=aware(2025, 3, 10, 9, 0))
+
+        OverdueSweepService.sweep()
+
+        self.assertEqual(
+            UnifiedSchedule.objects.get(schedule_id=self.schedule.id).status, 'overdue'
+        )
+        self.assertEqual(UnifiedSchedule.objects.filter(elevator=self.elevator).count(), 2)
+
+    def test_moving_an_elevator_moves_its_rows(self):
+        new_building = BuildingFactory()
+        self.elevator.building = new_building
+        self.elevator.save()
+
+        row = UnifiedSchedule.objects.get(schedule_id=self.schedule.id)
+        self.assertEqual(row.building_id, new_building.id)
+        self.assertEqual(row.developer_id, new_building.developer_id)
+
+    def test_rebuild_recreates_missing_rows(self):
+        UnifiedSchedule.objects.all().delete()
+
+        self.assertEqual(UnifiedScheduleService.rebuild(), 1)
+        self.assertTrue(UnifiedSchedule.objects.filter(schedule_id=self.schedule.id).exists())
+
+
+class UnifiedScheduleListViewTest(APITestCase):
+    def setUp(self):
+        self.url = reverse('unified-schedule-list')
+        self.elevator = ElevatorFactory()
+        now = timezone.now()
+        for offset in range(3):
+            MaintenanceScheduleFactory(
+                elevator=self.elevator, status='scheduled', next_schedule='set_date',
+                scheduled_date=now + timedelta(days=10 + offset)
+            )
+        self.adhoc = AdHocMaintenanceScheduleFactory(
+            elevator=self.elevator, status='scheduled', scheduled_date=now + timedelta(days=20)
+        )
+        self.building_adhoc = BuildingLevelAdhocScheduleFactory(
+            building=self.elevator.building, status='scheduled', scheduled_date=now + timedelta(days=30)
+        )
+        MaintenanceScheduleFactory(status='scheduled', scheduled_date=now + timedelta(days=5))
+
+    def test_lists_all_types_for_a_building_in_one_query(self):
+        with self.assertNumQueries(2):  # count and page
+            response = self.client.get(self.url, {'building_id': str(self.elevator.building_id)})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 5)
+        first = response.data['results'][0]
+        self.assertEqual(first['schedule_type'], 'building_adhoc')
+        self.assertEqual(first['id'], str(self.building_adhoc.id))
+
+    def test_filters_and_paginates(self):
+        response = self.client.get(
+            self.url,
+            {'elevator_id': str(self.elevator.id), 'schedule_type': 'regular', 'page_size': 2,
+             'ordering': 'scheduled_date'}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+        dates = [row['scheduled_date'] for row in response.data['results']]
+        self.assertEqual(dates, sorted(dates))
+
+    def test_invalid_filters_are_rejected(self):
+        response = self.client.get(self.url, {'schedule_type': 'weekly'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(self.url, {'technician_id': 'not-a-uuid'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['detail'], 'Invalid technician_id format.')
+
+
+@freeze_time("2025-03-12 10:00:00")
+class EffectiveStatusTest(APITestCase):
+    """Read paths report a schedule overdue exactly when the next sweep would mark it."""
+
+    def setUp(self):
+        self.elevator = ElevatorFactory()
+        self.later_today = self.schedule(aware(2025, 3, 12, 8, 0))
+        self.yesterday = self.schedule(aware(2025, 3, 11, 15, 0))
+
+    def schedule(self, scheduled_date):
+        schedule = MaintenanceScheduleFactory(
+            elevator=self.elevator, status='scheduled', next_schedule='set_date',
+            scheduled_date=aware(2025, 3, 20, 9, 0),
+        )
+        # Move it into the past without the save() hook persisting the overdue status
+        MaintenanceSchedule.objects.filter(id=schedule.id).update(scheduled_date=scheduled_date)
+        UnifiedSchedule.objects.filter(schedule_id=schedule.id).update(scheduled_date=scheduled_date)
+        return schedule
+
+    def reported(self, rows):
+        return {row['id']: row['status'] for row in rows}
+
+    def expected(self):
+        return {str(self.later_today.id): 'scheduled', str(self.yesterday.id): 'overdue'}
+
+    def test_unified_listing_matches_the_sweep(self):
+        url = reverse('unified-schedule-list')
+        response = self.client.get(url, {'elevator_id': str(self.elevator.id)})
+        self.assertEqual(self.reported(response.data['results']), self.expected())
+
+        response = self.client.get(url, {'elevator_id': str(self.elevator.id), 'status': 'overdue'})
+        self.assertEqual([row['id'] for row in response.data['results']], [str(self.yesterday.id)])
+
+        OverdueSweepService.sweep()
+        stored = dict(MaintenanceSchedule.objects.filter(elevator=self.elevator).values_list('id', 'status'))
+        self.assertEqual({str(key): value for key, value in stored.items()}, self.expected())
+
+    def test_paginated_schedule_listing_reports_effective_status(self):
+        technician = self.later_today.technician
+        MaintenanceSchedule.objects.filter(id=self.yesterday.id).update(technician=technician)
+        UnifiedSchedule.objects.filter(schedule_id=self.yesterday.id).update(technician=technician)
+
+        response = self.client.get(
+            reverse('technician-maintenance-schedules', args=[technician.id]), {'page_size': 10}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {row['maintenance_schedule']['id']: row['maintenance_schedule']['status'] for row in response.data['results']},
+            self.expected(),
+        )
@@ -12,15 +12,21 @@ urlpatterns = [
         path('maintenance-schedules/', MaintenanceScheduleListView.as_view(), name='maintenance-schedule-list'),    
         path('maintenance-schedules/maintenance_company/<uuid:company_id>/', MaintenanceCompanyMaintenanceSchedulesView.as_view(), name='maintenance-company-schedules'),
         path('maintenance-schedules/developer/<uuid:developer_id>/', DeveloperMaintenanceSchedulesView.as_view(), name='developer-maintenance-schedules'),
+        path('maintenance-schedules/maintenance_company/<uuid:company_id>/export/', MaintenanceCompanySchedulesExportView.as_view(), name='maintenance-company-schedules-export'),
+        path('maintenance-schedules/developer/<uuid:developer_id>/export/', DeveloperSchedulesExportView.as_view(), name='developer-schedules-export'),
         path('maintenance-schedules/buildings/<uuid:building_id>/', BuildingMaintenanceSchedulesView.as_view(), name='building-maintenance-schedules'),
         path('maintenance-schedules/change-technician/<str:schedule_type>/<uuid:schedule_id>/', ChangeTechnicianView.as_view(), name='change-technician'),
         path('maintenance-schedules/unassigned/', MaintenanceScheduleNullTechnicianFilterView.as_view(), name='unassigned-maintenance-schedules'),
         path('maintenance-schedules/filter/', MaintenanceScheduleFilterView.as_view(), name='maintenance-schedule-filter'),
+        path('maintenance-schedules/unified/', UnifiedScheduleListView.as_view(), name='unified-schedule-list'),
         path('maintenance-schedules/buildings/<uuid:building_id>/create_building_adhoc/', CreateBuildingAdhocScheduleView.as_view(), name='building-adhoc-schedule-create'),
         path('buildings/<uuid:building_schedule_id>/complete-schedule/', CompleteBuildingScheduleView.as_view(), name='complete-building-schedule'),
         path("maintenance-schedules/maintenance-company/<uuid:company_uuid>/<str:job_status>/", MaintenanceCompanyJobStatusView.as_view(), name="maintenance_company_job_status"),
         path("maintenance-schedules/technician/<uuid:technician_uuid>/<str:job_status>/", TechnicianJobStatusView.as_view(), name="technician_job_status"),
         path('maintenance-schedules/elevator/<uuid:elevator_id>/maintenance-history/', ElevatorMaintenanceHistoryView.as_view(), name='elevator-maintenance-history'),
+        path('maintenance-schedules/elevator/<uuid:elevator_id>/history/', ElevatorHistoryTimelineView.as_view(), name='elevator-history-timeline'),
+        path('elevator-health/maintenance_company/<uuid:company_id>/', MaintenanceCompanyElevatorHealthView.as_view(), name='maintenance-company-elevator-health'),
+        path('maintenance-schedules/elevator/<uuid:elevator_id>/history/<uuid:entry_id>/', ElevatorHistoryEntryDetailView.as_view(), name='elevator-history-entry'),
         path('maintenance-schedules/<uuid:schedule_id>/file-maintenance-log', FileMaintenanceLogView.as_view(), name='file-maintenance-log'),
 ]
 
@@ -1,54 +1,22 @@
 from django.utils import timezone
-from dateutil.relativedelta import relativedelta
 import logging
 
+from .services.recurrence_service import RecurrenceService
+
 logger = logging.getLogger(__name__)
 
 def get_next_scheduled_date(current_date, next_schedule_type):
     """
     Calculate the next scheduled date and handle weekend adjustments.
     """
-    if next_schedule_type == '1_month':
-        next_date = current_date + relativedelta(months=1)
-    elif next_schedule_type == '3_months':
-        next_date = current_date + relativedelta(months=3)
-    elif next_schedule_type == '6_months':
-        next_date = current_date + relativedelta(months=6)
-    else:
-        return None
-    # Adjust if the date falls on a weekend
-    while next_date.weekday() >= 5:  # 5 = Saturday, 6 = Sunday
-        next_date += timezone.timedelta(days=1)
-    return next_date
+    return RecurrenceService.get_next_date(current_date, next_schedule_type)
 def create_new_maintenance_schedule(maintenance_schedule):
     """
     Creates a new maintenance schedule if one doesn't already exist.
     """
-    next_date = get_next_scheduled_date(
-        maintenance_schedule.scheduled_date,
-        maintenance_schedule.next_schedule
-    )
-
-    if not next_date:
+    new_schedule = RecurrenceService.create_next_schedule(maintenance_schedule)
+    if not new_schedule:
         logger.info(f"No next date calculated for schedule {maintenance_schedule.id}")
-        return None
-    # Use get_or_create to prevent duplicates
-    from .models import MaintenanceSchedule
-    new_schedule, created = MaintenanceSchedule.objects.get_or_create(
-        elevator=maintenance_schedule.elevator,
-        scheduled_date=next_date,
-        defaults={
-            'technician': maintenance_schedule.technician,
-            'maintenance_company': maintenance_schedule.maintenance_company,
-            'next_schedule': maintenance_schedule.next_schedule,
-            'description': maintenance_schedule.description,
-            'status': 'scheduled'
-        }
-    )
-    if created:
-        logger.info(f"Created new schedule {new_schedule.id} for elevator {maintenance_schedule.elevator.id}")
-    else:
-        logger.info(f"Schedule already exists for elevator {maintenance_schedule.elevator.id} on {next_date}")
     return new_schedule
 def update_schedule_status_and_create_new_schedule(maintenance_schedule):
     """
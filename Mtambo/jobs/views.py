@@ -16,6 +16,15 @@ from rest_framework import status
 from rest_framework.parsers import JSONParser
 from .utils import get_next_scheduled_date
 from .utils import update_schedule_status_and_create_new_schedule
+from .services.recurrence_service import RecurrenceService
+from .services.overdue_service import OverdueSweepService
+from .services.schedule_filter_service import ScheduleFilterService
+from .services.unified_schedule_service import UnifiedScheduleService
+from .services.history_service import MaintenanceHistoryService
+from api.pagination import KeysetPagination, SchedulePagination
+from api.export import EXPORT_PARAMETERS
+from api.authentication import Custom401SessionAuthentication, Custom401JWTAuthentication
+from elevators.services.export_service import FleetExportService
 from .models import *
 from .serializers import *
 from .serializers import MaintenanceScheduleSerializer, AdhocScheduleCreateSerializer, BuildingScheduleCompletionSerializer
@@ -395,61 +404,22 @@ class ChangeMaintenanceScheduleToCompletedView(APIView):
         Generate the next maintenance schedule based on the frequency.
         Returns None for one-time schedules or if generation fails.
         """
-        if maintenance_schedule.next_schedule == 'set_date':
-            return None  # Don't generate next schedule for one-time schedules
+        next_schedules, created = RecurrenceService.create_next_schedules([maintenance_schedule])
+        new_schedule = next_schedules.get(maintenance_schedule.id)
 
-        schedule_intervals = {
-            '1_month': relativedelta(months=1),
-            '3_months': relativedelta(months=3),
-            '6_months': relativedelta(months=6),
-        }
-
-        interval = schedule_intervals.get(maintenance_schedule.next_schedule)
-        if not interval:
-            return None
-
-        next_date = maintenance_schedule.scheduled_date + interval
-        
-        # Check if a schedule already exists for this elevator on the calculated date
-        existing_schedule = MaintenanceSchedule.objects.filter(
-            elevator=maintenance_schedule.elevator,
-            scheduled_date=next_date
-        ).first()
-        
-        if existing_schedule:
-            return existing_schedule
-
-        try:
-            new_schedule = MaintenanceSchedule.objects.create(
-                elevator=maintenance_schedule.elevator,
-                technician=maintenance_schedule.technician,
-                maintenance_company=maintenance_schedule.maintenance_company,
-                scheduled_date=next_date,
-                next_schedule=maintenance_schedule.next_schedule,
-                description=f"Routine {maintenance_schedule.next_schedule.replace('_', ' ')} maintenance",
-                status='scheduled'
-            )
-
-            if new_schedule.technician:
-                AlertService.create_alert(
-                    alert_type=AlertType.SCHEDULE_ASSIGNED,
-                    recipient=new_schedule.technician,
-                    related_object=new_schedule,
-                    message=(
-                        f"New routine maintenance schedule created for elevator {new_schedule.elevator.machine_number}. "
-                        f"Scheduled for: {next_date.strftime('%Y-%m-%d %H:%M')}"
-                    )
+        if new_schedule in created and new_schedule.technician_id:
+            AlertService.create_alert(
+                alert_type=AlertType.SCHEDULE_ASSIGNED,
+                recipient=new_schedule.technician,
+                related_object=new_schedule,
+                message=(
+                    f"New routine maintenance schedule created for elevator {maintenance_schedule.elevator.machine_number}. "
+                    f"Scheduled for: {new_schedule.scheduled_date.strftime('%Y-%m-%d %H:%M')}"
                 )
-
-            return new_schedule
-
-        except IntegrityError:
-            # Handle race condition - return the schedule that was created by another process
-            return MaintenanceSchedule.objects.get(
-                elevator=maintenance_schedule.elevator,
-                scheduled_date=next_date
             )
 
+        return new_schedule
+
     def _check_and_handle_overdue_status(self, maintenance_schedule):
         """
         Check if a schedule is overdue and send alerts if it just became overdue.
@@ -1010,9 +980,15 @@ class ElevatorMaintenanceSchedulesView(APIView):
         elevator = get_object_or_404(Elevator, id=elevator_id)
         
         # Get all maintenance schedules for the elevator and evaluate the querysets immediately
-        regular_schedules = list(MaintenanceSchedule.objects.filter(elevator=elevator))
-        adhoc_schedules = list(AdHocMaintenanceSchedule.objects.filter(elevator=elevator))
-        building_adhoc_schedules = list(BuildingLevelAdhocSchedule.objects.filter(building=elevator.building))
+        regular_schedules = list(CompleteMaintenanceScheduleSerializer.setup_eager_loading(
+            MaintenanceSchedule.objects.filter(elevator=elevator)
+        ))
+        adhoc_schedules = list(CompleteMaintenanceScheduleSerializer.setup_eager_loading(
+            AdHocMaintenanceSchedule.objects.filter(elevator=elevator)
+        ))
+        building_adhoc_schedules = list(BuildingLevelAdhocScheduleSerializer.setup_eager_loading(
+            BuildingLevelAdhocSchedule.objects.filter(building=elevator.building)
+        ))
         
         # Check if no schedules are found using the evaluated lists
         if not any([regular_schedules, adhoc_schedules, building_adhoc_schedules]):
@@ -1035,7 +1011,20 @@ class ElevatorMaintenanceSchedulesView(APIView):
         
         return Response(response_data, status=status.HTTP_200_OK)
 
-class TechnicianMaintenanceSchedulesView(APIView):
+class ScheduleCursorPaginationMixin:
+    """
+    Opt-in keyset pagination for the schedule listing views. When the request carries
+    ?page_size= or ?cursor=, schedules of every type are paged from the unified read model
+    ordered by (scheduled_date, id) instead of returning the full per-type lists.
+    """
+
+    def get_paginated_schedules_response(self, request, queryset):
+        paginator = KeysetPagination(ordering=('-scheduled_date', 'id'))
+        rows = paginator.paginate_queryset(queryset, request, view=self)
+        schedules = UnifiedScheduleService.load_schedules(rows)
+        return paginator.get_paginated_response(serialize_schedules(schedules))
+
+class TechnicianMaintenanceSchedulesView(ScheduleCursorPaginationMixin, APIView):
     """
     View to retrieve all maintenance schedules (regular, ad-hoc, and building-level ad-hoc) assigned to a technician.
     """
@@ -1057,33 +1046,16 @@ class TechnicianMaintenanceSchedulesView(APIView):
         except TechnicianProfile.DoesNotExist:
             return None
 
-    def update_schedule_status(self, schedule):
-        """
-        Update the status of a schedule to 'overdue' if needed.
-        """
-        current_time = timezone.now()
-        if schedule.scheduled_date < current_time and schedule.status == 'scheduled':
-            schedule.status = 'overdue'
-            schedule.save()
-        return schedule
-
     def get_schedules(self, technician):
         """
-        Fetch all maintenance schedules for the given technician and update their status if needed.
+        Fetch all maintenance schedules for the given technician. Past-due schedules are
+        reported as overdue through an annotation; this view never writes to them.
         """
-        # Get all schedules
-        regular_schedules = MaintenanceSchedule.objects.filter(technician=technician)
-        adhoc_schedules = AdHocMaintenanceSchedule.objects.filter(technician=technician)
-        building_adhoc_schedules = BuildingLevelAdhocSchedule.objects.filter(technician=technician)
-
-        # Update status for overdue schedules
-        for schedule in regular_schedules:
-            self.update_schedule_status(schedule)
-        for schedule in adhoc_schedules:
-            self.update_schedule_status(schedule)
-        for schedule in building_adhoc_schedules:
-            self.update_schedule_status(schedule)
-
+        now = timezone.now()
+        regular_schedules, adhoc_schedules, building_adhoc_schedules = (
+            OverdueSweepService.annotate_effective_status(model.objects.filter(technician=technician), now)
+            for model in (MaintenanceSchedule, AdHocMaintenanceSchedule, BuildingLevelAdhocSchedule)
+        )
         return regular_schedules, adhoc_schedules, building_adhoc_schedules
 
     def serialize_schedules(self, regular_schedules, adhoc_schedules, building_adhoc_schedules):
@@ -1103,6 +1075,11 @@ class TechnicianMaintenanceSchedulesView(APIView):
         if not technician:
             return Response({"detail": "Technician not found."}, status=status.HTTP_404_NOT_FOUND)
 
+        if KeysetPagination.is_requested(request):
+            return self.get_paginated_schedules_response(
+                request, UnifiedSchedule.objects.filter(technician=technician)
+            )
+
         regular_schedules, adhoc_schedules, building_adhoc_schedules = self.get_schedules(technician)
         
         if not (regular_schedules.exists() or adhoc_schedules.exists() or building_adhoc_schedules.exists()):
@@ -1123,14 +1100,36 @@ class TechnicianMaintenanceSchedulesView(APIView):
 
         return Response(response_data, status=status.HTTP_200_OK)
 
-class MaintenanceScheduleListView(APIView):
+class MaintenanceScheduleListView(ScheduleCursorPaginationMixin, APIView):
     """
     View to retrieve all maintenance schedules, including regular, ad-hoc, and building-level ad-hoc schedules.
     This view is scalable and uses UUIDs for consistency with the project.
     """
     permission_classes = [AllowAny]  # Adjust permissions as needed
 
+    def get_paginated(self, request):
+        """
+        Page through schedules of every type. elevator_id, building_id and technician_id
+        filter all schedule types by the elevator, building and technician they belong to.
+        """
+        queryset = UnifiedSchedule.objects.all()
+        for key in ('elevator_id', 'building_id', 'technician_id'):
+            value = request.query_params.get(key)
+            if not value:
+                continue
+            try:
+                queryset = queryset.filter(**{key: UUID(value)})
+            except ValueError:
+                return Response(
+                    {"detail": f"Invalid {key} format. Must be a valid UUID."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        return self.get_paginated_schedules_response(request, queryset)
+
     def get(self, request):
+        if KeysetPagination.is_requested(request):
+            return self.get_paginated(request)
+
         try:
             # Extract query parameters for filtering (if needed)
             elevator_id = request.query_params.get('elevator_id')
@@ -1197,7 +1196,7 @@ class MaintenanceScheduleListView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-class MaintenanceCompanyMaintenanceSchedulesView(APIView):
+class MaintenanceCompanyMaintenanceSchedulesView(ScheduleCursorPaginationMixin, APIView):
     """
     View to retrieve all maintenance schedules (regular, ad-hoc, and building-level ad-hoc) associated with a specific maintenance company.
     """
@@ -1215,6 +1214,11 @@ class MaintenanceCompanyMaintenanceSchedulesView(APIView):
         except ValueError:
             return JsonResponse({"detail": "Invalid UUID format."}, status=status.HTTP_400_BAD_REQUEST)
 
+        if KeysetPagination.is_requested(request):
+            return self.get_paginated_schedules_response(
+                request, UnifiedSchedule.objects.filter(maintenance_company=maintenance_company)
+            )
+
         # Get all regular maintenance schedules for the company
         regular_schedules = MaintenanceSchedule.objects.filter(maintenance_company=maintenance_company)
         # Get all ad-hoc maintenance schedules for the company
@@ -1240,7 +1244,7 @@ class MaintenanceCompanyMaintenanceSchedulesView(APIView):
         
         return JsonResponse(response_data, status=status.HTTP_200_OK)
 
-class DeveloperMaintenanceSchedulesView(APIView):
+class DeveloperMaintenanceSchedulesView(ScheduleCursorPaginationMixin, APIView):
     """
     View to retrieve all maintenance schedules (regular, ad-hoc, and building-level ad-hoc) associated with a developer.
     """
@@ -1253,6 +1257,11 @@ class DeveloperMaintenanceSchedulesView(APIView):
         except DeveloperProfile.DoesNotExist:
             return Response({"detail": "Developer not found."}, status=status.HTTP_404_NOT_FOUND)
 
+        if KeysetPagination.is_requested(request):
+            return self.get_paginated_schedules_response(
+                request, UnifiedSchedule.objects.filter(developer=developer)
+            )
+
         # Get all buildings linked to this developer
         buildings = developer.buildings.all()
         if not buildings.exists():
@@ -1286,6 +1295,48 @@ class DeveloperMaintenanceSchedulesView(APIView):
 
         return Response(response_data, status=status.HTTP_200_OK)
 
+class MaintenanceCompanySchedulesExportView(APIView):
+    """
+    Stream every maintenance schedule (regular, ad-hoc, and building-level ad-hoc) of a
+    maintenance company as CSV or NDJSON.
+    """
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [Custom401SessionAuthentication, Custom401JWTAuthentication]
+
+    @swagger_auto_schema(
+        operation_description="Export a maintenance company's schedules as CSV or NDJSON",
+        manual_parameters=EXPORT_PARAMETERS,
+        responses={200: "CSV or NDJSON file", 400: "Bad Request", 404: "Not Found"}
+    )
+    def get(self, request, company_id):
+        company = get_object_or_404(MaintenanceCompanyProfile, id=company_id)
+        return FleetExportService.export_schedules(
+            UnifiedSchedule.objects.filter(maintenance_company=company),
+            request.query_params,
+            filename=f"schedules-{company.id}",
+        )
+
+class DeveloperSchedulesExportView(APIView):
+    """
+    Stream every maintenance schedule (regular, ad-hoc, and building-level ad-hoc) of a
+    developer's buildings as CSV or NDJSON.
+    """
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [Custom401SessionAuthentication, Custom401JWTAuthentication]
+
+    @swagger_auto_schema(
+        operation_description="Export a developer's schedules as CSV or NDJSON",
+        manual_parameters=EXPORT_PARAMETERS,
+        responses={200: "CSV or NDJSON file", 400: "Bad Request", 404: "Not Found"}
+    )
+    def get(self, request, developer_id):
+        developer = get_object_or_404(DeveloperProfile, id=developer_id)
+        return FleetExportService.export_schedules(
+            UnifiedSchedule.objects.filter(developer=developer),
+            request.query_params,
+            filename=f"schedules-{developer.id}",
+        )
+
 class BuildingMaintenanceSchedulesView(APIView):
     """
     View to retrieve all maintenance schedules (regular, ad-hoc, and building-level ad-hoc) for a specific building.
@@ -1610,7 +1661,8 @@ class MaintenanceScheduleNullTechnicianFilterView(APIView):
 class MaintenanceScheduleFilterView(APIView):
     """
     Filter maintenance schedules (regular, ad-hoc, and building-level ad-hoc) based on various criteria.
-    Applies filters one-by-one and checks for matches across all schedule types.
+    Filters are applied in the database for each schedule type; without a schedule_type the
+    matches are combined with an ordered UNION and paginated (?page=, ?page_size=).
     """
     permission_classes = [ ]  # Adjust permissions as needed
 
@@ -1666,6 +1718,10 @@ class MaintenanceScheduleFilterView(APIView):
                 ),
             }
         ),
+        manual_parameters=[
+            openapi.Parameter('page', openapi.IN_QUERY, description="Page number", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('page_size', openapi.IN_QUERY, description="Results per page (max 200)", type=openapi.TYPE_INTEGER),
+        ],
         responses={
             200: openapi.Response('Successful operation', CompleteMaintenanceScheduleSerializer),
             400: 'Bad Request - Invalid input parameters',
@@ -1674,144 +1730,22 @@ class MaintenanceScheduleFilterView(APIView):
         operation_summary="Filter Maintenance Schedules"
     )
     def put(self, request):
-        # Allowed fields
-        allowed_fields = [
-            'technician_id', 'status', 'developer_id', 'elevator_id',
-            'building_id', 'scheduled_date', 'next_schedule', 'maintenance_company_id', 'schedule_type'
-        ]
-
-        # Check for any invalid keys in the request data
-        invalid_fields = [key for key in request.data if key not in allowed_fields]
-        if invalid_fields:
-            return Response(
-                {"detail": f"Invalid fields: {', '.join(invalid_fields)}"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # Extract filters
-        filters = {key: request.data.get(key) for key in allowed_fields}
-
-        # Valid options for status and next_schedule
-        valid_statuses = ['scheduled', 'overdue', 'completed']
-        valid_next_schedules = ['1_month', '3_months', '6_months', 'set_date']
-
-        # Determine schedule_type
-        schedule_type = filters.get("schedule_type")
-        if schedule_type not in [None, "regular", "adhoc", "building"]:
-            return Response(
-                {"detail": "Invalid schedule_type. Valid options are: 'regular', 'adhoc', 'building'."},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # Initialize queryset based on schedule_type
-        if schedule_type == "regular":
-            queryset = MaintenanceSchedule.objects.all()
-        elif schedule_type == "adhoc":
-            queryset = AdHocMaintenanceSchedule.objects.all()
-        elif schedule_type == "building":
-            queryset = BuildingLevelAdhocSchedule.objects.all()
-        else:
-            # Combined queryset across all types
-            queryset = list(MaintenanceSchedule.objects.all()) + \
-                       list(AdHocMaintenanceSchedule.objects.all()) + \
-                       list(BuildingLevelAdhocSchedule.objects.all())
-
-        # Apply each filter one-by-one
-        for key, value in filters.items():
-            if not value or key == "schedule_type":
-                continue
-
-            if key == "technician_id":
-                try:
-                    technician_uuid = uuid.UUID(value)
-                except ValueError:
-                    return Response({"detail": "Invalid technician ID format."}, status=status.HTTP_400_BAD_REQUEST)
-                try:
-                    technician = TechnicianProfile.objects.get(id=technician_uuid)
-                except TechnicianProfile.DoesNotExist:
-                    return Response({"detail": f"Technician with ID {value} not found."}, status=status.HTTP_404_NOT_FOUND)
-                queryset = [item for item in queryset if item.technician == technician]
-
-            elif key == "status":
-                if value not in valid_statuses:
-                    return Response({"detail": f"Invalid status '{value}'. Valid options are: {', '.join(valid_statuses)}."}, status=status.HTTP_400_BAD_REQUEST)
-                queryset = [item for item in queryset if item.status == value]
-
-            elif key == "developer_id":
-                try:
-                    developer_uuid = uuid.UUID(value)
-                except ValueError:
-                    return Response({"detail": "Invalid developer ID format."}, status=status.HTTP_400_BAD_REQUEST)
-                try:
-                    developer = DeveloperProfile.objects.get(id=developer_uuid)
-                except DeveloperProfile.DoesNotExist:
-                    return Response({"detail": f"Developer with ID {value} not found."}, status=status.HTTP_404_NOT_FOUND)
-                buildings = Building.objects.filter(developer=developer)
-                elevators = Elevator.objects.filter(building__in=buildings)
-                # Only filter items that have an 'elevator' attribute
-                queryset = [item for item in queryset if hasattr(item, 'elevator') and item.elevator in elevators]
-
-            elif key == "elevator_id":
-                try:
-                    elevator_uuid = uuid.UUID(value)
-                except ValueError:
-                    return Response({"detail": "Invalid elevator ID format."}, status=status.HTTP_400_BAD_REQUEST)
-                try:
-                    elevator = Elevator.objects.get(id=elevator_uuid)
-                except Elevator.DoesNotExist:
-                    return Response({"detail": f"Elevator with ID {value} not found."}, status=status.HTTP_404_NOT_FOUND)
-                queryset = [item for item in queryset if hasattr(item, 'elevator') and item.elevator == elevator]
-
-            elif key == "building_id":
-                try:
-                    building_uuid = uuid.UUID(value)
-                except ValueError:
-                    return Response({"detail": "Invalid building ID format."}, status=status.HTTP_400_BAD_REQUEST)
-                try:
-                    building = Building.objects.get(id=building_uuid)
-                except Building.DoesNotExist:
-                    return Response({"detail": f"Building with ID {value} not found."}, status=status.HTTP_404_NOT_FOUND)
-                # For items with an elevator, check if elevator.building matches; for building-level schedules, check building field
-                def in_building(item):
-                    if hasattr(item, 'elevator') and item.elevator:
-                        return item.elevator.building == building
-                    elif hasattr(item, 'building'):
-                        return item.building == building
-                    return False
-                queryset = [item for item in queryset if in_building(item)]
-
-            elif key == "scheduled_date":
-                try:
-                    filter_date = datetime.strptime(value, '%Y-%m-%d').date()
-                except ValueError:
-                    return Response({"detail": "Invalid date format. Please use YYYY-MM-DD."}, status=status.HTTP_400_BAD_REQUEST)
-                queryset = [item for item in queryset if item.scheduled_date.date() == filter_date]
-
-            elif key == "next_schedule":
-                if value not in valid_next_schedules:
-                    return Response({"detail": f"Invalid next_schedule '{value}'. Valid options are: {', '.join(valid_next_schedules)}."}, status=status.HTTP_400_BAD_REQUEST)
-                queryset = [item for item in queryset if item.next_schedule == value]
-
-            elif key == "maintenance_company_id":
-                try:
-                    company_uuid = uuid.UUID(value)
-                except ValueError:
-                    return Response({"detail": "Invalid maintenance company ID format."}, status=status.HTTP_400_BAD_REQUEST)
-                try:
-                    maintenance_company = MaintenanceCompanyProfile.objects.get(id=company_uuid)
-                except MaintenanceCompanyProfile.DoesNotExist:
-                    return Response({"detail": f"Maintenance company with ID {value} not found."}, status=status.HTTP_404_NOT_FOUND)
-                queryset = [item for item in queryset if item.maintenance_company == maintenance_company]
-
-        if not queryset:
+        try:
+            schedule_type, filters = ScheduleFilterService.clean_filters(request.data)
+        except InvalidFilterError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Filter, order and paginate in the database; only the requested page is loaded
+        paginator = SchedulePagination()
+        rows = paginator.paginate_queryset(
+            ScheduleFilterService.filter_schedules(schedule_type, filters), request, view=self
+        )
+        if not rows:
             return Response({"detail": "No maintenance schedules found matching the criteria."}, status=status.HTTP_404_NOT_FOUND)
 
-        # Serialize the queryset using the proper serializer based on schedule_type
-        if schedule_type == "building":
-            serializer = BuildingLevelAdhocScheduleSerializer(queryset, many=True)
-        else:
-            serializer = CompleteMaintenanceScheduleSerializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        schedules = ScheduleFilterService.load_schedules(rows)
+        results = serialize_schedules(schedules)
+        return paginator.get_paginated_response(results)
 
 class MaintenanceCompanyJobStatusView(APIView):
     permission_classes = [AllowAny]
@@ -1951,15 +1885,19 @@ class ElevatorMaintenanceHistoryView(APIView):
         """
         
         # Fetch completed maintenance schedules (regular and ad-hoc) for the elevator
-        completed_regular_schedules = MaintenanceSchedule.objects.filter(
-            elevator_id=elevator_id,
-            status='completed'
-        ).order_by('-scheduled_date')
+        completed_regular_schedules = CompleteMaintenanceScheduleSerializer.setup_eager_loading(
+            MaintenanceSchedule.objects.filter(
+                elevator_id=elevator_id,
+                status='completed'
+            ).order_by('-scheduled_date')
+        )
 
-        completed_adhoc_schedules = AdHocMaintenanceSchedule.objects.filter(
-            elevator_id=elevator_id,
-            status='completed'
-        ).order_by('-scheduled_date')
+        completed_adhoc_schedules = CompleteMaintenanceScheduleSerializer.setup_eager_loading(
+            AdHocMaintenanceSchedule.objects.filter(
+                elevator_id=elevator_id,
+                status='completed'
+            ).order_by('-scheduled_date')
+        )
 
         # Combine and sort schedules by the most recent scheduled_date
         combined_schedules = list(completed_regular_schedules) + list(completed_adhoc_schedules)
@@ -1970,6 +1908,91 @@ class ElevatorMaintenanceHistoryView(APIView):
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+class MaintenanceCompanyElevatorHealthView(APIView):
+    """
+    A maintenance company's elevators ranked by health score, most at risk first, read
+    from the snapshot written by the periodic health scoring job.
+    """
+    permission_classes = [AllowAny]
+
+    @swagger_auto_schema(
+        operation_description="List a company's elevators by health score, lowest (most at risk) first",
+        manual_parameters=[
+            openapi.Parameter('building_id', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID,
+                description="Only include elevators in this building"),
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                description="Elevators per page (max 200)"),
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                description="Cursor from the previous page's next link"),
+        ],
+        responses={200: ElevatorHealthSnapshotSerializer(many=True), 404: "Not Found"}
+    )
+    def get(self, request, company_id: UUID):
+        company = get_object_or_404(MaintenanceCompanyProfile, id=company_id)
+        snapshots = ElevatorHealthSnapshot.objects.filter(maintenance_company=company).select_related(
+            'elevator', 'building'
+        )
+        building_id = request.query_params.get('building_id')
+        if building_id:
+            try:
+                snapshots = snapshots.filter(building_id=UUID(building_id))
+            except ValueError:
+                return Response({"detail": "Invalid building ID format."}, status=status.HTTP_400_BAD_REQUEST)
+
+        paginator = KeysetPagination(ordering=('score', 'id'))
+        page = paginator.paginate_queryset(snapshots, request, view=self)
+        return paginator.get_paginated_response(ElevatorHealthSnapshotSerializer(page, many=True).data)
+
+class ElevatorHistoryTimelineView(APIView):
+    """
+    Page through an elevator's maintenance timeline, most recent first. Entries carry a
+    compact summary; open one with ElevatorHistoryEntryDetailView for the full log.
+    """
+    permission_classes = [AllowAny]
+
+    @swagger_auto_schema(
+        operation_description="Retrieve an elevator's maintenance timeline, most recent first",
+        manual_parameters=[
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                description="Entries per page (max 200)"),
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                description="Cursor from the previous page's next link"),
+        ],
+        responses={200: ElevatorHistoryEntrySerializer(many=True), 404: "Not Found"}
+    )
+    def get(self, request, elevator_id: UUID):
+        elevator = get_object_or_404(Elevator, id=elevator_id)
+        paginator = KeysetPagination(ordering=('-completed_at', 'id'))
+        entries = paginator.paginate_queryset(
+            ElevatorHistoryEntry.objects.filter(elevator=elevator), request, view=self
+        )
+        return paginator.get_paginated_response(ElevatorHistoryEntrySerializer(entries, many=True).data)
+
+class ElevatorHistoryEntryDetailView(APIView):
+    """A single timeline entry with its full maintenance log and condition report."""
+    permission_classes = [AllowAny]
+
+    def get(self, request, elevator_id: UUID, entry_id: UUID):
+        entry = get_object_or_404(ElevatorHistoryEntry, id=entry_id, elevator_id=elevator_id)
+        log = MaintenanceHistoryService.load_details(entry)
+        if log is None:
+            return Response({
+                **ElevatorHistoryEntrySerializer(entry).data,
+                "detail": "The maintenance log of this entry has been deleted.",
+            }, status=status.HTTP_404_NOT_FOUND)
+        if entry.schedule_type == 'regular':
+            log_data = ScheduledMaintenanceLogSerializer(log).data
+            report_data = ElevatorConditionReportSerializer(log.condition_report).data
+        else:
+            log_data = AdHocMaintenanceLogSerializer(log).data
+            report_data = AdHocElevatorConditionReportSerializer(log.condition_report).data
+
+        return Response({
+            **ElevatorHistoryEntrySerializer(entry).data,
+            "maintenance_log": log_data,
+            "condition_report": report_data,
+        }, status=status.HTTP_200_OK)
+
 class FileMaintenanceLogView(APIView):
     permission_classes = [AllowAny]
 
@@ -2258,37 +2281,43 @@ For ad-hoc maintenance (schedule_type: "adhoc"):
         maintenance_schedule.status = 'completed'
         maintenance_schedule.save()
 
-        # Create alerts
+        # Queue alerts, written in the background once the request's work has committed.
+        # Each alert is built on its own, so a missing recipient only drops its own alert
+        kind = 'Ad-hoc' if schedule_type == 'adhoc' else 'Regular'
+        alerts = []
         try:
-            developer = maintenance_schedule.elevator.building.developer
             elevator = maintenance_schedule.elevator
-            
             # Alert for developer
-            AlertService.create_alert(
+            alerts.append(AlertService.build_alert(
                 alert_type=AlertType.MAINTENANCE_APPROVAL_NEEDED,
-                recipient=developer,
+                recipient=elevator.building.developer,
                 related_object=maintenance_schedule,
                 message=(
-                    f"{'Ad-hoc' if schedule_type == 'adhoc' else 'Regular'} maintenance completed for "
+                    f"{kind} maintenance completed for "
                     f"elevator {elevator.machine_number} in building {elevator.building.name}. "
                     f"Please review and approve the maintenance log."
                 )
-            )
+            ))
+        except Exception as e:
+            logger.error(f"Failed to create maintenance approval alert: {str(e)}")
 
+        try:
+            elevator = maintenance_schedule.elevator
             # Alert for maintenance company
-            AlertService.create_alert(
+            alerts.append(AlertService.build_alert(
                 alert_type=AlertType.LOG_ADDED,
                 recipient=maintenance_schedule.maintenance_company,
                 related_object=maintenance_schedule,
                 message=(
-                    f"{'Ad-hoc' if schedule_type == 'adhoc' else 'Regular'} maintenance log submitted for "
+                    f"{kind} maintenance log submitted for "
                     f"elevator {elevator.machine_number} in building {elevator.building.name}. "
                     f"Awaiting developer approval."
                 )
-            )
-
+            ))
         except Exception as e:
-            logger.error(f"Failed to create maintenance approval alerts: {str(e)}")
+            logger.error(f"Failed to create maintenance log alert: {str(e)}")
+
+        AlertService.enqueue_alerts(alerts)
 
         return Response(
             {
@@ -2299,3 +2328,73 @@ For ad-hoc maintenance (schedule_type: "adhoc"):
             },
             status=status.HTTP_200_OK
         )
+
+
+class UnifiedScheduleListView(APIView):
+    """
+    List schedules of every type from the unified read model in one indexed query.
+    Supports filtering by type, status, related objects and a date range, ordered by
+    scheduled date (newest first, or oldest first with ordering=scheduled_date).
+    """
+    permission_classes = [AllowAny]
+
+    ID_FILTERS = ['elevator_id', 'building_id', 'developer_id', 'maintenance_company_id', 'technician_id']
+
+    def get(self, request):
+        params = request.query_params
+        queryset = UnifiedSchedule.objects.all()
+
+        schedule_type = params.get('schedule_type')
+        if schedule_type:
+            valid_types = [choice for choice, _ in UnifiedSchedule.SCHEDULE_TYPE_CHOICES]
+            if schedule_type not in valid_types:
+                return Response(
+                    {"detail": f"Invalid schedule_type. Valid options are: {', '.join(valid_types)}."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            queryset = queryset.filter(schedule_type=schedule_type)
+
+        # Past-due rows are reported (and filtered) as overdue before the sweep persists it
+        queryset = OverdueSweepService.annotate_effective_status(queryset)
+        schedule_status = params.get('status')
+        if schedule_status:
+            if schedule_status not in ['scheduled', 'overdue', 'completed']:
+                return Response({"detail": "Invalid status."}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = queryset.filter(effective_status=schedule_status)
+
+        for key in self.ID_FILTERS:
+            value = params.get(key)
+            if not value:
+                continue
+            try:
+                queryset = queryset.filter(**{key: UUID(value)})
+            except ValueError:
+                return Response({"detail": f"Invalid {key} format."}, status=status.HTTP_400_BAD_REQUEST)
+
+        for key, lookup in (('scheduled_from', 'scheduled_date__gte'), ('scheduled_to', 'scheduled_date__lte')):
+            value = params.get(key)
+            if not value:
+                continue
+            try:
+                date_value = parser.isoparse(value)
+            except ValueError:
+                return Response(
+                    {"detail": f"Invalid {key}. Use ISO 8601 format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if timezone.is_naive(date_value):
+                date_value = timezone.make_aware(date_value)
+            queryset = queryset.filter(**{lookup: date_value})
+
+        ordering = params.get('ordering', '-scheduled_date')
+        if ordering not in ['scheduled_date', '-scheduled_date']:
+            return Response(
+                {"detail": "Invalid ordering. Use 'scheduled_date' or '-scheduled_date'."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        queryset = queryset.order_by(ordering, 'id')
+
+        paginator = SchedulePagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = UnifiedScheduleSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
@@ -0,0 +1,83 @@
+from django.contrib.contenttypes.models import ContentType
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from buildings.models import Building
+from elevators.models import Elevator
+from jobs.factories import (
+    DeveloperProfileFactory,
+    ElevatorFactory,
+    MaintenanceCompanyProfileFactory,
+    TechnicianProfileFactory,
+)
+
+
+class AddBuildingElevatorBatchTest(APITestCase):
+    def setUp(self):
+        self.company = MaintenanceCompanyProfileFactory()
+        self.developer = DeveloperProfileFactory()
+        self.technician = TechnicianProfileFactory(maintenance_company=self.company)
+        self.client.force_authenticate(self.company.user)
+        self.url = reverse("maintenance_companies:add_building", kwargs={"company_uuid": self.company.id})
+        # Alert recipients' content types are cached per process after first use
+        ContentType.objects.get_for_models(Building, type(self.company), type(self.developer), type(self.technician))
+
+    def payload(self, count, **elevator_overrides):
+        return {
+            "developer_uuid": str(self.developer.id),
+            "name": "Tower",
+            "address": "1 Main St",
+            "contact": "0700000000",
+            "elevators": [
+                {
+                    "user_name": f"Lift {n}",
+                    "capacity": 1000,
+                    "machine_number": f"TOWER-{n:03d}",
+                    "manufacturer": "Otis",
+                    "installation_date": "2024-01-01",
+                    "technician_id": str(self.technician.id),
+                    **elevator_overrides,
+                }
+                for n in range(count)
+            ],
+        }
+
+    def test_query_count_does_not_grow_with_the_number_of_elevators(self):
+        # Company, developer, duplicate check, technicians, then savepoint, building insert,
+        # elevator insert, release
+        with self.assertNumQueries(8):
+            response = self.client.put(self.url, self.payload(3), format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        Building.objects.all().delete()
+        with self.assertNumQueries(8):
+            response = self.client.put(self.url, self.payload(60), format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["elevators"]), 60)
+        self.assertEqual(response.data["elevators"][0]["technician"]["id"], str(self.technician.id))
+        self.assertEqual(Elevator.objects.filter(technician=self.technician).count(), 60)
+
+    def test_duplicates_are_reported_per_elevator_and_nothing_is_created(self):
+        ElevatorFactory(machine_number="TOWER-001")
+        payload = self.payload(3)
+        payload["elevators"][2]["machine_number"] = "TOWER-000"
+
+        response = self.client.put(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [list(error) for error in response.data["elevators"]], [["elevator_1"], ["elevator_2"]]
+        )
+        self.assertFalse(Building.objects.filter(name="Tower").exists())
+
+    def test_unknown_technician_creates_nothing(self):
+        other_company_technician = TechnicianProfileFactory()
+
+        response = self.client.put(
+            self.url, self.payload(2, technician_id=str(other_company_technician.id)), format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(Building.objects.filter(name="Tower").exists())
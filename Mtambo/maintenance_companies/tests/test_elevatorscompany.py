@@ -126,3 +126,20 @@ class ElevatorsUnderCompanyViewTestCase(APITestCase):
         self.assertIn("detail", data)
         self.assertEqual(data["detail"], "No MaintenanceCompanyProfile matches the given query.")
 
+
+    def test_get_elevators_under_company_with_cursor(self):
+        """Test paging through a company's elevators ordered by machine number."""
+        url = reverse("maintenance_companies:elevators-under-company", kwargs={"company_id": str(self.company.id)})
+        response = self.client.get(url, {"page_size": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual([row["machine_number"] for row in data["results"]], ["LIFT001"])
+        self.assertIsNotNone(data["next"])
+
+        response = self.client.get(data["next"])
+        data = response.json()
+        self.assertEqual([row["machine_number"] for row in data["results"]], ["LIFT002"])
+        self.assertIsNone(data["next"])
+
+        response = self.client.get(url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -18,11 +18,14 @@ urlpatterns = [
     path('<uuid:maintenance_company_id>/technicians/<uuid:technician_id>/remove/', RemoveTechnicianFromCompanyView.as_view(), name='remove_technician_from_company'),
     path('<uuid:uuid_id>/technicians/', MaintenanceCompanyTechniciansView.as_view(), name='technicians-list'),
     path('<uuid:company_uuid>/buildings/add/', AddBuildingView.as_view(), name='add_building'),
+    path('<uuid:company_uuid>/fleet-imports/', FleetImportView.as_view(), name='fleet-import'),
+    path('<uuid:company_uuid>/fleet-imports/<uuid:import_uuid>/', FleetImportDetailView.as_view(), name='fleet-import-detail'),
     path('<uuid:company_id>/buildings/', BuildingListView.as_view(), name='building-list'),
     path('<uuid:company_id>/buildings/<uuid:building_id>/', BuildingDetailView.as_view(), name='building-detail'),
     path('<uuid:company_id>/developers/', DevelopersUnderCompanyView.as_view(), name='developers-under-company'),
     path('<uuid:company_id>/developers/<uuid:developer_id>/', DeveloperDetailUnderCompanyView.as_view(), name='developer-detail-under-company'),
     path("<uuid:company_id>/developers/<uuid:developer_id>/buildings/", BuildingsUnderDeveloperView.as_view(), name="buildings-under-developer"),
+    path('<uuid:company_id>/elevators/export/', ElevatorsUnderCompanyExportView.as_view(), name='elevators-under-company-export'),
     path('<uuid:company_id>/elevators', ElevatorsUnderCompanyView.as_view(), name='elevators-under-company'),
     path('<uuid:company_id>/buildings<uuid:building_id>/elevators', ElevatorsInBuildingView.as_view(), name='elevators-in-building'),
     path('<uuid:company_id>/elevators/<uuid:elevator_id>/', ElevatorDetailView.as_view(), name='elevator-detail'),
@@ -49,6 +49,15 @@ from typing import Dict, List, Tuple, Optional, Any
 from django.db import transaction
 
 from jobs.models import MaintenanceSchedule
+from jobs.services.unified_schedule_service import UnifiedScheduleService
+from elevators.services.registration_service import ElevatorRegistrationService
+from elevators.services.import_service import FleetImportService
+from elevators.models import FleetImport
+from elevators.serializers import FleetImportSerializer
+from elevators.services.export_service import FleetExportService
+from api.export import EXPORT_PARAMETERS
+from rest_framework.parsers import MultiPartParser
+from api.pagination import KeysetPagination
 
 class MaintenanceCompanyListView(generics.ListAPIView):
     """
@@ -457,136 +466,72 @@ class AddBuildingView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        # Step 3: Validate elevators data
+        # Step 3: Validate elevators data (one duplicate check and one technician lookup)
         elevators_data = required_fields["elevators"]
-        elevator_errors = []
-        
-        for index, elevator_data in enumerate(elevators_data):
-            required_elevator_fields = [
-                'user_name', 'capacity', 'machine_number', 
-                'manufacturer', 'installation_date'
-            ]
-            errors = {}
-            
-            for field in required_elevator_fields:
-                if not elevator_data.get(field):
-                    errors[field] = ["This field is required."]
-
-            # Check duplicate machine number
-            machine_number = elevator_data.get("machine_number")
-            if machine_number and Elevator.objects.filter(machine_number=machine_number).exists():
-                errors["machine_number"] = [
-                    f"Elevator with machine number {machine_number} already exists."
-                ]
-
-            # Validate installation date
-            installation_date = elevator_data.get("installation_date")
-            try:
-                if isinstance(installation_date, str):
-                    datetime.strptime(installation_date, "%Y-%m-%d").date()
-            except (ValueError, TypeError):
-                errors["installation_date"] = ["Invalid date format. Use YYYY-MM-DD."]
-
-            if errors:
-                elevator_errors.append({f"elevator_{index}": errors})
-
-        if elevator_errors:
+        errors, technicians = ElevatorRegistrationService.validate(elevators_data, company)
+        if errors:
             return Response(
-                {"elevators": elevator_errors}, 
+                {"elevators": [{f"elevator_{index}": errors[index]} for index in sorted(errors)]},
                 status=status.HTTP_400_BAD_REQUEST
             )
-
-        try:
-            # Step 4: Create building
-            new_building = Building.objects.create(
-                name=required_fields["name"],
-                address=required_fields["address"],
-                contact=required_fields["contact"],
-                developer=developer
+        if ElevatorRegistrationService.missing_technicians(elevators_data, technicians):
+            return Response(
+                {"elevators": {"technician_id": ["Technician not found or invalid UUID format"]}},
+                status=status.HTTP_404_NOT_FOUND
             )
 
-            # Step 4.1: Send alert to developer about building registration
-            try:
-                AlertService.create_building_registration_alert(
-                    building=new_building,
-                    company=company,
+        try:
+            # Steps 4-5: Create the building and all its elevators together, so a failure
+            # never leaves a partially registered building behind
+            with transaction.atomic():
+                new_building = Building.objects.create(
+                    name=required_fields["name"],
+                    address=required_fields["address"],
+                    contact=required_fields["contact"],
                     developer=developer
                 )
-            except Exception as e:
-                logger.error(f"Failed to create building registration alert: {str(e)}")
-
-            # Step 5: Create elevators and send alerts
-            created_elevators = []
-            for elevator_data in elevators_data:
-                # Validate technician if provided
-                technician = None
-                technician_id = elevator_data.get("technician_id")
-                if technician_id:
-                    try:
-                        technician = TechnicianProfile.objects.get(
-                            id=technician_id, 
-                            maintenance_company=company
-                        )
-                    except (TechnicianProfile.DoesNotExist, ValidationError, ValueError):
-                        return Response(
-                            {"elevators": {"technician_id": ["Technician not found or invalid UUID format"]}}, 
-                            status=status.HTTP_404_NOT_FOUND
-                        )
+                new_elevators = ElevatorRegistrationService.register(
+                    elevators_data, new_building, company, developer, technicians
+                )
 
-                # Create elevator
-                installation_date = datetime.strptime(
-                    elevator_data["installation_date"], 
-                    "%Y-%m-%d"
-                ).date()
-                
-                new_elevator = Elevator.objects.create(
-                    user_name=elevator_data["user_name"],
-                    capacity=elevator_data["capacity"],
-                    machine_number=elevator_data["machine_number"],
-                    manufacturer=elevator_data["manufacturer"],
-                    installation_date=installation_date,
+                # Queue alerts to developer and company about building registration, one
+                # digest per assigned technician and one about the elevators; they are
+                # written in the background once the transaction commits
+                alerts = AlertService.building_registration_alerts(
                     building=new_building,
-                    maintenance_company=company,
-                    technician=technician,
+                    company=company,
                     developer=developer
                 )
-
-                # Send alert if technician is assigned
-                if technician:
-                    try:
-                        AlertService.create_alert(
-                            alert_type=AlertType.ELEVATOR_ASSIGNED,
-                            recipient=technician,
-                            related_object=new_elevator,
-                            message=f"New elevator {new_elevator.machine_number} has been assigned to you in building {new_building.name}"
-                        )
-                    except Exception as e:
-                        logger.error(f"Failed to create elevator assignment alert: {str(e)}")
-
-                created_elevators.append({
-                    "id": str(new_elevator.id),
-                    "user_name": new_elevator.user_name,
-                    "machine_number": new_elevator.machine_number,
-                    "capacity": new_elevator.capacity,
-                    "manufacturer": new_elevator.manufacturer,
-                    "installation_date": new_elevator.installation_date.isoformat(),
-                    "technician": {
-                        "id": str(technician.id) if technician else None,
-                        "name": (f"{technician.user.first_name} {technician.user.last_name}" 
-                               if technician else None)
-                    }
-                })
-
-            # Send alert to developer about elevator registration
-            try:
-                AlertService.create_alert(
+                alerts += [
+                    AlertService.build_alert(
+                        alert_type=AlertType.ELEVATOR_ASSIGNED,
+                        recipient=elevator.technician,
+                        related_object=new_building,
+                        message=f"New elevator {elevator.machine_number} has been assigned to you in building {new_building.name}"
+                    )
+                    for elevator in new_elevators if elevator.technician
+                ]
+                alerts.append(AlertService.build_alert(
                     alert_type=AlertType.ELEVATOR_REGISTERED,
                     recipient=developer,
                     related_object=new_building,
-                    message=f"{len(created_elevators)} elevator(s) have been registered to {company.company_name} in building {new_building.name}"
-                )
-            except Exception as e:
-                logger.error(f"Failed to create elevator registration alert: {str(e)}")
+                    message=f"{len(new_elevators)} elevator(s) have been registered to {company.company_name} in building {new_building.name}"
+                ))
+                AlertService.enqueue_alerts(alerts)
+
+            created_elevators = [{
+                "id": str(elevator.id),
+                "user_name": elevator.user_name,
+                "machine_number": elevator.machine_number,
+                "capacity": elevator.capacity,
+                "manufacturer": elevator.manufacturer,
+                "installation_date": elevator.installation_date.isoformat(),
+                "technician": {
+                    "id": str(elevator.technician.id) if elevator.technician else None,
+                    "name": (f"{elevator.technician.user.first_name} {elevator.technician.user.last_name}"
+                           if elevator.technician else None)
+                }
+            } for elevator in new_elevators]
 
             # Return response data
             return Response({
@@ -609,6 +554,63 @@ class AddBuildingView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+class FleetImportView(APIView):
+    """
+    Upload a CSV or NDJSON file of buildings and elevators to onboard in bulk. The upload
+    is streamed to storage and imported in the background; poll the returned import for
+    progress and rejected rows.
+    """
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [Custom401SessionAuthentication, Custom401JWTAuthentication]
+    parser_classes = [MultiPartParser]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Start a fleet import. Each row holds developer_id, building_name, building_address, "
+            "building_contact, user_name, machine_number, capacity, manufacturer, installation_date "
+            "and optionally controller_type, machine_type, technician_id, first_maintenance_date "
+            "and maintenance_interval."
+        ),
+        manual_parameters=[
+            openapi.Parameter('company_uuid', openapi.IN_PATH,
+                description="UUID of the maintenance company", type=openapi.TYPE_STRING),
+            openapi.Parameter('file', openapi.IN_FORM, type=openapi.TYPE_FILE, required=True,
+                description="CSV or NDJSON file"),
+            openapi.Parameter('format', openapi.IN_FORM, type=openapi.TYPE_STRING, enum=['csv', 'ndjson'],
+                description="File format (default: from the file extension)"),
+        ],
+        responses={202: FleetImportSerializer, 400: "Bad Request", 404: "Not Found"}
+    )
+    def post(self, request, company_uuid: UUID):
+        company = MaintenanceCompanyProfile.objects.filter(id=company_uuid).first()
+        if company is None:
+            return Response({"error": "Company not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        source = request.FILES.get("file")
+        if source is None:
+            return Response({"file": ["This field is required."]}, status=status.HTTP_400_BAD_REQUEST)
+        format = request.data.get("format")
+        if format and format not in dict(FleetImport.FORMAT_CHOICES):
+            return Response({"format": ["Format must be csv or ndjson."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        fleet_import = FleetImportService.create_import(company, source, format)
+        return Response(FleetImportSerializer(fleet_import).data, status=status.HTTP_202_ACCEPTED)
+
+
+class FleetImportDetailView(APIView):
+    """Progress and per-row errors of a fleet import."""
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [Custom401SessionAuthentication, Custom401JWTAuthentication]
+
+    @swagger_auto_schema(
+        operation_description="Retrieve the progress of a fleet import",
+        responses={200: FleetImportSerializer, 404: "Not Found"}
+    )
+    def get(self, request, company_uuid: UUID, import_uuid: UUID):
+        fleet_import = get_object_or_404(FleetImport, id=import_uuid, maintenance_company_id=company_uuid)
+        return Response(FleetImportSerializer(fleet_import).data)
+
+
 class BuildingListView(generics.ListAPIView):
     """Retrieve a list of buildings linked to a maintenance company."""
     permission_classes = [AllowAny]
@@ -843,6 +845,27 @@ class BuildingsUnderDeveloperView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+class ElevatorsUnderCompanyExportView(APIView):
+    """Stream every elevator maintained by a company as CSV or NDJSON."""
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [Custom401SessionAuthentication, Custom401JWTAuthentication]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Export a maintenance company's elevators as CSV or NDJSON, in the fleet import "
+            "format. The date range applies to the installation date."
+        ),
+        manual_parameters=EXPORT_PARAMETERS,
+        responses={200: "CSV or NDJSON file", 400: "Bad Request", 404: "Not Found"}
+    )
+    def get(self, request, company_id):
+        company = get_object_or_404(MaintenanceCompanyProfile, id=company_id)
+        return FleetExportService.export_elevators(
+            Elevator.objects.filter(maintenance_company=company),
+            request.query_params,
+            filename=f"elevators-{company.id}",
+        )
+
 class ElevatorsUnderCompanyView(APIView):
     permission_classes = [AllowAny]  # Adjust as necessary for authentication and authorization
 
@@ -868,6 +891,11 @@ class ElevatorsUnderCompanyView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
+        if KeysetPagination.is_requested(request):
+            paginator = KeysetPagination(ordering=('machine_number', 'id'))
+            page = paginator.paginate_queryset(elevators, request, view=self)
+            return paginator.get_paginated_response(ElevatorSerializer(page, many=True).data)
+
         # Serialize and return the data
         serialized_data = ElevatorSerializer(elevators, many=True)
         return Response(serialized_data.data, status=status.HTTP_200_OK)
@@ -894,6 +922,11 @@ class ElevatorsInBuildingView(APIView):
             if not elevators.exists():
                 raise NotFound(detail="No elevators found for this building under the specified maintenance company.", code=404)
 
+            if KeysetPagination.is_requested(request):
+                paginator = KeysetPagination(ordering=('machine_number', 'id'))
+                page = paginator.paginate_queryset(elevators, request, view=self)
+                return paginator.get_paginated_response(ElevatorSerializer(page, many=True).data)
+
             # Step 6: Serialize the elevator data
             serialized_data = ElevatorSerializer(elevators, many=True)
 
@@ -1369,8 +1402,8 @@ class UpdateTechnicianOnBuildingsView(APIView):
                 # Update elevators
                 elevators.update(technician=technician)
                 
-                # Create alert for the new technician
-                AlertService.create_alert(
+                # Alert for the new technician
+                alerts = [AlertService.build_alert(
                     alert_type=AlertType.TECHNICIAN_UPDATED_FOR_BUILDING,
                     recipient=technician,
                     related_object=building,
@@ -1378,11 +1411,11 @@ class UpdateTechnicianOnBuildingsView(APIView):
                         f"You have been assigned to maintain all elevators in "
                         f"building {building.name}"
                     )
-                )
+                )]
 
-                # Create alert for the previous technician if exists
+                # Alert for the previous technician if exists
                 if previous_technician and previous_technician != technician:
-                    AlertService.create_alert(
+                    alerts.append(AlertService.build_alert(
                         alert_type=AlertType.TECHNICIAN_UPDATED_FOR_BUILDING,
                         recipient=previous_technician,
                         related_object=building,
@@ -1390,10 +1423,10 @@ class UpdateTechnicianOnBuildingsView(APIView):
                             f"You have been unassigned from maintaining elevators in "
                             f"building {building.name}"
                         )
-                    )
+                    ))
 
-                # Create alert for the maintenance company
-                AlertService.create_alert(
+                # Alert for the maintenance company
+                alerts.append(AlertService.build_alert(
                     alert_type=AlertType.TECHNICIAN_UPDATED_FOR_BUILDING,
                     recipient=company,
                     related_object=building,
@@ -1401,7 +1434,10 @@ class UpdateTechnicianOnBuildingsView(APIView):
                         f"Technician {technician_name} has been assigned "
                         f"to all elevators in building {building.name}"
                     )
-                )
+                ))
+
+                # Written in the background once the update commits
+                AlertService.enqueue_alerts(alerts)
 
             # Step 6: Serialize and return the updated elevator data
             updated_elevators = Elevator.objects.filter(building=building, maintenance_company=company)
@@ -1525,12 +1561,6 @@ class UpdateTechnicianOnElevatorView(APIView):
                     message=f"Elevator {elevator.machine_number} in building {elevator.building.name} has been assigned to you"
                 )
                 logger.info(f"Alert created successfully with ID: {alert.id} for technician {new_tech_name}")
-                
-                # Verify alert was created
-                if Alert.objects.filter(id=alert.id).exists():
-                    logger.info(f"Alert {alert.id} verified in database")
-                else:
-                    logger.error(f"Alert {alert.id} not found in database after creation")
                     
             except Exception as alert_error:
                 logger.error(f"Failed to create alert: {str(alert_error)}", exc_info=True)
@@ -1585,6 +1615,7 @@ class RemoveMaintenanceFromBuildingElevatorsView(APIView):
                 elevator__in=affected_elevators,
                 status__in=['scheduled', 'overdue']
             )
+            UnifiedScheduleService.for_queryset(affected_schedules).update(maintenance_company=None, technician=None)
             affected_schedules_updated = affected_schedules.update(maintenance_company=None, technician=None)
 
             # Step 2: Update the elevators by removing the maintenance company
@@ -1667,6 +1698,7 @@ class RemoveMaintenanceFromDeveloperElevatorsView(APIView):
         affected_schedules_count = affected_schedules.count()
 
         # Remove the maintenance company and technician from schedules
+        UnifiedScheduleService.for_queryset(affected_schedules).update(maintenance_company=None, technician=None)
         affected_schedules.update(maintenance_company=None, technician=None)
 
         # Step 2: Update the elevators
@@ -6,6 +6,8 @@ from .models import (
     RevenueSplit,
     BrokerBalance,
     WithdrawalRequest,
+    BrokerLedgerEntry,
+    BrokerBalanceSnapshot,
     PaymentSettings
 )
 
@@ -19,9 +21,9 @@ class PaymentPlanAdmin(admin.ModelAdmin):
 
 @admin.register(ExpectedPayment)
 class ExpectedPaymentAdmin(admin.ModelAdmin):
-    list_display = ("id", "maintenance_company", "total_amount", "status", "calculation_date", "due_date")
+    list_display = ("id", "maintenance_company", "billing_period", "total_amount", "status", "calculation_date", "due_date")
     search_fields = ("maintenance_company__company_name",)
-    list_filter = ("status", "calculation_date", "due_date")
+    list_filter = ("status", "billing_period", "calculation_date", "due_date")
     ordering = ("-calculation_date",)
 
 @admin.register(Payment)
@@ -33,7 +35,7 @@ class PaymentAdmin(admin.ModelAdmin):
 
 @admin.register(RevenueSplit)
 class RevenueSplitAdmin(admin.ModelAdmin):
-    list_display = ("id", "payment", "total_revenue", "broker_commission", "company_earnings", "split_date")
+    list_display = ("id", "payment", "broker", "total_revenue", "broker_commission", "company_earnings", "split_date")
     search_fields = ("payment__transaction_id",)
     ordering = ("-split_date",)
 
@@ -50,6 +52,25 @@ class WithdrawalRequestAdmin(admin.ModelAdmin):
     list_filter = ("status", "request_date")
     ordering = ("-request_date",)
 
+@admin.register(BrokerLedgerEntry)
+class BrokerLedgerEntryAdmin(admin.ModelAdmin):
+    list_display = ("id", "broker", "entry_type", "amount", "recorded_at")
+    search_fields = ("broker__email",)
+    list_filter = ("entry_type", "recorded_at")
+    ordering = ("-recorded_at",)
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+@admin.register(BrokerBalanceSnapshot)
+class BrokerBalanceSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("id", "broker", "total_earnings", "total_withdrawn", "recorded_up_to")
+    search_fields = ("broker__email",)
+    ordering = ("-recorded_up_to",)
+
 @admin.register(PaymentSettings)
 class PaymentSettingsAdmin(admin.ModelAdmin):
     list_display = ("id", "min_charge_per_elevator", "default_commission", "default_commission_duration", "default_calculation_date", "default_due_date")
@@ -0,0 +1,121 @@
+"""
+Cached access to payment configuration.
+
+PaymentSettings and broker commission settings are read on every billing and commission
+calculation but change rarely. Each value is kept at two levels: a process-local copy
+and a copy in the shared Django cache, both tagged with a version number stored in the
+shared cache. Saving a PaymentSettings row or a broker bumps the matching version once
+the transaction commits, so every process drops its copy on its next version check.
+
+A process trusts its local copy for PAYMENT_SETTINGS_LOCAL_TTL seconds before checking
+the version again, so hot paths touch neither the database nor the shared cache. CACHES
+points at Redis so that version bumps reach every web and worker process. While the
+shared cache is unreachable, values are read from the database on every call.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+PAYMENT_SETTINGS_KEY = 'payments:settings'
+BROKER_COMMISSION_KEY = 'payments:broker-commission:{broker_id}'
+
+# Fields of BrokerUser cached as its commission settings
+BROKER_COMMISSION_FIELDS = [
+    'id', 'first_name', 'last_name', 'referral_code',
+    'commission_percentage', 'commission_duration_months', 'registration_date',
+]
+
+# Stored in the shared cache in place of a missing row, which None cannot represent
+MISSING = 'missing'
+
+_local = {}
+_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+def get_version(key):
+    """The current version of key in the shared cache, starting it at 1 if unset."""
+    version = cache.get(f'{key}:version')
+    if version is None:
+        cache.add(f'{key}:version', 1, timeout=None)
+        version = cache.get(f'{key}:version', 1)
+    return version
+
+
+def bump_version(key):
+    """Invalidate every cached copy of key, in this process and in all others."""
+    try:
+        try:
+            cache.incr(f'{key}:version')
+        except ValueError:
+            cache.add(f'{key}:version', 1, timeout=None)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate cached {key}: {str(e)}")
+    with _lock:
+        _local.pop(key, None)
+
+
+def get_cached(key, load):
+    """
+    The value of key, from this process if checked within the local TTL, else from
+    the shared cache at the current version, else from load().
+    """
+    now = time.monotonic()
+    entry = _local.get(key)
+    if entry is not None and now - entry[2] < settings.PAYMENT_SETTINGS_LOCAL_TTL:
+        return entry[1]
+
+    try:
+        version = get_version(key)
+        if entry is not None and entry[0] == version:
+            value = entry[1]
+        else:
+            value = cache.get(f'{key}:{version}')
+            if value is None:
+                value = load()
+                cache.set(f'{key}:{version}', MISSING if value is None else value, settings.PAYMENT_SETTINGS_CACHE_TIMEOUT)
+            elif value == MISSING:
+                value = None
+    except Exception as e:
+        # Without the shared version a local copy could go stale unnoticed, so keep none
+        logger.warning(f"Shared cache unavailable for {key}: {str(e)}")
+        return load()
+
+    with _lock:
+        _local[key] = (version, value, now)
+    return value
+
+
+def get_payment_settings():
+    """The system PaymentSettings, or None when none have been configured."""
+    from payments.models import PaymentSettings
+
+    return get_cached(PAYMENT_SETTINGS_KEY, lambda: PaymentSettings.objects.first())
+
+
+def get_broker_commission_settings(broker_id):
+    """{field: value} of BROKER_COMMISSION_FIELDS for the broker, or None if it does not exist."""
+    from brokers.models import BrokerUser
+
+    return get_cached(
+        BROKER_COMMISSION_KEY.format(broker_id=broker_id),
+        lambda: BrokerUser.objects.filter(id=broker_id).values(*BROKER_COMMISSION_FIELDS).first(),
+    )
+
+
+def invalidate_payment_settings():
+    bump_version(PAYMENT_SETTINGS_KEY)
+
+
+def invalidate_broker_commission_settings(broker_id):
+    bump_version(BROKER_COMMISSION_KEY.format(broker_id=broker_id))
+
+
+def clear_local():
+    """Drop this process's copies, leaving the shared cache alone."""
+    with _lock:
+        _local.clear()
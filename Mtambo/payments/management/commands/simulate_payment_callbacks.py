@@ -0,0 +1,98 @@
+import json
+import random
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from maintenance_companies.models import MaintenanceCompanyProfile
+from payments.models import ExpectedPayment
+from payments.providers import SignedPaymentProvider
+from payments.serializers import PaymentNotificationSerializer
+from payments.services import PaymentIngestionService
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate bursts of payment provider callbacks for load testing. Notifications pay "
+        "the open expected payments of existing companies, with a share of redelivered "
+        "duplicates. They are ingested in-process, or posted to --url as signed callbacks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=10000, help="Notifications to send")
+        parser.add_argument('--batch-size', type=int, default=500, help="Notifications per callback")
+        parser.add_argument('--duplicate-rate', type=float, default=0.1, help="Share of notifications redelivered")
+        parser.add_argument('--url', help="Payment ingestion endpoint to post callbacks to")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] > settings.PAYMENT_INGEST_MAX_BATCH:
+            raise CommandError(f"--batch-size may not exceed {settings.PAYMENT_INGEST_MAX_BATCH}.")
+
+        open_payments = list(
+            ExpectedPayment.objects.filter(status__in=PaymentIngestionService.OPEN_STATUSES)
+            .values_list('maintenance_company_id', 'total_amount')
+        )
+        if not open_payments:
+            open_payments = [
+                (company_id, 700) for company_id in MaintenanceCompanyProfile.objects.values_list('id', flat=True)
+            ]
+        if not open_payments:
+            raise CommandError("There are no maintenance companies to simulate payments for.")
+
+        notifications = self.generate(open_payments, options['count'], options['duplicate_rate'])
+        send = self.post if options['url'] else self.ingest
+
+        totals = {"created": 0, "duplicates": 0, "expected_payments_paid": 0, "rejected": 0}
+        started = time.monotonic()
+        for start in range(0, len(notifications), options['batch_size']):
+            result = send(notifications[start:start + options['batch_size']], options['url'])
+            for key in totals:
+                totals[key] += len(result[key]) if key == "rejected" else result[key]
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Sent {len(notifications)} notifications in {elapsed:.2f}s "
+            f"({len(notifications) / max(elapsed, 1e-9):.0f}/s): {totals['created']} payments created, "
+            f"{totals['duplicates']} duplicates skipped, {totals['expected_payments_paid']} expected "
+            f"payments paid, {totals['rejected']} rejected."
+        ))
+
+    def generate(self, open_payments, count, duplicate_rate):
+        notifications = []
+        for _ in range(count):
+            if notifications and random.random() < duplicate_rate:
+                notifications.append(random.choice(notifications))
+                continue
+            company_id, amount = random.choice(open_payments)
+            notifications.append({
+                "transaction_id": f"SIM{uuid.uuid4().hex[:16].upper()}",
+                "maintenance_company_id": str(company_id),
+                "amount": str(amount),
+                "payment_method": random.choice(['mpesa', 'bank']),
+            })
+        return notifications
+
+    def ingest(self, batch, url=None):
+        valid = []
+        for notification in batch:
+            serializer = PaymentNotificationSerializer(data=notification)
+            serializer.is_valid(raise_exception=True)
+            valid.append(serializer.validated_data)
+        return PaymentIngestionService.ingest(valid)
+
+    def post(self, batch, url):
+        body = json.dumps(batch).encode()
+        signature = SignedPaymentProvider(settings.PAYMENT_CALLBACK_SECRET).sign(body)
+        request = urllib.request.Request(url, data=body, method='POST', headers={
+            'Content-Type': 'application/json',
+            SignedPaymentProvider.SIGNATURE_HEADER: signature,
+        })
+        try:
+            with urllib.request.urlopen(request) as response:
+                return json.loads(response.read())
+        except urllib.error.URLError as e:
+            raise CommandError(f"Callback to {url} failed: {e}")
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.4 on 2026-10-17 05:24
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elevators', '0006_fleetimport'),
+        ('maintenance_companies', '0004_alter_maintenancecompanyprofile_user'),
+        ('payments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='expectedpayment',
+            name='billing_period',
+            field=models.DateField(blank=True, help_text='First day of the month this payment bills for.', null=True),
+        ),
+        migrations.AlterField(
+            model_name='expectedpayment',
+            name='total_amount',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AddConstraint(
+            model_name='expectedpayment',
+            constraint=models.UniqueConstraint(fields=('maintenance_company', 'billing_period'), name='unique_expected_payment_per_period'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.4 on 2026-10-17 05:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('brokers', '0001_initial'),
+        ('payments', '0002_expected_payment_billing_period'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='revenuesplit',
+            name='broker',
+            field=models.ForeignKey(blank=True, help_text='Broker earning a commission on the payment, if any.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='revenue_splits', to='brokers.brokeruser'),
+        ),
+        migrations.AddConstraint(
+            model_name='revenuesplit',
+            constraint=models.UniqueConstraint(fields=('payment',), name='unique_revenue_split_per_payment'),
+        ),
+    ]
@@ -0,0 +1,121 @@
+# Generated by Django 5.1.4 on 2026-10-17 05:34
+
+import django.db.models.deletion
+import django.utils.timezone
+import itertools
+import uuid
+from django.db import migrations, models
+
+
+def merge_duplicate_balances(apps, schema_editor):
+    """Keep only the most recently updated balance of each broker."""
+    BrokerBalance = apps.get_model('payments', 'BrokerBalance')
+    seen = set()
+    duplicates = []
+    for balance_id, broker_id in BrokerBalance.objects.order_by('broker_id', '-last_updated').values_list('id', 'broker_id'):
+        if broker_id in seen:
+            duplicates.append(balance_id)
+        seen.add(broker_id)
+    BrokerBalance.objects.filter(id__in=duplicates).delete()
+
+
+def backfill_broker_ledger(apps, schema_editor):
+    RevenueSplit = apps.get_model('payments', 'RevenueSplit')
+    WithdrawalRequest = apps.get_model('payments', 'WithdrawalRequest')
+    BrokerLedgerEntry = apps.get_model('payments', 'BrokerLedgerEntry')
+    BrokerBalance = apps.get_model('payments', 'BrokerBalance')
+
+    commissions = (
+        BrokerLedgerEntry(
+            broker_id=split.broker_id, entry_type='commission', amount=split.broker_commission,
+            revenue_split_id=split.id, recorded_at=split.split_date,
+        )
+        for split in RevenueSplit.objects.filter(broker__isnull=False).iterator(chunk_size=1000)
+    )
+    withdrawals = (
+        BrokerLedgerEntry(
+            broker_id=withdrawal.broker_id, entry_type='withdrawal', amount=-withdrawal.amount,
+            withdrawal_request_id=withdrawal.id, recorded_at=withdrawal.request_date,
+        )
+        for withdrawal in WithdrawalRequest.objects.filter(status='approved').iterator(chunk_size=1000)
+    )
+    BrokerLedgerEntry.objects.bulk_create(itertools.chain(commissions, withdrawals), batch_size=1000)
+
+    # Ledger writers lock the broker's balance row, so every broker with entries needs one
+    brokers = set(BrokerLedgerEntry.objects.values_list('broker_id', flat=True).distinct())
+    brokers -= set(BrokerBalance.objects.values_list('broker_id', flat=True))
+    BrokerBalance.objects.bulk_create([BrokerBalance(broker_id=broker_id) for broker_id in brokers])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('brokers', '0001_initial'),
+        ('payments', '0003_revenue_split_broker'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BrokerBalanceSnapshot',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('total_earnings', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('total_withdrawn', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('recorded_up_to', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Broker Balance Snapshot',
+                'verbose_name_plural': 'Broker Balance Snapshots',
+                'ordering': ['-recorded_up_to'],
+            },
+        ),
+        migrations.CreateModel(
+            name='BrokerLedgerEntry',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('entry_type', models.CharField(choices=[('commission', 'Commission'), ('withdrawal', 'Withdrawal')], max_length=20)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('recorded_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Broker Ledger Entry',
+                'verbose_name_plural': 'Broker Ledger Entries',
+                'ordering': ['recorded_at'],
+            },
+        ),
+        migrations.RunPython(merge_duplicate_balances, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='brokerbalance',
+            constraint=models.UniqueConstraint(fields=('broker',), name='unique_broker_balance'),
+        ),
+        migrations.AddField(
+            model_name='brokerbalancesnapshot',
+            name='broker',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balance_snapshots', to='brokers.brokeruser'),
+        ),
+        migrations.AddField(
+            model_name='brokerledgerentry',
+            name='broker',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_entries', to='brokers.brokeruser'),
+        ),
+        migrations.AddField(
+            model_name='brokerledgerentry',
+            name='revenue_split',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='ledger_entry', to='payments.revenuesplit'),
+        ),
+        migrations.AddField(
+            model_name='brokerledgerentry',
+            name='withdrawal_request',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='ledger_entry', to='payments.withdrawalrequest'),
+        ),
+        migrations.AddIndex(
+            model_name='brokerbalancesnapshot',
+            index=models.Index(fields=['broker', '-recorded_up_to'], name='broker_snapshot_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='brokerledgerentry',
+            index=models.Index(fields=['broker', 'recorded_at'], name='broker_ledger_idx'),
+        ),
+        migrations.RunPython(backfill_broker_ledger, migrations.RunPython.noop),
+    ]
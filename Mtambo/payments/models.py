@@ -1,5 +1,7 @@
 import uuid
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 from maintenance_companies.models import MaintenanceCompanyProfile
@@ -43,9 +45,15 @@ class ExpectedPayment(models.Model):
         MaintenanceCompanyProfile, on_delete=models.CASCADE, related_name="expected_payments"
     )
     assets = models.ManyToManyField(Elevator, related_name="expected_payments")
+    billing_period = models.DateField(
+        null=True,
+        blank=True,
+        help_text="First day of the month this payment bills for."
+    )
     total_amount = models.DecimalField(
         max_digits=10,
         decimal_places=2,
+        default=0,
         validators=[MinValueValidator(0)],
     )
     calculation_date = models.DateTimeField(default=timezone.now)
@@ -53,15 +61,33 @@ class ExpectedPayment(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     payment_date = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['maintenance_company', 'billing_period'],
+                name='unique_expected_payment_per_period'
+            ),
+        ]
+
     def save(self, *args, **kwargs):
-        if not self.pk:
-            self.calculation_date = timezone.now().replace(day=25, hour=0, minute=0, second=0, microsecond=0)
-            next_month = self.calculation_date.replace(day=28) + timezone.timedelta(days=4)
-            self.due_date = next_month.replace(day=5, hour=23, minute=59, second=59)
-            payment_plan = self.maintenance_company.payment_plans.first()
-            self.total_amount = (payment_plan.amount_per_asset if payment_plan else 700.00) * self.assets.count()
+        if self._state.adding and self.due_date is None:
+            from .services import BillingService
+            period = self.billing_period or self.calculation_date.date().replace(day=1)
+            self.calculation_date, self.due_date = BillingService.get_period_dates(period)
         super().save(*args, **kwargs)
 
+    def calculate_total(self):
+        """
+        Set total_amount from the linked assets and the company's plan rate. The assets
+        must be linked first, so call this after assets.set() rather than from save().
+        """
+        from .services import BillingService
+        rate = BillingService.get_rates([self.maintenance_company_id], self.calculation_date).get(
+            self.maintenance_company_id, BillingService.get_default_rate()
+        )
+        self.total_amount = rate * self.assets.count()
+        return self.total_amount
+
     def update_status(self):
         self.status = 'paid' if self.payment_date else ('overdue' if timezone.now() > self.due_date else 'pending')
         self.save()
@@ -99,18 +125,28 @@ class RevenueSplit(models.Model):
     """
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     payment = models.ForeignKey(Payment, on_delete=models.CASCADE, related_name="revenue_splits")
+    broker = models.ForeignKey(
+        BrokerUser, on_delete=models.SET_NULL, related_name="revenue_splits", null=True, blank=True,
+        help_text="Broker earning a commission on the payment, if any."
+    )
     total_revenue = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
     broker_commission = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
     company_earnings = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
     split_date = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['payment'], name='unique_revenue_split_per_payment'),
+        ]
+
     def __str__(self):
         return f"Revenue Split for Payment ID: {self.payment.id}"
 
 
 class BrokerBalance(models.Model):
     """
-    Tracks broker financial balances.
+    Tracks broker financial balances. The totals are copied from the broker's latest
+    BrokerBalanceSnapshot; the row is also locked to serialize ledger writes per broker.
     """
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     broker = models.ForeignKey(BrokerUser, on_delete=models.CASCADE, related_name="balances")
@@ -119,6 +155,11 @@ class BrokerBalance(models.Model):
     withdrawable_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     last_updated = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['broker'], name='unique_broker_balance'),
+        ]
+
 
 class WithdrawalRequest(models.Model):
     """
@@ -132,6 +173,70 @@ class WithdrawalRequest(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
 
 
+class BrokerLedgerEntry(models.Model):
+    """
+    Append-only record of money credited to or debited from a broker. Commissions are
+    positive and approved withdrawals negative; entries are never updated or deleted.
+    """
+    ENTRY_TYPES = [('commission', 'Commission'), ('withdrawal', 'Withdrawal')]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    broker = models.ForeignKey(BrokerUser, on_delete=models.CASCADE, related_name="ledger_entries")
+    entry_type = models.CharField(max_length=20, choices=ENTRY_TYPES)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    revenue_split = models.OneToOneField(
+        RevenueSplit, on_delete=models.PROTECT, related_name="ledger_entry", null=True, blank=True
+    )
+    withdrawal_request = models.OneToOneField(
+        WithdrawalRequest, on_delete=models.PROTECT, related_name="ledger_entry", null=True, blank=True
+    )
+    recorded_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Broker Ledger Entry"
+        verbose_name_plural = "Broker Ledger Entries"
+        ordering = ['recorded_at']
+        indexes = [
+            models.Index(fields=['broker', 'recorded_at'], name='broker_ledger_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise IntegrityError("Broker ledger entries are append-only.")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.get_entry_type_display()} of Kshs. {self.amount} for {self.broker.email}"
+
+
+class BrokerBalanceSnapshot(models.Model):
+    """
+    A broker's ledger totals up to recorded_up_to. The current balance is the latest
+    snapshot plus the entries recorded after it.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    broker = models.ForeignKey(BrokerUser, on_delete=models.CASCADE, related_name="balance_snapshots")
+    total_earnings = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    total_withdrawn = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    recorded_up_to = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Broker Balance Snapshot"
+        verbose_name_plural = "Broker Balance Snapshots"
+        ordering = ['-recorded_up_to']
+        indexes = [
+            models.Index(fields=['broker', '-recorded_up_to'], name='broker_snapshot_idx'),
+        ]
+
+    @property
+    def withdrawable_amount(self):
+        return self.total_earnings - self.total_withdrawn
+
+    def __str__(self):
+        return f"Balance of {self.broker.email} up to {self.recorded_up_to}"
+
+
 class PaymentSettings(models.Model):
     """
     Stores system-wide payment settings.
@@ -143,3 +248,24 @@ class PaymentSettings(models.Model):
     default_calculation_date = models.PositiveIntegerField(default=20, validators=[MinValueValidator(1), MaxValueValidator(31)])
     default_due_date = models.PositiveIntegerField(validators=[MinValueValidator(1), MaxValueValidator(31)])
 
+
+@receiver(post_save, sender=PaymentSettings)
+@receiver(post_delete, sender=PaymentSettings)
+def invalidate_payment_settings_cache(sender, instance, **kwargs):
+    """
+    Drop cached copies now, so this transaction reads its own write, and again on commit,
+    so no other process keeps a copy it loaded before the change was visible.
+    """
+    from .cache import invalidate_payment_settings
+
+    invalidate_payment_settings()
+    transaction.on_commit(invalidate_payment_settings)
+
+
+@receiver(post_save, sender=BrokerUser)
+@receiver(post_delete, sender=BrokerUser)
+def invalidate_broker_commission_cache(sender, instance, **kwargs):
+    from .cache import invalidate_broker_commission_settings
+
+    invalidate_broker_commission_settings(instance.id)
+    transaction.on_commit(lambda: invalidate_broker_commission_settings(instance.id))
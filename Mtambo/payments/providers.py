@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.utils.module_loading import import_string
+from functools import lru_cache
+from rest_framework.exceptions import AuthenticationFailed, ParseError
+import hashlib
+import hmac
+import json
+
+
+class SignedPaymentProvider:
+    """
+    Payment callbacks from the M-PESA and bank gateway, already in the notification
+    format of PaymentNotificationSerializer. The raw body must be signed with
+    PAYMENT_CALLBACK_SECRET: the X-Payment-Signature header carries its HMAC-SHA256
+    hex digest. Callbacks are refused while no secret is configured.
+    """
+    SIGNATURE_HEADER = 'X-Payment-Signature'
+
+    def __init__(self, secret):
+        self.secret = secret.encode() if secret else b''
+
+    def sign(self, body):
+        return hmac.new(self.secret, body, hashlib.sha256).hexdigest()
+
+    def authenticate(self, request):
+        signature = request.headers.get(self.SIGNATURE_HEADER, '')
+        if not self.secret or not hmac.compare_digest(signature, self.sign(request.body)):
+            raise AuthenticationFailed("Invalid payment callback signature.")
+
+    def parse(self, request):
+        """The notifications of a callback: one object or a list of them."""
+        self.authenticate(request)
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            raise ParseError("Payment callback body is not valid JSON.")
+        return data if isinstance(data, list) else [data]
+
+
+class SimulatedPaymentProvider(SignedPaymentProvider):
+    """
+    Accepts unsigned callbacks, for local development and load testing with the
+    simulate_payment_callbacks command. Never enable it in production.
+    """
+
+    def authenticate(self, request):
+        pass
+
+
+@lru_cache(maxsize=None)
+def load_provider(backend, secret):
+    return import_string(backend)(secret)
+
+
+def get_payment_provider():
+    """The provider configured by PAYMENT_PROVIDER_BACKEND and PAYMENT_CALLBACK_SECRET."""
+    return load_provider(settings.PAYMENT_PROVIDER_BACKEND, settings.PAYMENT_CALLBACK_SECRET)
@@ -1,4 +1,5 @@
 # payments/serializers.py
+from decimal import Decimal
 from rest_framework import serializers
 from brokers.models import BrokerUser
 
@@ -45,3 +46,15 @@ class BrokerCommissionSettingsSerializer(serializers.ModelSerializer):
             'commission_percentage', 'commission_duration_months', 'registration_date'
         ]
         read_only_fields = ['first_name', 'last_name', 'referral_code', 'registration_date']  # These fields cannot be updated
+
+
+class PaymentNotificationSerializer(serializers.Serializer):
+    """
+    Serializer for validating one payment notification from a payment callback.
+    """
+    transaction_id = serializers.CharField(max_length=100, help_text="Provider transaction ID, unique per payment.")
+    maintenance_company_id = serializers.UUIDField(help_text="ID of the paying maintenance company.")
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal('0'))
+    payment_method = serializers.ChoiceField(choices=['mpesa', 'bank', 'other'], default='mpesa')
+    payment_date = serializers.DateTimeField(required=False)
+    is_successful = serializers.BooleanField(default=True)
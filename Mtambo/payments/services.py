@@ -0,0 +1,537 @@
+import calendar
+from datetime import date, datetime, time
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.utils import timezone
+
+from elevators.models import Elevator
+from maintenance_companies.models import MaintenanceCompanyProfile
+from .cache import get_payment_settings
+from .models import (
+    BrokerBalance, BrokerBalanceSnapshot, BrokerLedgerEntry, ExpectedPayment, Payment, PaymentPlan,
+    RevenueSplit, WithdrawalRequest
+)
+
+
+class BillingService:
+    """
+    Generates the monthly ExpectedPayment of every maintenance company. Elevators are
+    counted per company in one GROUP BY, each company's active PaymentPlan is applied,
+    and the payments and their asset links are bulk-created. A company is billed at
+    most once per billing period, so a run can be repeated safely.
+    """
+    # Used when no PaymentSettings row exists
+    DEFAULT_CALCULATION_DAY = 25
+    DEFAULT_DUE_DAY = 5
+    DEFAULT_RATE = Decimal('700.00')
+
+    @staticmethod
+    def day_in_month(year, month, day):
+        """day clamped to the length of the month, so day 31 falls on the 30th in April."""
+        return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+    @classmethod
+    def get_days(cls):
+        """(calculation day, due day) of the month from PaymentSettings."""
+        payment_settings = get_payment_settings()
+        if payment_settings is None:
+            return cls.DEFAULT_CALCULATION_DAY, cls.DEFAULT_DUE_DAY
+        return payment_settings.default_calculation_date, payment_settings.default_due_date
+
+    @classmethod
+    def get_default_rate(cls):
+        """Per-elevator rate for companies without an active payment plan."""
+        payment_settings = get_payment_settings()
+        return payment_settings.min_charge_per_elevator if payment_settings else cls.DEFAULT_RATE
+
+    @classmethod
+    def get_period_dates(cls, period, days=None):
+        """
+        (calculation date, due date) of the billing period starting on period. Payments
+        are calculated on the calculation day of the period's month and fall due at the
+        end of the due day of the following month.
+        """
+        calculation_day, due_day = days or cls.get_days()
+        next_year, next_month = (period.year + 1, 1) if period.month == 12 else (period.year, period.month + 1)
+        calculation_date = datetime.combine(cls.day_in_month(period.year, period.month, calculation_day), time.min)
+        due_date = datetime.combine(cls.day_in_month(next_year, next_month, due_day), time(23, 59, 59))
+        return timezone.make_aware(calculation_date), timezone.make_aware(due_date)
+
+    @staticmethod
+    def get_rates(company_ids, when):
+        """
+        {company_id: amount_per_asset} of the plan active on when for each company. When
+        several plans overlap, the one that started last wins.
+        """
+        plans = (
+            PaymentPlan.objects.filter(maintenance_company_id__in=company_ids, start_date__lte=when)
+            .filter(Q(end_date__isnull=True) | Q(end_date__gte=when))
+            .order_by('start_date')
+            .values_list('maintenance_company_id', 'amount_per_asset')
+        )
+        # Later plans overwrite earlier ones
+        return dict(plans)
+
+    @classmethod
+    def get_current_period(cls, today=None):
+        """The billing period due to be generated on today, or None before the calculation day."""
+        today = today or timezone.localdate()
+        calculation_day, _ = cls.get_days()
+        if today < cls.day_in_month(today.year, today.month, calculation_day):
+            return None
+        return today.replace(day=1)
+
+    @classmethod
+    def generate(cls, period, batch_size=1000):
+        """
+        Create the ExpectedPayment of every company with elevators that has not been
+        billed for period yet. Returns the number of payments created.
+        """
+        period = period.replace(day=1)
+        calculation_date, due_date = cls.get_period_dates(period)
+
+        billed = ExpectedPayment.objects.filter(billing_period=period).values('maintenance_company_id')
+        counts = dict(
+            Elevator.objects.filter(maintenance_company__isnull=False)
+            .exclude(maintenance_company_id__in=billed)
+            .values('maintenance_company_id')
+            .annotate(elevators=Count('id'))
+            .order_by()
+            .values_list('maintenance_company_id', 'elevators')
+        )
+        if not counts:
+            return 0
+
+        rates = cls.get_rates(counts, calculation_date)
+        default_rate = cls.get_default_rate()
+        payments = [
+            ExpectedPayment(
+                maintenance_company_id=company_id,
+                billing_period=period,
+                total_amount=rates.get(company_id, default_rate) * elevators,
+                calculation_date=calculation_date,
+                due_date=due_date,
+            )
+            for company_id, elevators in counts.items()
+        ]
+
+        with transaction.atomic():
+            # A concurrent run may have billed some of these companies already; the unique
+            # constraint drops those rows, and only payments created here get asset links.
+            ExpectedPayment.objects.bulk_create(payments, batch_size=batch_size, ignore_conflicts=True)
+            created = dict(
+                ExpectedPayment.objects.filter(billing_period=period, id__in=[payment.id for payment in payments])
+                .values_list('maintenance_company_id', 'id')
+            )
+            Link = ExpectedPayment.assets.through
+            links = [
+                Link(expectedpayment_id=created[company_id], elevator_id=elevator_id)
+                for elevator_id, company_id in Elevator.objects.filter(
+                    maintenance_company_id__in=created
+                ).values_list('id', 'maintenance_company_id').order_by().iterator(chunk_size=batch_size)
+            ]
+            Link.objects.bulk_create(links, batch_size=batch_size)
+        return len(created)
+
+    @classmethod
+    def run(cls, today=None):
+        """Bill the current period once its calculation day has been reached."""
+        period = cls.get_current_period(today)
+        if period is None:
+            return 0
+        return cls.generate(period)
+
+
+class RevenueSplitService:
+    """
+    Settles successful payments into RevenueSplit rows and credits brokers' ledgers.
+    Every unsettled payment in the window is read in one query joined to its company's
+    broker referrals, the commission is worked out with Decimal arithmetic, and the
+    splits and their commission ledger entries are bulk-inserted. A payment is settled
+    at most once, so settling the same window again is a no-op.
+    """
+    CENT = Decimal('0.01')
+
+    @staticmethod
+    def add_months(moment, months):
+        """moment shifted by months calendar months, clamped to the end of shorter months."""
+        month = moment.month - 1 + months
+        year, month = moment.year + month // 12, month % 12 + 1
+        return moment.replace(year=year, month=month, day=min(moment.day, calendar.monthrange(year, month)[1]))
+
+    @classmethod
+    def split(cls, amount, percentage):
+        """(broker commission, company earnings) of amount, rounded to the cent so they add up to it."""
+        commission = (amount * percentage / 100).quantize(cls.CENT, rounding=ROUND_HALF_UP)
+        return commission, amount - commission
+
+    @classmethod
+    def unsettled_payments(cls, since=None, until=None):
+        """
+        Rows of (payment id, amount, payment date, broker id, commission percentage,
+        commission months, referral date) for successful payments without a split. A
+        company referred more than once yields one row per referral, oldest first.
+        """
+        payments = Payment.objects.filter(is_successful=True, revenue_splits__isnull=True)
+        if since is not None:
+            payments = payments.filter(payment_date__gte=since)
+        if until is not None:
+            payments = payments.filter(payment_date__lt=until)
+        return payments.values_list(
+            'id',
+            'amount',
+            'payment_date',
+            'maintenance_company__referral__broker_id',
+            'maintenance_company__referral__commission_percentage',
+            'maintenance_company__referral__commission_duration_months',
+            'maintenance_company__referral__referral_date',
+        ).order_by('id', 'maintenance_company__referral__referral_date')
+
+    @classmethod
+    def build_splits(cls, rows, split_date):
+        """One unsaved RevenueSplit per payment, crediting the first referral whose commission window covers it."""
+        splits = {}
+        for payment_id, amount, paid_at, broker_id, percentage, months, referred_at in rows:
+            current = splits.get(payment_id)
+            if current is not None and current.broker_id is not None:
+                continue
+            earns = broker_id is not None and referred_at <= paid_at < cls.add_months(referred_at, months)
+            commission, earnings = cls.split(amount, percentage) if earns else (Decimal('0.00'), amount)
+            splits[payment_id] = RevenueSplit(
+                payment_id=payment_id,
+                broker_id=broker_id if earns else None,
+                total_revenue=amount,
+                broker_commission=commission,
+                company_earnings=earnings,
+                split_date=split_date,
+            )
+        return list(splits.values())
+
+    @classmethod
+    def settle(cls, since=None, until=None, batch_size=1000):
+        """
+        Split every successful, unsettled payment made in [since, until) and record the
+        commissions in the brokers' ledgers. Returns the number of payments settled by
+        this run; payments another run settled first are not counted.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            splits = cls.build_splits(cls.unsettled_payments(since, until).iterator(chunk_size=batch_size), now)
+            RevenueSplit.objects.bulk_create(splits, batch_size=batch_size, ignore_conflicts=True)
+            # Splits missing after the insert lost the conflict to another run
+            saved = set(RevenueSplit.objects.filter(id__in=[split.id for split in splits]).values_list('id', flat=True))
+            splits = [split for split in splits if split.id in saved]
+            BrokerLedgerService.record_commissions(splits, batch_size)
+        return len(splits)
+
+
+class BrokerLedgerService:
+    """
+    Reads and writes the append-only broker ledger. A broker's balance is their latest
+    BrokerBalanceSnapshot plus the few entries recorded after it, so reading it costs
+    two indexed queries however long the history is.
+
+    Every writer locks the broker's BrokerBalance row before stamping its entries, and
+    snapshots are cut under the same locks, so an entry can never be recorded before a
+    snapshot's cutoff yet commit after it.
+    """
+    ZERO = Decimal('0.00')
+
+    @staticmethod
+    def lock_balances(broker_ids):
+        """Create any missing BrokerBalance rows of the brokers and lock them. Call inside a transaction."""
+        broker_ids = sorted(broker_ids, key=str)
+        BrokerBalance.objects.bulk_create(
+            [BrokerBalance(broker_id=broker_id) for broker_id in broker_ids], ignore_conflicts=True
+        )
+        # A stable lock order keeps concurrent writers from deadlocking
+        return list(BrokerBalance.objects.select_for_update().filter(broker_id__in=broker_ids).order_by('broker_id'))
+
+    @classmethod
+    def totals(cls, entries):
+        """(earned, withdrawn) over the ledger entries, both as positive amounts."""
+        totals = entries.aggregate(
+            earned=Sum('amount', filter=Q(entry_type='commission')),
+            withdrawn=Sum('amount', filter=Q(entry_type='withdrawal')),
+        )
+        return totals['earned'] or cls.ZERO, -(totals['withdrawn'] or cls.ZERO)
+
+    @classmethod
+    def record_commissions(cls, splits, batch_size=1000):
+        """
+        Append a commission entry for each saved split that credits a broker. Splits
+        dropped by a conflicting insert are skipped. Call inside a transaction.
+        """
+        splits = [split for split in splits if split.broker_id is not None and split.broker_commission > 0]
+        if not splits:
+            return 0
+        cls.lock_balances({split.broker_id for split in splits})
+        saved = set(RevenueSplit.objects.filter(id__in=[split.id for split in splits]).values_list('id', flat=True))
+        recorded_at = timezone.now()
+        entries = [
+            BrokerLedgerEntry(
+                broker_id=split.broker_id,
+                entry_type='commission',
+                amount=split.broker_commission,
+                revenue_split_id=split.id,
+                recorded_at=recorded_at,
+            )
+            for split in splits if split.id in saved
+        ]
+        BrokerLedgerEntry.objects.bulk_create(entries, batch_size=batch_size, ignore_conflicts=True)
+        return len(entries)
+
+    @classmethod
+    def get_balance(cls, broker_id):
+        """
+        The broker's current totals: total_earnings, total_withdrawn, withdrawable_amount
+        and the cutoff of the snapshot they were built on (None before the first one).
+        """
+        snapshot = BrokerBalanceSnapshot.objects.filter(broker_id=broker_id).first()
+        entries = BrokerLedgerEntry.objects.filter(broker_id=broker_id)
+        earned, withdrawn = cls.ZERO, cls.ZERO
+        if snapshot is not None:
+            entries = entries.filter(recorded_at__gt=snapshot.recorded_up_to)
+            earned, withdrawn = snapshot.total_earnings, snapshot.total_withdrawn
+        new_earned, new_withdrawn = cls.totals(entries)
+        return {
+            'total_earnings': earned + new_earned,
+            'total_withdrawn': withdrawn + new_withdrawn,
+            'withdrawable_amount': earned + new_earned - withdrawn - new_withdrawn,
+            'snapshot_recorded_up_to': snapshot.recorded_up_to if snapshot else None,
+        }
+
+    @classmethod
+    def approve_withdrawal(cls, withdrawal_id):
+        """
+        Approve a pending withdrawal request and debit it from the broker's ledger. The
+        request and the broker's balance are locked, so two approvals can neither both
+        succeed on the same request nor overdraw the balance together.
+        """
+        with transaction.atomic():
+            withdrawal = WithdrawalRequest.objects.select_for_update().get(id=withdrawal_id)
+            if withdrawal.status != 'pending':
+                raise ValidationError(f"Withdrawal request is already {withdrawal.status}.")
+            cls.lock_balances([withdrawal.broker_id])
+            if withdrawal.amount > cls.get_balance(withdrawal.broker_id)['withdrawable_amount']:
+                raise ValidationError("Withdrawal amount exceeds the withdrawable balance.")
+
+            BrokerLedgerEntry.objects.create(
+                broker_id=withdrawal.broker_id,
+                entry_type='withdrawal',
+                amount=-withdrawal.amount,
+                withdrawal_request=withdrawal,
+                recorded_at=timezone.now(),
+            )
+            withdrawal.status = 'approved'
+            withdrawal.save(update_fields=['status'])
+        return withdrawal
+
+    @classmethod
+    def take_snapshots(cls, batch_size=1000):
+        """
+        Roll the entries recorded since each broker's latest snapshot into a new one and
+        copy the totals onto BrokerBalance. Brokers without new entries are left alone.
+        Returns the number of snapshots taken.
+        """
+        with transaction.atomic():
+            balances = {
+                balance.broker_id: balance
+                for balance in BrokerBalance.objects.select_for_update().order_by('broker_id')
+            }
+            now = timezone.now()
+            latest_cutoff = Subquery(
+                BrokerBalanceSnapshot.objects.filter(broker_id=OuterRef('broker_id'))
+                .order_by('-recorded_up_to').values('recorded_up_to')[:1]
+            )
+            previous = {
+                broker_id: (earned, withdrawn)
+                for broker_id, earned, withdrawn in BrokerBalanceSnapshot.objects.filter(
+                    recorded_up_to=latest_cutoff
+                ).values_list('broker_id', 'total_earnings', 'total_withdrawn')
+            }
+            deltas = (
+                BrokerLedgerEntry.objects.alias(cutoff=latest_cutoff)
+                .filter(Q(cutoff__isnull=True) | Q(recorded_at__gt=F('cutoff')), recorded_at__lte=now)
+                .values('broker_id')
+                .annotate(
+                    earned=Sum('amount', filter=Q(entry_type='commission')),
+                    withdrawn=Sum('amount', filter=Q(entry_type='withdrawal')),
+                )
+                .order_by()
+            )
+
+            snapshots = []
+            for row in deltas:
+                earned, withdrawn = previous.get(row['broker_id'], (cls.ZERO, cls.ZERO))
+                snapshot = BrokerBalanceSnapshot(
+                    broker_id=row['broker_id'],
+                    total_earnings=earned + (row['earned'] or cls.ZERO),
+                    total_withdrawn=withdrawn - (row['withdrawn'] or cls.ZERO),
+                    recorded_up_to=now,
+                )
+                snapshots.append(snapshot)
+                balance = balances.get(row['broker_id'])
+                if balance is not None:
+                    balance.total_earnings = snapshot.total_earnings
+                    balance.withdrawable_amount = snapshot.withdrawable_amount
+                    balance.last_updated = now
+
+            BrokerBalanceSnapshot.objects.bulk_create(snapshots, batch_size=batch_size)
+            BrokerBalance.objects.bulk_update(
+                [balances[snapshot.broker_id] for snapshot in snapshots if snapshot.broker_id in balances],
+                ['total_earnings', 'withdrawable_amount', 'last_updated'],
+                batch_size=batch_size,
+            )
+        return len(snapshots)
+
+
+class PaymentIngestionService:
+    """
+    Records batches of payment notifications from the payment provider. Notifications
+    are inserted with ON CONFLICT DO NOTHING on transaction_id, so a callback delivered
+    twice is stored once. A company's payments are pooled: its open ExpectedPayments,
+    oldest first, are paid as soon as the successful payments not yet used up by paid
+    ones cover their running total, so a payment larger than one bill pays the next ones
+    too and any surplus is kept as credit for bills generated later. Each new payment is
+    linked to the oldest bill it pays towards, and the bills covered are marked paid with
+    a single UPDATE. A batch costs the same handful of queries whatever its size.
+    """
+    OPEN_STATUSES = ['pending', 'overdue']
+
+    @classmethod
+    def open_expected_payments(cls, company_ids):
+        """{company_id: [(id, total_amount), ...]} of each company's open expected payments, oldest first, locked for the transaction."""
+        open_payments = {}
+        for expected_id, company_id, total_amount in (
+            ExpectedPayment.objects.select_for_update()
+            .filter(maintenance_company_id__in=company_ids, status__in=cls.OPEN_STATUSES)
+            .order_by('due_date', 'id')
+            .values_list('id', 'maintenance_company_id', 'total_amount')
+        ):
+            open_payments.setdefault(company_id, []).append((expected_id, total_amount))
+        return open_payments
+
+    @classmethod
+    def get_credits(cls, company_ids):
+        """
+        {company_id: credit}: each company's successful payments less the total of its
+        paid expected payments, never below zero, so bills marked paid without payments
+        do not swallow later ones.
+        """
+        received = dict(
+            Payment.objects.filter(maintenance_company_id__in=company_ids, is_successful=True)
+            .values('maintenance_company_id').annotate(total=Sum('amount')).order_by()
+            .values_list('maintenance_company_id', 'total')
+        )
+        billed = dict(
+            ExpectedPayment.objects.filter(maintenance_company_id__in=company_ids, status='paid')
+            .values('maintenance_company_id').annotate(total=Sum('total_amount')).order_by()
+            .values_list('maintenance_company_id', 'total')
+        )
+        return {
+            company_id: max(total - billed.get(company_id, Decimal('0')), Decimal('0'))
+            for company_id, total in received.items()
+        }
+
+    @staticmethod
+    def covered(bills, credit):
+        """How many of bills, oldest first, credit pays for in full."""
+        count = 0
+        for _, total_amount in bills:
+            if credit < total_amount:
+                break
+            credit -= total_amount
+            count += 1
+        return count
+
+    @classmethod
+    def allocate(cls, bills, credit):
+        """The id of the oldest bill credit does not cover yet, or None when it covers them all."""
+        count = cls.covered(bills, credit)
+        return bills[count][0] if count < len(bills) else None
+
+    @classmethod
+    def mark_paid(cls, expected_ids):
+        """Mark open expected payments paid, dated by their company's latest successful payment."""
+        last_paid = Subquery(
+            Payment.objects.filter(maintenance_company_id=OuterRef('maintenance_company_id'), is_successful=True)
+            .order_by('-payment_date').values('payment_date')[:1]
+        )
+        return ExpectedPayment.objects.filter(id__in=expected_ids, status__in=cls.OPEN_STATUSES).update(
+            status='paid', payment_date=last_paid
+        )
+
+    @classmethod
+    def ingest(cls, notifications, batch_size=1000):
+        """
+        Store validated notifications (dicts of PaymentNotificationSerializer fields).
+        Returns counts of the payments created, duplicates skipped and expected payments
+        marked paid, plus the notifications rejected for an unknown company.
+        """
+        now = timezone.now()
+        unique = {}
+        for notification in notifications:
+            unique.setdefault(notification['transaction_id'], notification)
+
+        company_ids = {notification['maintenance_company_id'] for notification in unique.values()}
+        known = set(MaintenanceCompanyProfile.objects.filter(id__in=company_ids).values_list('id', flat=True))
+        rejected = [
+            {"transaction_id": transaction_id, "errors": {"maintenance_company_id": ["Maintenance company not found."]}}
+            for transaction_id, notification in unique.items()
+            if notification['maintenance_company_id'] not in known
+        ]
+
+        with transaction.atomic():
+            open_payments = cls.open_expected_payments(known)
+            credits = cls.get_credits(known)
+            # Redelivered payments must not be counted again; the insert below still guards races
+            recorded = set(
+                Payment.objects.filter(transaction_id__in=list(unique)).values_list('transaction_id', flat=True)
+            )
+            running = dict(credits)
+            payments = []
+            for transaction_id, notification in unique.items():
+                company_id = notification['maintenance_company_id']
+                if company_id not in known or transaction_id in recorded:
+                    continue
+                credit = running.get(company_id, Decimal('0'))
+                payments.append(Payment(
+                    maintenance_company_id=company_id,
+                    expected_payment_id=cls.allocate(open_payments.get(company_id, []), credit),
+                    amount=notification['amount'],
+                    payment_date=notification.get('payment_date') or now,
+                    transaction_id=transaction_id,
+                    payment_method=notification.get('payment_method', 'mpesa'),
+                    is_successful=notification.get('is_successful', True),
+                ))
+                if payments[-1].is_successful:
+                    running[company_id] = credit + notification['amount']
+            Payment.objects.bulk_create(payments, batch_size=batch_size, ignore_conflicts=True)
+
+            # Payments whose stored id is not ours lost the conflict: they were already recorded
+            stored = dict(
+                Payment.objects.filter(transaction_id__in=[payment.transaction_id for payment in payments])
+                .values_list('transaction_id', 'id')
+            )
+            created = [payment for payment in payments if stored.get(payment.transaction_id) == payment.id]
+            for payment in created:
+                if payment.is_successful:
+                    company_id = payment.maintenance_company_id
+                    credits[company_id] = credits.get(company_id, Decimal('0')) + payment.amount
+            paid_ids = []
+            for company_id in {payment.maintenance_company_id for payment in created}:
+                bills = open_payments.get(company_id, [])
+                paid_ids += [expected_id for expected_id, _ in bills[:cls.covered(bills, credits.get(company_id, Decimal('0')))]]
+            paid = cls.mark_paid(paid_ids) if paid_ids else 0
+
+        return {
+            "received": len(notifications),
+            "created": len(created),
+            "duplicates": len(notifications) - len(created) - len(rejected),
+            "expected_payments_paid": paid,
+            "rejected": rejected,
+        }
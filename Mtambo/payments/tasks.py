@@ -0,0 +1,44 @@
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def run_monthly_billing():
+    """
+    Generate the current month's expected payments once PaymentSettings.default_calculation_date
+    has been reached. Runs daily; companies already billed for the month are skipped, so the
+    runs after the calculation day (and any retries) create nothing new.
+    """
+    from payments.services import BillingService
+
+    created = BillingService.run()
+    logger.info(f"Created {created} expected payments.")
+    return created
+
+
+@shared_task
+def settle_revenue():
+    """
+    Split every successful payment not yet settled between the referring broker and the
+    company, and refresh the balances of the brokers credited.
+    """
+    from payments.services import RevenueSplitService
+
+    settled = RevenueSplitService.settle()
+    logger.info(f"Settled {settled} payments.")
+    return settled
+
+
+@shared_task
+def snapshot_broker_balances():
+    """
+    Roll each broker's ledger entries since their last snapshot into a new balance
+    snapshot, keeping the delta summed on every balance read small.
+    """
+    from payments.services import BrokerLedgerService
+
+    taken = BrokerLedgerService.take_snapshots()
+    logger.info(f"Took {taken} broker balance snapshots.")
+    return taken
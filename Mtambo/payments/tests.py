@@ -1,3 +1,553 @@
-from django.test import TestCase
+import hashlib
+import hmac
+import json
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from brokers.models import BrokerReferral, BrokerUser
+from jobs.factories import ElevatorFactory, MaintenanceCompanyProfileFactory, UserFactory
+from payments.models import (
+    BrokerBalance, BrokerBalanceSnapshot, BrokerLedgerEntry, ExpectedPayment, Payment, PaymentPlan,
+    PaymentSettings, RevenueSplit, WithdrawalRequest
+)
+from payments import cache as settings_cache
+from payments.services import BillingService, BrokerLedgerService, RevenueSplitService
+from payments.tasks import run_monthly_billing, settle_revenue, snapshot_broker_balances
+
+# Tests that count queries or inspect the shared cache run against a local one
+LOCAL_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class BillingServiceTest(TestCase):
+    def setUp(self):
+        PaymentSettings.objects.create(
+            min_charge_per_elevator=Decimal('500.00'),
+            default_commission=Decimal('10.00'),
+            default_commission_duration=12,
+            default_calculation_date=20,
+            default_due_date=5,
+        )
+        self.period = date(2025, 3, 1)
+
+    def tearDown(self):
+        cache.clear()
+        settings_cache.clear_local()
+
+    def company_with_elevators(self, count):
+        company = MaintenanceCompanyProfileFactory()
+        elevators = [ElevatorFactory(maintenance_company=company) for _ in range(count)]
+        return company, elevators
+
+    def test_bills_each_company_at_its_plan_rate(self):
+        planned, planned_elevators = self.company_with_elevators(3)
+        PaymentPlan.objects.create(
+            maintenance_company=planned, amount_per_asset=Decimal('800.00'),
+            start_date=timezone.make_aware(timezone.datetime(2025, 1, 1)),
+        )
+        PaymentPlan.objects.create(  # expired before the period
+            maintenance_company=planned, amount_per_asset=Decimal('100.00'),
+            start_date=timezone.make_aware(timezone.datetime(2024, 1, 1)),
+            end_date=timezone.make_aware(timezone.datetime(2024, 12, 31)),
+        )
+        unplanned, _ = self.company_with_elevators(2)
+
+        self.assertEqual(BillingService.generate(self.period), 2)
+
+        payment = ExpectedPayment.objects.get(maintenance_company=planned)
+        self.assertEqual(payment.total_amount, Decimal('2400.00'))
+        self.assertEqual(payment.billing_period, self.period)
+        self.assertEqual(set(payment.assets.all()), set(planned_elevators))
+        self.assertEqual(payment.calculation_date.date(), date(2025, 3, 20))
+        self.assertEqual(payment.due_date.date(), date(2025, 4, 5))
+        self.assertEqual(ExpectedPayment.objects.get(maintenance_company=unplanned).total_amount, Decimal('1000.00'))
+
+    def test_rerunning_a_period_creates_nothing(self):
+        self.company_with_elevators(2)
+        BillingService.generate(self.period)
+        late_company, _ = self.company_with_elevators(1)
+
+        self.assertEqual(BillingService.generate(self.period), 1)
+        self.assertEqual(BillingService.generate(self.period), 0)
+        self.assertEqual(ExpectedPayment.objects.filter(billing_period=self.period).count(), 2)
+        self.assertEqual(ExpectedPayment.objects.get(maintenance_company=late_company).assets.count(), 1)
+
+    def test_queries_do_not_grow_with_companies(self):
+        def billing_queries(period):
+            with CaptureQueriesContext(connection) as queries:
+                BillingService.generate(period)
+            return len(queries)
+
+        self.company_with_elevators(1)
+        BillingService.get_days()  # warm the settings cache
+        few = billing_queries(self.period)
+        for _ in range(10):
+            self.company_with_elevators(2)
+        self.assertEqual(billing_queries(date(2025, 4, 1)), few)
+
+    def test_task_waits_for_the_calculation_day(self):
+        self.company_with_elevators(1)
+        with freeze_time("2025-03-19"):
+            self.assertEqual(run_monthly_billing(), 0)
+        with freeze_time("2025-03-20"):
+            self.assertEqual(run_monthly_billing(), 1)
+        with freeze_time("2025-03-21"):
+            self.assertEqual(run_monthly_billing(), 0)
+
+    def test_due_day_is_clamped_to_the_month(self):
+        _, due_date = BillingService.get_period_dates(date(2025, 1, 1), days=(31, 31))
+        self.assertEqual(due_date.date(), date(2025, 2, 28))
+
+    def test_saving_a_payment_by_hand_fills_its_dates(self):
+        company, elevators = self.company_with_elevators(2)
+        payment = ExpectedPayment.objects.create(maintenance_company=company, billing_period=self.period)
+        payment.assets.set(elevators)
+
+        self.assertEqual(payment.calculate_total(), Decimal('1000.00'))
+        self.assertEqual(payment.due_date.date(), date(2025, 4, 5))
+
+
+class RevenueSplitServiceTest(TestCase):
+    def setUp(self):
+        self.broker = BrokerUser.objects.create_user(
+            referral_code="BRK00001", email="broker@example.com", password="pass", phone_number="0700000001"
+        )
+        self.referred_at = timezone.make_aware(timezone.datetime(2024, 1, 31))
+        self.company = MaintenanceCompanyProfileFactory()
+        BrokerReferral.objects.create(
+            broker=self.broker, maintenance_company=self.company, referral_date=self.referred_at,
+            commission_percentage=Decimal('12.5'), commission_duration_months=1,
+        )
+
+    def pay(self, amount, paid_at, company=None, **fields):
+        return Payment.objects.create(
+            maintenance_company=company or self.company,
+            amount=Decimal(amount),
+            payment_date=timezone.make_aware(paid_at),
+            transaction_id=f"TX{Payment.objects.count():06d}",
+            **fields,
+        )
+
+    def test_commission_is_paid_only_within_the_referral_window(self):
+        inside = self.pay('100.01', timezone.datetime(2024, 2, 28))
+        outside = self.pay('100.00', timezone.datetime(2024, 2, 29, 12))  # a month after Jan 31 ends on Feb 29
+        unreferred = self.pay('50.00', timezone.datetime(2024, 2, 10), company=MaintenanceCompanyProfileFactory())
+        self.pay('80.00', timezone.datetime(2024, 2, 10), is_successful=False)
+
+        self.assertEqual(RevenueSplitService.settle(), 3)
+
+        split = RevenueSplit.objects.get(payment=inside)
+        self.assertEqual(split.broker, self.broker)
+        self.assertEqual((split.broker_commission, split.company_earnings), (Decimal('12.50'), Decimal('87.51')))
+        for payment in (outside, unreferred):
+            split = RevenueSplit.objects.get(payment=payment)
+            self.assertIsNone(split.broker)
+            self.assertEqual(split.company_earnings, payment.amount)
+
+    def test_settling_again_changes_nothing(self):
+        self.pay('200.00', timezone.datetime(2024, 2, 1))
+
+        self.assertEqual(settle_revenue(), 1)
+        self.assertEqual(settle_revenue(), 0)
+        self.assertEqual(BrokerLedgerService.get_balance(self.broker.id)['total_earnings'], Decimal('25.00'))
+
+        self.pay('100.00', timezone.datetime(2024, 2, 2))
+        settle_revenue()
+        self.assertEqual(BrokerLedgerService.get_balance(self.broker.id)['total_earnings'], Decimal('37.50'))
+        self.assertEqual(BrokerLedgerEntry.objects.filter(broker=self.broker).count(), 2)
+        self.assertEqual(BrokerBalance.objects.filter(broker=self.broker).count(), 1)
+
+    def test_payments_settled_by_another_run_are_not_counted(self):
+        self.pay('100.00', timezone.datetime(2024, 2, 1))
+        self.pay('100.00', timezone.datetime(2024, 2, 2))
+        build_splits = RevenueSplitService.build_splits
+
+        def racing_build_splits(rows, split_date):
+            splits = build_splits(rows, split_date)
+            # Another run settles the first payment between our read and our insert
+            rival = splits[0]
+            RevenueSplit.objects.create(
+                payment_id=rival.payment_id, broker_id=rival.broker_id, total_revenue=rival.total_revenue,
+                broker_commission=rival.broker_commission,
+                company_earnings=rival.company_earnings, split_date=split_date,
+            )
+            return splits
+
+        with patch.object(RevenueSplitService, 'build_splits', side_effect=racing_build_splits):
+            self.assertEqual(RevenueSplitService.settle(), 1)
+        self.assertEqual(RevenueSplit.objects.count(), 2)
+        self.assertEqual(BrokerLedgerEntry.objects.filter(broker=self.broker).count(), 1)
+
+    def test_settles_only_the_requested_window(self):
+        self.pay('100.00', timezone.datetime(2024, 2, 1))
+        later = self.pay('100.00', timezone.datetime(2024, 3, 1))
+
+        settled = RevenueSplitService.settle(
+            since=timezone.make_aware(timezone.datetime(2024, 3, 1)),
+            until=timezone.make_aware(timezone.datetime(2024, 4, 1)),
+        )
+
+        self.assertEqual(settled, 1)
+        self.assertEqual(list(RevenueSplit.objects.values_list('payment_id', flat=True)), [later.id])
+
+    def test_queries_do_not_grow_with_payments(self):
+        def settle_queries():
+            with CaptureQueriesContext(connection) as queries:
+                RevenueSplitService.settle()
+            return len(queries)
+
+        BrokerBalance.objects.create(broker=self.broker)
+        self.pay('100.00', timezone.datetime(2024, 2, 1))
+        few = settle_queries()
+        for day in range(1, 21):
+            self.pay('100.00', timezone.datetime(2024, 2, day))
+        self.assertEqual(settle_queries(), few)
+
+
+class BrokerLedgerServiceTest(TestCase):
+    def setUp(self):
+        self.broker = BrokerUser.objects.create_user(
+            referral_code="BRK00002", email="ledger@example.com", password="pass", phone_number="0700000002"
+        )
+
+    def credit(self, amount):
+        with transaction.atomic():
+            BrokerLedgerService.lock_balances([self.broker.id])
+            return BrokerLedgerEntry.objects.create(broker=self.broker, entry_type='commission', amount=Decimal(amount))
+
+    def withdraw(self, amount):
+        return WithdrawalRequest.objects.create(broker=self.broker, amount=Decimal(amount))
+
+    def test_balance_is_latest_snapshot_plus_later_entries(self):
+        self.credit('100.00')
+        BrokerLedgerService.approve_withdrawal(self.withdraw('30.00').id)
+        self.assertEqual(snapshot_broker_balances(), 1)
+        self.credit('12.50')
+
+        balance = BrokerLedgerService.get_balance(self.broker.id)
+        self.assertEqual(balance['total_earnings'], Decimal('112.50'))
+        self.assertEqual(balance['total_withdrawn'], Decimal('30.00'))
+        self.assertEqual(balance['withdrawable_amount'], Decimal('82.50'))
+        self.assertIsNotNone(balance['snapshot_recorded_up_to'])
+
+        cached = BrokerBalance.objects.get(broker=self.broker)
+        self.assertEqual(cached.withdrawable_amount, Decimal('70.00'))
+
+    def test_snapshots_roll_forward_only_new_entries(self):
+        self.credit('100.00')
+        BrokerLedgerService.take_snapshots()
+        self.assertEqual(BrokerLedgerService.take_snapshots(), 0)
+        self.credit('50.00')
+        BrokerLedgerService.take_snapshots()
+
+        latest = BrokerBalanceSnapshot.objects.filter(broker=self.broker).first()
+        self.assertEqual(latest.total_earnings, Decimal('150.00'))
+        self.assertEqual(BrokerBalanceSnapshot.objects.filter(broker=self.broker).count(), 2)
+
+    def test_balance_reads_do_not_grow_with_history(self):
+        def balance_queries():
+            with CaptureQueriesContext(connection) as queries:
+                BrokerLedgerService.get_balance(self.broker.id)
+            return len(queries)
+
+        self.credit('1.00')
+        few = balance_queries()
+        for _ in range(20):
+            self.credit('1.00')
+        BrokerLedgerService.take_snapshots()
+        self.assertEqual(balance_queries(), few)
+
+    def test_withdrawal_cannot_overdraw_or_be_approved_twice(self):
+        self.credit('50.00')
+        withdrawal = self.withdraw('40.00')
+        BrokerLedgerService.approve_withdrawal(withdrawal.id)
+
+        with self.assertRaises(ValidationError):
+            BrokerLedgerService.approve_withdrawal(withdrawal.id)
+        with self.assertRaises(ValidationError):
+            BrokerLedgerService.approve_withdrawal(self.withdraw('20.00').id)
+        self.assertEqual(BrokerLedgerEntry.objects.filter(entry_type='withdrawal').count(), 1)
+
+    def test_entries_are_append_only(self):
+        entry = self.credit('10.00')
+        entry.amount = Decimal('1000.00')
+        with self.assertRaises(IntegrityError):
+            entry.save()
+
+    def test_admin_approves_withdrawal_and_reads_balance(self):
+        client = APIClient()
+        client.force_authenticate(UserFactory(is_staff=True))
+        self.credit('50.00')
+        withdrawal = self.withdraw('20.00')
+
+        response = client.post(reverse("approve-withdrawal", kwargs={"withdrawal_id": withdrawal.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = client.post(reverse("approve-withdrawal", kwargs={"withdrawal_id": withdrawal.id}))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = client.get(reverse("broker-balance", kwargs={"broker_id": self.broker.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["withdrawable_amount"], Decimal('30.00'))
+
+    def test_only_admins_can_approve_withdrawals(self):
+        client = APIClient()
+        client.force_authenticate(UserFactory(is_staff=False))
+        response = client.post(reverse("approve-withdrawal", kwargs={"withdrawal_id": self.withdraw('1.00').id}))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class PaymentSettingsCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        settings_cache.clear_local()
+        self.addCleanup(cache.clear)
+        self.addCleanup(settings_cache.clear_local)
+
+    def configure(self, **fields):
+        return PaymentSettings.objects.create(**{
+            'min_charge_per_elevator': Decimal('500.00'),
+            'default_commission': Decimal('10.00'),
+            'default_commission_duration': 12,
+            'default_due_date': 5,
+            **fields,
+        })
+
+    def test_reads_are_served_from_cache(self):
+        self.configure()
+        settings_cache.get_payment_settings()
+        with self.assertNumQueries(0):
+            self.assertEqual(settings_cache.get_payment_settings().min_charge_per_elevator, Decimal('500.00'))
+
+    def test_saving_invalidates_the_cached_copy(self):
+        self.assertIsNone(settings_cache.get_payment_settings())
+        payment_settings = self.configure()
+        self.assertEqual(settings_cache.get_payment_settings().default_commission, Decimal('10.00'))
+
+        payment_settings.default_commission = Decimal('15.00')
+        payment_settings.save()
+        self.assertEqual(settings_cache.get_payment_settings().default_commission, Decimal('15.00'))
+
+    @override_settings(PAYMENT_SETTINGS_LOCAL_TTL=0)
+    def test_other_processes_pick_up_a_version_bump(self):
+        self.configure()
+        settings_cache.get_payment_settings()
+        # Another process saved the settings: only the shared version moves
+        PaymentSettings.objects.update(default_commission=Decimal('20.00'))
+        cache.incr(f'{settings_cache.PAYMENT_SETTINGS_KEY}:version')
+
+        self.assertEqual(settings_cache.get_payment_settings().default_commission, Decimal('20.00'))
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://localhost:1/0',
+    }})
+    def test_unreachable_shared_cache_falls_back_to_the_database(self):
+        payment_settings = self.configure()
+        self.assertEqual(settings_cache.get_payment_settings().default_commission, Decimal('10.00'))
+
+        payment_settings.default_commission = Decimal('15.00')
+        payment_settings.save()
+        self.assertEqual(settings_cache.get_payment_settings().default_commission, Decimal('15.00'))
+
+    def test_broker_commission_settings_follow_broker_saves(self):
+        broker = BrokerUser.objects.create_user(
+            referral_code="BRK00003", email="cache@example.com", password="pass", phone_number="0700000003"
+        )
+        url = reverse("broker-commission-settings", kwargs={"broker_id": broker.id})
+        client = APIClient()
+
+        self.assertEqual(client.get(url).data["commission_percentage"], '12.50')
+        with self.assertNumQueries(0):
+            client.get(url)
+
+        response = client.put(url, {"commission_percentage": "15.00"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(client.get(url).data["commission_percentage"], '15.00')
+
+    def test_configuring_settings_through_the_endpoint(self):
+        url = reverse("configure-payment-settings")
+        client = APIClient()
+
+        self.assertEqual(client.get(url).status_code, status.HTTP_200_OK)
+        response = client.post(url, {"min_charge_per_elevator": "650.00"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = client.post(url, {
+            "min_charge_per_elevator": "650.00", "default_commission": "10.00",
+            "default_commission_duration": 12, "default_due_date": 5,
+        }, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = client.post(url, {"default_due_date": 7}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(PaymentSettings.objects.count(), 1)
+        self.assertEqual(client.get(url).data["default_due_date"], 7)
+        self.assertEqual(BillingService.get_default_rate(), Decimal('650.00'))
+
+
+@override_settings(PAYMENT_CALLBACK_SECRET='callback-secret')
+class PaymentIngestionTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("payment-ingest")
+        self.company = MaintenanceCompanyProfileFactory()
+        self.march = self.expect(date(2025, 3, 1), '1000.00')
+        self.april = self.expect(date(2025, 4, 1), '1000.00')
+
+    def expect(self, period, amount, company=None):
+        calculation_date, due_date = BillingService.get_period_dates(period, days=(20, 5))
+        return ExpectedPayment.objects.create(
+            maintenance_company=company or self.company, billing_period=period,
+            total_amount=Decimal(amount), calculation_date=calculation_date, due_date=due_date,
+        )
+
+    def notification(self, transaction_id, amount, company=None):
+        return {
+            "transaction_id": transaction_id,
+            "maintenance_company_id": str((company or self.company).id),
+            "amount": amount,
+        }
+
+    def callback(self, payload, secret='callback-secret'):
+        body = json.dumps(payload).encode()
+        signature = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        return self.client.post(
+            self.url, body, content_type="application/json", HTTP_X_PAYMENT_SIGNATURE=signature
+        )
+
+    def test_single_notification_is_matched_to_the_oldest_open_expected_payment(self):
+        response = self.callback(self.notification("MP001", "400.00"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 1)
+        payment = Payment.objects.get(transaction_id="MP001")
+        self.assertEqual(payment.expected_payment, self.march)
+        self.march.refresh_from_db()
+        self.assertEqual(self.march.status, 'pending')
+
+        self.callback(self.notification("MP002", "600.00"))
+        self.march.refresh_from_db()
+        self.assertEqual(self.march.status, 'paid')
+        self.assertIsNotNone(self.march.payment_date)
+        self.assertEqual(self.callback(self.notification("MP003", "1.00")).data["created"], 1)
+        self.assertEqual(Payment.objects.get(transaction_id="MP003").expected_payment, self.april)
+
+    def test_batch_is_allocated_across_periods_in_order(self):
+        self.callback(self.notification("MP001", "400.00"))
+
+        response = self.callback([
+            self.notification("MP002", "600.00"),
+            self.notification("MP003", "700.00"),
+            self.notification("MP004", "300.00"),
+            self.notification("MP005", "50.00"),
+        ])
+
+        self.assertEqual(response.data["created"], 4)
+        self.assertEqual(response.data["expected_payments_paid"], 2)
+        self.assertEqual(
+            dict(Payment.objects.values_list('transaction_id', 'expected_payment')),
+            {"MP001": self.march.id, "MP002": self.march.id, "MP003": self.april.id,
+             "MP004": self.april.id, "MP005": None},
+        )
+        self.march.refresh_from_db()
+        self.april.refresh_from_db()
+        self.assertEqual((self.march.status, self.april.status), ('paid', 'paid'))
+
+    def test_partial_batch_leaves_the_next_period_open(self):
+        self.callback([self.notification("MP001", "1000.00"), self.notification("MP002", "500.00")])
+
+        self.assertEqual(Payment.objects.get(transaction_id="MP002").expected_payment, self.april)
+        self.march.refresh_from_db()
+        self.april.refresh_from_db()
+        self.assertEqual((self.march.status, self.april.status), ('paid', 'pending'))
+
+    def test_one_payment_covering_two_periods_pays_both(self):
+        response = self.callback(self.notification("MP001", "2000.00"))
+
+        self.assertEqual(response.data["expected_payments_paid"], 2)
+        self.assertEqual(Payment.objects.get(transaction_id="MP001").expected_payment, self.march)
+        self.march.refresh_from_db()
+        self.april.refresh_from_db()
+        self.assertEqual((self.march.status, self.april.status), ('paid', 'paid'))
+        self.assertEqual(self.april.payment_date, self.march.payment_date)
+
+    def test_surplus_is_credited_to_later_periods(self):
+        self.callback(self.notification("MP001", "1500.00"))
+        self.april.refresh_from_db()
+        self.assertEqual(self.april.status, 'pending')
+
+        self.callback(self.notification("MP002", "1000.00"))
+        self.april.refresh_from_db()
+        self.assertEqual(self.april.status, 'paid')
+
+        may = self.expect(date(2025, 5, 1), '1000.00')
+        response = self.callback(self.notification("MP003", "500.00"))
+        self.assertEqual(response.data["expected_payments_paid"], 1)
+        may.refresh_from_db()
+        self.assertEqual(may.status, 'paid')
+
+    def test_batches_skip_redelivered_and_invalid_notifications(self):
+        self.callback(self.notification("MP001", "1000.00"))
+        unknown = self.notification("MP009", "5.00")
+        unknown["maintenance_company_id"] = "00000000-0000-0000-0000-000000000000"
+
+        response = self.callback([
+            self.notification("MP001", "1000.00"),
+            self.notification("MP002", "1000.00"),
+            self.notification("MP002", "1000.00"),
+            {"transaction_id": "MP003", "amount": "oops"},
+            unknown,
+        ])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["received"], 5)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["duplicates"], 2)
+        self.assertEqual(response.data["expected_payments_paid"], 1)
+        self.assertEqual([row["transaction_id"] for row in response.data["rejected"]], ["MP003", "MP009"])
+        self.assertEqual(Payment.objects.count(), 2)
+        self.assertEqual(
+            set(ExpectedPayment.objects.values_list('status', flat=True)), {'paid'}
+        )
+
+    def test_unsigned_callbacks_are_refused(self):
+        response = self.callback(self.notification("MP001", "1.00"), secret='wrong')
+
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+        self.assertFalse(Payment.objects.exists())
+
+    def test_batch_queries_do_not_grow_with_size(self):
+        companies = [MaintenanceCompanyProfileFactory() for _ in range(10)]
+        for company in companies:
+            self.expect(date(2025, 3, 1), '100.00', company)
+
+        def batch_queries(prefix, batch):
+            with CaptureQueriesContext(connection) as queries:
+                self.callback([self.notification(f"{prefix}{i}", "100.00", company) for i, company in enumerate(batch)])
+            return len(queries)
+
+        few = batch_queries("A", companies[:1])
+        self.assertEqual(batch_queries("B", companies[1:]), few)
+
+    @override_settings(PAYMENT_PROVIDER_BACKEND='payments.providers.SimulatedPaymentProvider')
+    def test_simulator_drives_ingestion(self):
+        out = StringIO()
+        call_command("simulate_payment_callbacks", count=50, batch_size=20, duplicate_rate=0.2, stdout=out)
+
+        self.assertIn("Sent 50 notifications", out.getvalue())
+        self.assertGreater(Payment.objects.count(), 0)
+        self.assertEqual(self.client.post(self.url, [], format="json").status_code, status.HTTP_200_OK)
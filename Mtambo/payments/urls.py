@@ -3,5 +3,8 @@ from .views import *
 
 urlpatterns = [
     path('admin/configure_payment_settings/', ConfigurePaymentSettingsView.as_view(), name='configure-payment-settings'),
-    path('admin/<int:broker_id>/configure_payment_settings/', BrokerCommissionSettingsView.as_view(), name='broker-commission-settings'),
+    path('admin/<uuid:broker_id>/configure_payment_settings/', BrokerCommissionSettingsView.as_view(), name='broker-commission-settings'),
+    path('admin/brokers/<uuid:broker_id>/balance/', BrokerBalanceView.as_view(), name='broker-balance'),
+    path('ingest/', PaymentIngestionView.as_view(), name='payment-ingest'),
+    path('admin/withdrawals/<uuid:withdrawal_id>/approve/', WithdrawalRequestApprovalView.as_view(), name='approve-withdrawal'),
 ]
@@ -7,8 +7,14 @@ from .serializers import PaymentSettingsSerializer
 from .models import PaymentSettings
 from rest_framework.permissions import AllowAny
 from django.shortcuts import get_object_or_404
+from django.core.exceptions import ValidationError
 from brokers.models import BrokerUser
-from .serializers import BrokerCommissionSettingsSerializer
+from .serializers import BrokerCommissionSettingsSerializer, PaymentNotificationSerializer
+from .models import WithdrawalRequest
+from .services import BrokerLedgerService, PaymentIngestionService
+from .providers import get_payment_provider
+from django.conf import settings as django_settings
+from .cache import get_broker_commission_settings, get_payment_settings
 
 class ConfigurePaymentSettingsView(APIView):
     """
@@ -27,8 +33,8 @@ class ConfigurePaymentSettingsView(APIView):
         """
         Handle GET requests to retrieve all payment settings.
         """
-        # Get or create the PaymentSettings instance
-        settings, created = PaymentSettings.objects.get_or_create(id=1)
+        # Read the cached PaymentSettings; fields are empty until they are configured
+        settings = get_payment_settings() or PaymentSettings()
 
         # Serialize the settings
         serializer = PaymentSettingsSerializer(settings)
@@ -52,12 +58,23 @@ class ConfigurePaymentSettingsView(APIView):
         """
         serializer = PaymentSettingsSerializer(data=request.data, partial=True)  # Allow partial updates
         if serializer.is_valid():
-            # Get or create the PaymentSettings instance
-            settings, created = PaymentSettings.objects.get_or_create(id=1)
+            # Update the single PaymentSettings row, creating it on first configuration
+            settings = PaymentSettings.objects.first() or PaymentSettings()
 
             # Update only the fields provided in the request
             for field, value in serializer.validated_data.items():
                 setattr(settings, field, value)
+
+            missing = [
+                field for field in ("min_charge_per_elevator", "default_commission",
+                                    "default_commission_duration", "default_due_date")
+                if getattr(settings, field) is None
+            ]
+            if missing:
+                return Response(
+                    {"error": f"These settings must be configured first: {', '.join(missing)}."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
             settings.save()
 
             return Response(
@@ -81,8 +98,10 @@ class BrokerCommissionSettingsView(APIView):
         """
         Handle GET requests to retrieve commission settings of a specific broker.
         """
-        # Retrieve the broker or return a 404 response if not found
-        broker = get_object_or_404(BrokerUser, id=broker_id)
+        # Retrieve the cached broker settings or return a 404 response if not found
+        broker = get_broker_commission_settings(broker_id)
+        if broker is None:
+            return Response({"detail": "Broker not found."}, status=status.HTTP_404_NOT_FOUND)
 
         # Serialize the broker's commission settings
         serializer = BrokerCommissionSettingsSerializer(broker)
@@ -105,3 +124,79 @@ class BrokerCommissionSettingsView(APIView):
                 status=status.HTTP_200_OK
             )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class BrokerBalanceView(APIView):
+    """
+    API endpoint for retrieving a broker's current balance from the earnings ledger.
+    Only accessible by admin users (is_staff).
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, broker_id, *args, **kwargs):
+        """
+        Handle GET requests to retrieve a broker's earnings, withdrawals and withdrawable amount.
+        """
+        broker = get_object_or_404(BrokerUser, id=broker_id)
+        balance = BrokerLedgerService.get_balance(broker.id)
+        return Response({"broker_id": broker.id, **balance}, status=status.HTTP_200_OK)
+
+
+class WithdrawalRequestApprovalView(APIView):
+    """
+    API endpoint for approving a pending broker withdrawal request.
+    Only accessible by admin users (is_staff).
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, withdrawal_id, *args, **kwargs):
+        """
+        Handle POST requests to approve a withdrawal and debit it from the broker's ledger.
+        """
+        get_object_or_404(WithdrawalRequest, id=withdrawal_id)
+        try:
+            withdrawal = BrokerLedgerService.approve_withdrawal(withdrawal_id)
+        except ValidationError as e:
+            return Response({"error": e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {"message": "Withdrawal request approved successfully.", "status": withdrawal.status},
+            status=status.HTTP_200_OK
+        )
+
+
+class PaymentIngestionView(APIView):
+    """
+    API endpoint receiving payment callbacks from the payment provider.
+    - POST: Record one payment notification or a list of them.
+    The provider configured by PAYMENT_PROVIDER_BACKEND authenticates the callback, so
+    no user authentication applies. Notifications already recorded are skipped, so the
+    provider can safely retry a whole batch.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def post(self, request, *args, **kwargs):
+        """
+        Handle POST requests carrying payment notifications.
+        """
+        notifications = get_payment_provider().parse(request)
+        if len(notifications) > django_settings.PAYMENT_INGEST_MAX_BATCH:
+            return Response(
+                {"error": f"A callback may carry at most {django_settings.PAYMENT_INGEST_MAX_BATCH} notifications."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        valid, rejected = [], []
+        for notification in notifications:
+            serializer = PaymentNotificationSerializer(data=notification)
+            if serializer.is_valid():
+                valid.append(serializer.validated_data)
+            else:
+                transaction_id = notification.get("transaction_id") if isinstance(notification, dict) else None
+                rejected.append({"transaction_id": transaction_id, "errors": serializer.errors})
+
+        result = PaymentIngestionService.ingest(valid)
+        result["received"] = len(notifications)
+        result["rejected"] = rejected + result["rejected"]
+        return Response(result, status=status.HTTP_200_OK)